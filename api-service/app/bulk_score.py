@@ -0,0 +1,374 @@
+"""
+Offline bulk scorer.
+
+Scores a Price Paid CSV (e.g. the full pp-complete.csv) without going
+through the HTTP API. The model is loaded once, then worker processes are
+forked that inherit it copy-on-write; the input is read in chunks of rows,
+each chunk is scored with one vectorized predict_batch call and written to
+its own part file in the output directory:
+
+    part-00000.csv, part-00001.csv, ...  (row, id, predicted_price,
+                                          interval_min, interval_max, error)
+
+Part files are renamed into place only once complete, so an interrupted
+run is resumed by running the same command again: chunks whose part file
+exists are skipped. Rows/sec is reported per worker and in total.
+
+Usage:
+    python -m app.bulk_score pp-complete.csv scores/ --workers 8
+"""
+
+import argparse
+import csv
+import gc
+import json
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .core.config import settings
+from .models import SalesForecaster
+from .models.price_paid import CsvRecordParser
+from .schemas import validate_property
+
+OUTPUT_COLUMNS = (
+    "row",
+    "id",
+    "predicted_price",
+    "interval_min",
+    "interval_max",
+    "error",
+)
+MANIFEST_FILE = "manifest.json"
+
+# Loaded in the parent before the pool forks; read by the workers
+_forecaster: Optional[SalesForecaster] = None
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of scoring one chunk."""
+
+    index: int
+    rows: int
+    errors: int
+    seconds: float
+    pid: int
+
+
+def part_path(output_dir: Path, index: int) -> Path:
+    """Path of the part file holding a chunk's predictions."""
+    return output_dir / f"part-{index:05d}.csv"
+
+
+def _ignore_interrupt() -> None:
+    """Pool initializer: leave Ctrl-C to the parent, which stops the run."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def score_chunk(
+    index: int,
+    first_row: int,
+    lines: List[str],
+    columns: Sequence[str],
+    output_dir: Path,
+) -> ChunkResult:
+    """
+    Score one chunk of CSV lines and write its part file.
+
+    Runs in a pool worker (or in-process with a single worker). Rows are
+    validated like API batch records; invalid ones are written with their
+    error and counted in the result's errors.
+
+    Args:
+        index: Chunk number (names the part file)
+        first_row: Data row number of the chunk's first line
+        lines: Raw CSV lines
+        columns: Column layout of the input
+        output_dir: Directory receiving the part file
+
+    Returns:
+        ChunkResult with row and error counts and the scoring time
+    """
+    start = time.perf_counter()
+    records = list(CsvRecordParser(columns).parse(lines))
+    # Rows the API would reject get an error instead of a prediction
+    results: List[Optional[Dict[str, object]]] = [None] * len(records)
+    valid_index, valid_records = [], []
+    for i, record in enumerate(records):
+        try:
+            valid_records.append(validate_property(record))
+            valid_index.append(i)
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+    for i, result in zip(
+        valid_index, _forecaster.predict_batch(valid_records)["results"]
+    ):
+        results[i] = result
+
+    path = part_path(output_dir, index)
+    tmp_path = path.with_suffix(".tmp")
+    errors = 0
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(OUTPUT_COLUMNS)
+        for row, (record, result) in enumerate(zip(records, results), first_row):
+            record_id = record.get("id", "")
+            if "error" in result:
+                errors += 1
+                writer.writerow([row, record_id, "", "", "", result["error"]])
+            else:
+                interval = result["confidence_interval"]
+                writer.writerow(
+                    [
+                        row,
+                        record_id,
+                        result["predicted_price"],
+                        interval["min"],
+                        interval["max"],
+                        "",
+                    ]
+                )
+    os.replace(tmp_path, path)
+
+    return ChunkResult(
+        index, len(records), errors, time.perf_counter() - start, os.getpid()
+    )
+
+
+def read_chunks(
+    f: TextIO, chunk_size: int
+) -> Tuple[List[str], Iterator[Tuple[int, int, List[str]]]]:
+    """
+    Detect the column layout and split the input into chunks.
+
+    Rows must not contain quoted line breaks (true for Price Paid data),
+    so chunks are split on lines without parsing them here.
+
+    Args:
+        f: Input file, opened with newline=""
+        chunk_size: Data rows per chunk
+
+    Returns:
+        Tuple (columns, iterator of (chunk index, first data row, lines))
+    """
+    first_line = f.readline()
+    parser = CsvRecordParser()
+    is_header = not list(parser.parse([first_line])) and parser.columns is not None
+    columns = parser.columns or []
+
+    def chunks() -> Iterator[Tuple[int, int, List[str]]]:
+        pending = [] if is_header or not first_line else [first_line]
+        index = 0
+        while True:
+            lines = pending + list(islice(f, chunk_size - len(pending)))
+            pending = []
+            if not lines:
+                return
+            yield index, index * chunk_size, lines
+            index += 1
+
+    return columns, chunks()
+
+
+def check_manifest(output_dir: Path, input_path: Path, chunk_size: int) -> None:
+    """
+    Record the run parameters, or check them when resuming.
+
+    Raises:
+        SystemExit: If existing parts were written with another input or
+            chunk size (their row ranges would not line up)
+    """
+    manifest = {"input": str(input_path.resolve()), "chunk_size": chunk_size}
+    path = output_dir / MANIFEST_FILE
+    if path.exists():
+        previous = json.loads(path.read_text())
+        if previous != manifest:
+            raise SystemExit(
+                f"{output_dir} holds a run with {previous}; use another output "
+                "directory or the same input and --chunk-size"
+            )
+        return
+    path.write_text(json.dumps(manifest, indent=2))
+
+
+class Progress:
+    """Accumulates rows and scoring time per worker process."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.start = time.perf_counter()
+        self.rows = 0
+        self.errors = 0
+        self.chunks = 0
+        self.workers: Dict[int, List[float]] = {}
+
+    def add(self, result: ChunkResult) -> None:
+        """Record a finished chunk and print its throughput."""
+        self.rows += result.rows
+        self.errors += result.errors
+        self.chunks += 1
+        totals = self.workers.setdefault(result.pid, [0, 0.0])
+        totals[0] += result.rows
+        totals[1] += result.seconds
+
+        elapsed = time.perf_counter() - self.start
+        print(
+            f"chunk {result.index}: {result.rows:,} rows in {result.seconds:.2f}s "
+            f"({result.rows / result.seconds:,.0f} rows/s, pid {result.pid}) | "
+            f"total {self.rows:,} rows, {self.rows / elapsed:,.0f} rows/s",
+            flush=True,
+        )
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Get totals for the run.
+
+        Returns:
+            Dictionary with chunks, rows, errors, seconds, rows_per_second
+            and per-worker rows, seconds (busy time) and rows_per_second
+        """
+        elapsed = time.perf_counter() - self.start
+        return {
+            "chunks": self.chunks,
+            "rows": self.rows,
+            "errors": self.errors,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(self.rows / elapsed) if elapsed else 0,
+            "workers": {
+                pid: {
+                    "rows": rows,
+                    "seconds": round(seconds, 2),
+                    "rows_per_second": round(rows / seconds) if seconds else 0,
+                }
+                for pid, (rows, seconds) in self.workers.items()
+            },
+        }
+
+
+def score_file(
+    forecaster: SalesForecaster,
+    input_path: Path,
+    output_dir: Path,
+    workers: int = 1,
+    chunk_size: int = 100_000,
+) -> Dict[str, object]:
+    """
+    Score a CSV file into part files, skipping chunks already written.
+
+    Args:
+        forecaster: Loaded SalesForecaster
+        input_path: Price Paid CSV (headerless pp-complete layout or with
+            a header row)
+        output_dir: Directory for the part files (created if needed)
+        workers: Worker processes; 1 scores in this process
+        chunk_size: Data rows per chunk and part file
+
+    Returns:
+        Progress summary for the chunks scored in this run, plus skipped
+        (chunks already complete)
+    """
+    global _forecaster
+    _forecaster = forecaster
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    check_manifest(output_dir, input_path, chunk_size)
+    progress = Progress()
+    skipped = 0
+
+    with open(input_path, newline="") as f:
+        columns, chunks = read_chunks(f, chunk_size)
+
+        def todo() -> Iterator[Tuple[int, int, List[str]]]:
+            nonlocal skipped
+            for chunk in chunks:
+                if part_path(output_dir, chunk[0]).exists():
+                    skipped += 1
+                else:
+                    yield chunk
+
+        if workers == 1:
+            for index, first_row, lines in todo():
+                progress.add(score_chunk(index, first_row, lines, columns, output_dir))
+        else:
+            # Keep preloaded objects out of the workers' garbage collections
+            gc.collect()
+            gc.freeze()
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_ignore_interrupt,
+            )
+            try:
+                running = set()
+                for index, first_row, lines in todo():
+                    # Bound the chunks held in memory to two per worker
+                    if len(running) >= 2 * workers:
+                        done, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            progress.add(future.result())
+                    running.add(
+                        pool.submit(
+                            score_chunk, index, first_row, lines, columns, output_dir
+                        )
+                    )
+                for future in wait(running).done:
+                    progress.add(future.result())
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    summary = progress.summary()
+    summary["skipped"] = skipped
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Parse arguments, load the model and score the file."""
+    parser = argparse.ArgumentParser(
+        description="Score a Price Paid CSV into partitioned prediction files"
+    )
+    parser.add_argument("input", type=Path, help="Price Paid CSV file")
+    parser.add_argument("output", type=Path, help="Output directory for part files")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=100_000, help="Rows per chunk/part file"
+    )
+    parser.add_argument(
+        "--models-dir", default=settings.models_dir, help="Model artifacts directory"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("sklearn", "native"),
+        default=settings.inference_engine,
+        help="Forest evaluation engine",
+    )
+    args = parser.parse_args(argv)
+    if args.workers <= 0 or args.chunk_size <= 0:
+        parser.error("--workers and --chunk-size must be positive")
+
+    start = time.perf_counter()
+    forecaster = SalesForecaster(
+        models_dir=args.models_dir, engine=args.engine, cache_size=0
+    )
+    forecaster.load()
+    print(f"Model loaded in {time.perf_counter() - start:.2f}s", flush=True)
+
+    try:
+        summary = score_file(
+            forecaster, args.input, args.output, args.workers, args.chunk_size
+        )
+    except KeyboardInterrupt:
+        raise SystemExit("Interrupted; run the same command again to resume")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,24 +5,63 @@ Health controller - system health and status.
 from datetime import datetime
 from typing import Any, Dict
 
+from ..core.loader import FAILED
+from ..core.metrics import render_metrics
+
 
 class HealthController:
     """Controller for health and system status operations."""
 
     @staticmethod
-    def get_health_status(forecaster) -> Dict[str, Any]:
+    def get_health_status(forecaster, loader=None) -> Dict[str, Any]:
         """
-        Get service health status.
+        Get service health status (liveness).
+
+        The service stays healthy while the model is loading; only a
+        failed load makes it unhealthy, so the process gets restarted.
 
         Args:
             forecaster: SalesForecaster instance
+            loader: Optional ModelLoader of this process
 
         Returns:
             Dictionary with health information
         """
+        failed = loader is not None and loader.status == FAILED
         return {
-            "status": "healthy",
+            "status": "unhealthy" if failed else "healthy",
             "timestamp": datetime.now(),
             "model_loaded": forecaster.is_loaded,
             "version": "1.0.0",
         }
+
+    @staticmethod
+    def get_readiness(loader) -> Dict[str, Any]:
+        """
+        Get readiness to serve predictions.
+
+        Args:
+            loader: ModelLoader of this process
+
+        Returns:
+            Dictionary with ready, load status, load times per artifact and
+            step, and the load error if any
+        """
+        return {"ready": loader.is_ready, **loader.stats()}
+
+    @staticmethod
+    def get_metrics(forecaster, executor=None) -> str:
+        """
+        Get this worker's metrics in the Prometheus text format.
+
+        With a process executor, forecaster stages are timed in the pool
+        children and do not show up here; serialization still does.
+
+        Args:
+            forecaster: SalesForecaster instance
+            executor: Optional InferenceExecutor whose load is included
+
+        Returns:
+            Request, stage and serving-state metrics
+        """
+        return render_metrics(forecaster, executor)
@@ -2,59 +2,487 @@
 Prediction controller - ML prediction operations.
 """
 
-from typing import Any, Dict
+import asyncio
+import codecs
+import hmac
+import json
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from fastapi import HTTPException, status
 
+from ..core.executor import InferenceQueueFull
+from ..core.registry import UnknownModelVersion
+from ..core.reloader import ReloadInProgress
+from ..core.worker import get_worker_info
+from ..models.price_paid import CsvRecordParser, parse_ndjson
+from ..schemas import validate_property
+
+MODEL_NOT_LOADED = "Model not loaded. Please try again in a few seconds."
+
+# Wait before resubmitting a stream chunk when the inference queue is full,
+# and give up (ending the stream with an error line) after the timeout
+STREAM_RETRY_SECONDS = 0.05
+STREAM_QUEUE_TIMEOUT = 30.0
+
 
 class PredictionController:
     """Controller for property price prediction operations."""
 
     @staticmethod
-    def get_model_info(forecaster) -> Dict[str, Any]:
+    def get_model_info(
+        forecaster, executor=None, batcher=None, registry=None
+    ) -> Dict[str, Any]:
         """
         Get detailed model information.
 
         Args:
             forecaster: SalesForecaster instance
+            executor: Optional InferenceExecutor whose stats are included
+            batcher: Optional MicroBatcher whose stats are included
+            registry: Optional ModelRegistry whose versions are included
 
         Returns:
-            Dictionary with model metadata
+            Dictionary with model metadata, worker process, inference
+            executor and micro-batching information. With a process
+            executor, cache and prediction_table are None: predictions are
+            served by the pool children, so this process's counters would
+            stay at zero.
         """
-        return forecaster.get_model_info()
+        info = forecaster.get_model_info()
+        if executor is not None and executor.kind == "process":
+            info["cache"] = None
+            info["prediction_table"] = None
+        info["worker"] = get_worker_info()
+        info["inference"] = executor.stats() if executor is not None else None
+        info["micro_batching"] = batcher.stats() if batcher is not None else None
+        info["versions"] = registry.stats() if registry is not None else None
+        return info
 
     @staticmethod
-    def predict_price(forecaster, property_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def resolve_version(
+        forecaster, registry, version: Optional[str]
+    ) -> Tuple[Any, Optional[Callable[[], Any]]]:
         """
-        Predict property price.
+        Pick the forecaster answering a request.
 
         Args:
-            forecaster: SalesForecaster instance
-            property_data: Dictionary with property information
+            forecaster: Default SalesForecaster instance
+            registry: ModelRegistry of this process
+            version: Requested model version, None for the default model
 
         Returns:
-            Dictionary with prediction and confidence interval
+            Tuple (forecaster, inference executor target); the target is
+            None for the default model
 
         Raises:
-            HTTPException: If model not loaded or prediction fails
+            HTTPException: 404 if the version is unknown, 500 if it fails to
+                load or validate
         """
-        if not forecaster.is_loaded:
+        if version is None:
+            return forecaster, None
+        try:
+            return await registry.get(version), registry.target(version)
+        except UnknownModelVersion as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except Exception as e:
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Model not loaded. Please try again in a few seconds.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Model version '{version}' failed to load: {str(e)}",
             )
 
+    @staticmethod
+    def check_reload_allowed(
+        enabled: bool, admin_token: Optional[str], token: Optional[str]
+    ) -> None:
+        """
+        Gate the model reload endpoint.
+
+        Args:
+            enabled: Whether reloads over HTTP are allowed
+                (ADMIN_RELOAD_ENABLED)
+            admin_token: Token reloads must present (ADMIN_TOKEN), or None
+            token: X-Admin-Token header of the request
+
+        Raises:
+            HTTPException: 403 if reloads are disabled, 401 if the token is
+                missing or wrong
+        """
+        if not enabled:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Model reload is disabled (ADMIN_RELOAD_ENABLED)",
+            )
+        if admin_token and not hmac.compare_digest(
+            (token or "").encode(), admin_token.encode()
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Missing or invalid X-Admin-Token",
+            )
+
+    @staticmethod
+    async def reload_model(reloader) -> Dict[str, Any]:
+        """
+        Load new artifacts and swap them in without a restart.
+
+        Args:
+            reloader: ModelReloader of this process
+
+        Returns:
+            Dictionary with the previous and new training dates, load time
+            and pid
+
+        Raises:
+            HTTPException: 409 if a reload is already running, 500 if the
+                new artifacts fail to load or validate (the current model
+                keeps serving)
+        """
         try:
-            result = forecaster.predict(property_data)
-            return result
+            return await reloader.reload()
+        except ReloadInProgress as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Reload failed, current model kept: {str(e)}",
+            )
 
-        except ValueError as e:
+    @staticmethod
+    def _check_loaded(forecaster) -> None:
+        """Raise 503 if the model is not loaded."""
+        if not forecaster.is_loaded:
             raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=MODEL_NOT_LOADED,
+            )
+
+    @staticmethod
+    def _prediction_error(e: Exception, invalid_data: bool = True) -> HTTPException:
+        """
+        Map a prediction exception to an HTTP error.
+
+        Args:
+            e: Exception raised by the forecaster or executor
+            invalid_data: Report ValueError as 400 (single predictions)
+        """
+        if isinstance(e, InferenceQueueFull):
+            return HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Server busy: {str(e)}",
+                headers={"Retry-After": "1"},
+            )
+        if invalid_data and isinstance(e, ValueError):
+            return HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid data: {str(e)}",
             )
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Prediction error: {str(e)}",
+        )
+
+    @staticmethod
+    async def predict_price(
+        forecaster,
+        executor,
+        property_data: Dict[str, Any],
+        batcher=None,
+        n_trees: Optional[int] = None,
+        profile=None,
+        target=None,
+    ) -> Dict[str, Any]:
+        """
+        Predict property price in the inference executor.
+
+        The forest runs in the executor's pool, so the event loop stays free
+        for other requests while this one waits.
+
+        Args:
+            forecaster: SalesForecaster instance
+            executor: InferenceExecutor running forecaster calls
+            property_data: Dictionary with property information
+            batcher: Optional MicroBatcher to join instead of a lone call
+                (full-forest, unprofiled requests of the default model only)
+            n_trees: Optional tree budget (first n_trees trees only)
+            profile: Optional RequestProfile collecting stage timings
+            target: Optional executor target of a model version (see
+                resolve_version)
+
+        Returns:
+            Dictionary with prediction and confidence interval
+
+        Raises:
+            HTTPException: If model not loaded, queue full or prediction fails
+        """
+        PredictionController._check_loaded(forecaster)
+
+        try:
+            if profile is not None:
+                # Profiled alone, so the timings are this request's
+                return await executor.call(
+                    "predict", property_data, n_trees, profile=profile, target=target
+                )
+            if n_trees is not None or target is not None:
+                return await executor.call(
+                    "predict", property_data, n_trees, target=target
+                )
+            if batcher is not None:
+                return await batcher.predict(property_data)
+            return await executor.call("predict", property_data)
+        except Exception as e:
+            raise PredictionController._prediction_error(e)
+
+    @staticmethod
+    async def predict_batch(
+        forecaster,
+        executor,
+        records: List[Any],
+        n_trees: Optional[int] = None,
+        profile=None,
+        target=None,
+    ) -> Dict[str, Any]:
+        """
+        Predict prices for a batch of properties in the inference executor.
+
+        Each record is validated individually; invalid records (including
+        ones that are not objects) are reported as per-row errors naming the
+        field and pydantic's reason, e.g. "Invalid data: year: Input should
+        be greater than or equal to 1995", and the remaining rows are
+        predicted together.
+
+        Args:
+            forecaster: SalesForecaster instance
+            executor: InferenceExecutor running forecaster calls
+            records: List of raw property records
+            n_trees: Optional tree budget (first n_trees trees only)
+            profile: Optional RequestProfile collecting stage timings (record
+                validation is added as request_validation)
+            target: Optional executor target of a model version (see
+                resolve_version)
+
+        Returns:
+            Dictionary with per-row results, counts, features and model info,
+            shaped like BatchPredictionResponse (every item holds index,
+            predicted_price, confidence_interval and error, unset ones None)
+
+        Raises:
+            HTTPException: If model not loaded, queue full or prediction fails
+        """
+        PredictionController._check_loaded(forecaster)
+
+        results: List[Dict[str, Any]] = [
+            {
+                "index": i,
+                "predicted_price": None,
+                "confidence_interval": None,
+                "error": None,
+            }
+            for i in range(len(records))
+        ]
+        valid_index: List[int] = []
+        valid_records: List[Dict[str, Any]] = []
+
+        started = time.perf_counter()
+        for i, record in enumerate(records):
+            try:
+                valid_records.append(validate_property(record))
+                valid_index.append(i)
+            except ValueError as e:
+                results[i]["error"] = str(e)
+        if profile is not None:
+            profile.add("request_validation", time.perf_counter() - started)
+
+        try:
+            batch = await executor.call(
+                "predict_batch", valid_records, n_trees, profile=profile, target=target
+            )
         except Exception as e:
+            raise PredictionController._prediction_error(e, invalid_data=False)
+
+        for i, result in zip(valid_index, batch["results"]):
+            results[i].update(result)
+
+        n_errors = sum(1 for result in results if result["error"] is not None)
+        return {
+            "results": results,
+            "n_success": len(results) - n_errors,
+            "n_errors": n_errors,
+            "features_used": batch["features_used"],
+            "model_info": batch["model_info"],
+        }
+
+    @staticmethod
+    def predict_stream(
+        forecaster,
+        executor,
+        body: AsyncIterator[bytes],
+        content_type: str,
+        chunk_size: int,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Score an NDJSON or CSV upload while it streams in.
+
+        Rows are parsed as body chunks arrive and scored chunk_size rows at a
+        time, so memory does not grow with the upload and results start
+        flowing before it completes.
+
+        Args:
+            forecaster: SalesForecaster instance
+            executor: InferenceExecutor running forecaster calls
+            body: Request body chunks
+            content_type: text/csv or application/x-ndjson
+            chunk_size: Rows per forest evaluation
+            is_disconnected: Optional check for a client that went away;
+                the stream stops scoring once it returns True
+
+        Returns:
+            Async iterator of NDJSON text, one line per input row holding
+            row (0-based), id (if the row has one) and the prediction or
+            error. A failure after streaming started (e.g. the inference
+            queue staying full for STREAM_QUEUE_TIMEOUT seconds) ends the
+            stream with a line holding only error.
+
+        Raises:
+            HTTPException: If model not loaded or content type unsupported
+        """
+        PredictionController._check_loaded(forecaster)
+
+        if "csv" in content_type:
+            parse = CsvRecordParser().parse
+        elif "json" in content_type:
+            parse = parse_ndjson
+        else:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Prediction error: {str(e)}",
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Expected text/csv or application/x-ndjson body",
+            )
+
+        return PredictionController._stream_results(
+            executor, body, parse, chunk_size, is_disconnected
+        )
+
+    @staticmethod
+    async def _stream_lines(body: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+        """Split body chunks into complete text lines."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        buffer = ""
+        async for data in body:
+            buffer += decoder.decode(data)
+            *lines, buffer = buffer.split("\n")
+            if lines:
+                yield lines
+
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield [buffer]
+
+    @staticmethod
+    async def _stream_results(
+        executor,
+        body: AsyncIterator[bytes],
+        parse: Callable[[Iterable[str]], Iterable[Any]],
+        chunk_size: int,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+    ) -> AsyncIterator[str]:
+        """Parse, score and serialize an upload chunk by chunk."""
+
+        async def score(chunk: List[Any], first_row: int) -> Optional[str]:
+            if is_disconnected is not None and await is_disconnected():
+                return None
+            return await PredictionController._score_chunk(
+                executor, chunk, first_row, is_disconnected
             )
+
+        row = 0
+        chunk: List[Any] = []
+        try:
+            async for lines in PredictionController._stream_lines(body):
+                for record in parse(lines):
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        text = await score(chunk, row)
+                        if text is None:
+                            return
+                        yield text
+                        row += len(chunk)
+                        chunk = []
+
+            if chunk:
+                text = await score(chunk, row)
+                if text is not None:
+                    yield text
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            yield json.dumps({"error": f"Prediction error: {str(e)}"}) + "\n"
+
+    @staticmethod
+    async def _score_chunk(
+        executor,
+        chunk: List[Any],
+        first_row: int,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> Optional[str]:
+        """
+        Score one chunk of parsed rows and serialize the results.
+
+        Rows are validated like /predict/batch records; rows that do not
+        parse or validate get an error line instead of a prediction.
+
+        Returns:
+            NDJSON text, or None if the client went away while waiting
+
+        Raises:
+            InferenceQueueFull: If the queue stays full for
+                STREAM_QUEUE_TIMEOUT seconds
+        """
+        rows: List[Any] = []
+        for record in chunk:
+            if not isinstance(record, Exception):
+                try:
+                    record = validate_property(record)
+                except ValueError as e:
+                    record = e
+            rows.append(record)
+
+        records = [row for row in rows if not isinstance(row, Exception)]
+        results: Iterable[Dict[str, Any]] = []
+        deadline = time.monotonic() + STREAM_QUEUE_TIMEOUT
+        while records:
+            try:
+                batch = await executor.call("predict_batch", records)
+                results = batch["results"]
+                break
+            except InferenceQueueFull:
+                # Back-pressure: the upload waits until a worker is free
+                if is_disconnected is not None and await is_disconnected():
+                    return None
+                if time.monotonic() >= deadline:
+                    raise InferenceQueueFull(
+                        f"Inference queue still full after {STREAM_QUEUE_TIMEOUT}s"
+                    )
+                await asyncio.sleep(STREAM_RETRY_SECONDS)
+
+        results = iter(results)
+        lines = []
+        for offset, (record, row) in enumerate(zip(chunk, rows)):
+            item: Dict[str, Any] = {"row": first_row + offset}
+            if isinstance(record, dict) and "id" in record:
+                item["id"] = record["id"]
+            if isinstance(row, Exception):
+                item["error"] = str(row)
+            else:
+                item.update(next(results))
+            lines.append(json.dumps(item))
+        return "\n".join(lines) + "\n"
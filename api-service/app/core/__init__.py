@@ -2,6 +2,26 @@
 Core module - lifecycle and configuration.
 """
 
-from .lifecycle import forecaster, shutdown_event, startup_event
+from .config import settings
+from .lifecycle import (
+    forecaster,
+    inference_executor,
+    micro_batcher,
+    model_loader,
+    model_registry,
+    model_reloader,
+    shutdown_event,
+    startup_event,
+)
 
-__all__ = ["startup_event", "shutdown_event", "forecaster"]
+__all__ = [
+    "startup_event",
+    "shutdown_event",
+    "forecaster",
+    "inference_executor",
+    "micro_batcher",
+    "model_loader",
+    "model_registry",
+    "model_reloader",
+    "settings",
+]
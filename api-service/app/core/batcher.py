@@ -0,0 +1,131 @@
+"""
+Micro-batcher.
+
+Collects concurrent single-row predictions for a short window and answers
+them with one forest evaluation, so per-call overhead is paid per batch
+instead of per request.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """Coalesces concurrent predict() calls into predict_many() batches."""
+
+    def __init__(self, executor, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        """
+        Initialize batcher.
+
+        Args:
+            executor: InferenceExecutor running the batched forecaster calls
+            max_batch_size: Requests per batch; a full batch is dispatched
+                immediately
+            max_wait_ms: Longest a request waits for others to join its
+                batch (bounds the latency added to single requests)
+
+        Raises:
+            ValueError: If sizes are not positive
+        """
+        if max_batch_size <= 0 or max_wait_ms < 0:
+            raise ValueError("max_batch_size must be positive and max_wait_ms >= 0")
+
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._due = False
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.requests = 0
+        self.max_batch_seen = 0
+
+    async def predict(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Predict one property as part of the next batch.
+
+        Returns:
+            The forecaster's predict() response for this property
+
+        Raises:
+            Whatever predict() (or the executor) raised for this property
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((property_data, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None and not self._due:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._on_timer)
+
+        return await future
+
+    def _on_timer(self) -> None:
+        """Window elapsed: dispatch now, or once a pool worker frees up."""
+        self._timer = None
+        if len(self._tasks) < self.executor.max_workers:
+            self._flush()
+        else:
+            # Every worker is busy; keep collecting so the batch grows
+            self._due = True
+
+    def _on_batch_done(self, task: asyncio.Task) -> None:
+        """Batch finished: dispatch requests that waited for a worker."""
+        self._tasks.discard(task)
+        if self._due:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Dispatch the pending requests (at most one full batch) together."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._due = False
+
+        batch, self._pending = self._pending, []
+        self.batches += 1
+        self.requests += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_batch_done)
+
+    async def _run(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Evaluate a batch and resolve each caller's future."""
+        records = [record for record, _ in batch]
+        try:
+            results = await self.executor.call("predict_many", records)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller went away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching configuration and counters.
+
+        Returns:
+            Dictionary with max_batch_size, max_wait_ms, batches, requests,
+            mean_batch_size and max_batch_seen
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": (
+                round(self.requests / self.batches, 2) if self.batches else 0.0
+            ),
+            "max_batch_seen": self.max_batch_seen,
+        }
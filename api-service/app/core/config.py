@@ -0,0 +1,90 @@
+"""
+Application settings.
+
+Values are read from environment variables (e.g. INFERENCE_ENGINE=sklearn).
+"""
+
+from typing import Literal, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """API settings loaded from the environment."""
+
+    models_dir: str = Field("models", description="Model artifacts directory")
+    inference_engine: Literal["sklearn", "native"] = Field(
+        "native", description="Forest evaluation engine"
+    )
+    prediction_cache_size: int = Field(
+        10000, ge=0, description="Prediction LRU cache entries (0 disables)"
+    )
+    prediction_table: bool = Field(
+        False, description="Serve predictions from the precomputed table"
+    )
+    mmap_forest: bool = Field(
+        False, description="Share the native forest across workers via mmap"
+    )
+    compact_forest: bool = Field(
+        False, description="Serve the native engine from the compact forest file"
+    )
+    interval_mode: Literal["trees", "conformal"] = Field(
+        "trees",
+        description="Confidence intervals from per-tree percentiles or "
+        "calibrated conformal quantiles",
+    )
+    inference_executor: Literal["thread", "process"] = Field(
+        "thread", description="Pool running inference off the event loop"
+    )
+    inference_workers: int = Field(2, gt=0, description="Inference pool size")
+    inference_queue_size: int = Field(
+        64, ge=0, description="Requests allowed to wait for an inference worker"
+    )
+    micro_batching: bool = Field(
+        False, description="Coalesce concurrent /predict requests into batches"
+    )
+    micro_batch_size: int = Field(32, gt=0, description="Requests per micro-batch")
+    micro_batch_wait_ms: float = Field(
+        2.0, ge=0, description="Longest wait for a micro-batch to fill (ms)"
+    )
+    metrics: bool = Field(
+        True, description="Record request and per-stage latency metrics"
+    )
+    request_profiling: bool = Field(
+        False, description="Profile requests sent with an X-Profile header"
+    )
+    profile_dir: str = Field(
+        "profiles", description="Directory for per-request cProfile dumps"
+    )
+    model_versions_dir: Optional[str] = Field(
+        None,
+        description="Directory of versioned artifact sets, one per subdirectory "
+        "(default: <models_dir>/versions)",
+    )
+    model_versions_memory_mb: float = Field(
+        1024.0, ge=0, description="Memory budget of the loaded model versions (MB)"
+    )
+    warmup_rows: int = Field(
+        200,
+        ge=0,
+        description="Synthetic properties predicted before reporting ready "
+        "(0 disables the warm-up)",
+    )
+    warmup_locations: int = Field(
+        20, gt=0, description="Most frequent counties and postcode regions warmed"
+    )
+    model_watch_interval: float = Field(
+        0.0,
+        ge=0,
+        description="Seconds between checks for new model artifacts (0 disables)",
+    )
+    admin_reload_enabled: bool = Field(
+        False, description="Allow POST /api/v1/model/reload"
+    )
+    admin_token: Optional[str] = Field(
+        None, description="Token required in X-Admin-Token to reload the model"
+    )
+
+
+settings = Settings()
@@ -0,0 +1,241 @@
+"""
+Inference executor.
+
+Runs CPU-bound forecaster calls off the event loop in a bounded thread or
+process pool, so the loop keeps answering health checks and other
+requests while forests are evaluated.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .profiling import RequestProfile, profiled_call
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference queue is at capacity."""
+
+
+def current_forecaster():
+    """Resolve the application forecaster in the current process."""
+    from .. import core
+
+    return core.forecaster
+
+
+def _timed_call(
+    target: Callable[[], Any], method: str, args: Tuple[Any, ...]
+) -> Tuple[float, Any]:
+    """
+    Call a method on the target, recording when execution started.
+
+    Runs inside the pool. time.monotonic is system-wide, so the start time
+    is comparable with the submit time also for process workers.
+    """
+    started = time.monotonic()
+    return started, getattr(target(), method)(*args)
+
+
+def _timed_profiled_call(
+    target: Callable[[], Any],
+    method: str,
+    args: Tuple[Any, ...],
+    dump_path: Optional[Any],
+) -> Tuple[float, Any]:
+    """Like _timed_call, but returns profiled_call's result and timings."""
+    started = time.monotonic()
+    return started, profiled_call(target, method, args, dump_path)
+
+
+class InferenceExecutor:
+    """Bounded pool for forecaster calls with queue and wait-time stats."""
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 2,
+        max_queue: int = 64,
+        target: Callable[[], Any] = current_forecaster,
+    ):
+        """
+        Initialize executor (the pool is created on start or first call).
+
+        Args:
+            kind: "thread" or "process" (forked workers inherit the model)
+            max_workers: Pool size
+            max_queue: Calls allowed to wait for a free worker; more are
+                rejected with InferenceQueueFull
+            target: Returns the object whose methods are called; for the
+                process pool it must be a module-level function
+
+        Raises:
+            ValueError: If kind is unknown or sizes are not positive
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(
+                f"Unknown executor '{kind}', expected one of {EXECUTOR_KINDS}"
+            )
+        if max_workers <= 0 or max_queue < 0:
+            raise ValueError("max_workers must be positive and max_queue >= 0")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.target = target
+        self._pool: Optional[Executor] = None
+
+        # Updated from the event loop only
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.pool_restarts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls submitted but waiting for a free worker."""
+        return max(0, self.in_flight - self.max_workers)
+
+    def start(self) -> None:
+        """Create the pool (after the model is loaded, for process workers)."""
+        if self._pool is not None:
+            return
+        if self.kind == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+
+    def restart(self) -> None:
+        """
+        Start a fresh process pool, e.g. after the model was replaced.
+
+        New calls go to workers forked from the current process; calls
+        already submitted finish on the old pool, which then exits. Thread
+        workers resolve the target per call and need no restart.
+        """
+        if self.kind != "process" or self._pool is None:
+            return
+        old, self._pool = self._pool, None
+        self.start()
+        old.shutdown(wait=False)
+
+    def _restart(self, broken: Executor) -> None:
+        """Replace a process pool whose worker died (once per breakage)."""
+        if self._pool is broken:
+            broken.shutdown(wait=False)
+            self._pool = None
+            self.pool_restarts += 1
+        self.start()
+
+    def shutdown(self) -> None:
+        """Shut the pool down, waiting for running calls."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def call(
+        self,
+        method: str,
+        *args: Any,
+        profile: Optional[RequestProfile] = None,
+        target: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        Run target().method(*args) in the pool.
+
+        The executor's target is used unless another one is given (e.g. one
+        resolving a model version, see ModelRegistry.target); for the
+        process pool it must be picklable.
+
+        A call interrupted by a process worker dying (e.g. OOM-killed) is
+        retried once on a fresh pool, forked again from this process.
+
+        With a profile, the call's stage timings and the time it waited for
+        a worker (inference_wait) are added to it, and the call is
+        cProfiled in the worker if the profile has a dump path.
+
+        Raises:
+            InferenceQueueFull: If max_queue calls are already waiting
+            BrokenProcessPool: If the call also fails on the fresh pool
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise InferenceQueueFull(
+                f"Inference queue full ({self.max_queue} requests waiting)"
+            )
+
+        self.start()
+        target = target or self.target
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        self.in_flight += 1
+        try:
+            for attempt in range(2):
+                pool = self._pool
+                if profile is None:
+                    call = (_timed_call, target, method, args)
+                else:
+                    call = (
+                        _timed_profiled_call,
+                        target,
+                        method,
+                        args,
+                        profile.dump_path,
+                    )
+                try:
+                    started, result = await loop.run_in_executor(pool, *call)
+                    break
+                except BrokenProcessPool:
+                    self._restart(pool)
+                    if attempt:
+                        raise
+        finally:
+            self.in_flight -= 1
+
+        wait = max(0.0, started - submitted)
+        self.completed += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        if profile is not None:
+            result, stages, dumped = result
+            profile.add("inference_wait", wait)
+            profile.merge(stages)
+            profile.dumped = profile.dumped or dumped
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool configuration, queue depth and wait times.
+
+        Returns:
+            Dictionary with kind, sizes, in_flight, queue_depth, completed,
+            rejected, pool_restarts, wait_ms_avg and wait_ms_max
+        """
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "pool_restarts": self.pool_restarts,
+            "wait_ms_avg": (
+                round(self._wait_total / self.completed * 1000, 3)
+                if self.completed
+                else 0.0
+            ),
+            "wait_ms_max": round(self._wait_max * 1000, 3),
+        }
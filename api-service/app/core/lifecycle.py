@@ -1,31 +1,135 @@
 """
 Application lifecycle events.
 
-Handles model loading on startup and cleanup on shutdown.
+Handles background model loading on startup, hot reloads and cleanup on
+shutdown.
 """
 
+import functools
 import logging
+from pathlib import Path
+from typing import Optional
 
 from ..models import SalesForecaster
+from .batcher import MicroBatcher
+from .config import settings
+from .executor import InferenceExecutor
+from .loader import ModelLoader
+from .profiling import record_stage
+from .registry import ModelRegistry
+from .reloader import ModelReloader
+from .warmup import warm_up
 
 logger = logging.getLogger(__name__)
 
-# Initialize forecaster global
-forecaster = SalesForecaster(models_dir="models")
+
+def create_forecaster(models_dir: Optional[str] = None) -> SalesForecaster:
+    """
+    Create an unloaded forecaster from the settings.
+
+    Args:
+        models_dir: Artifacts directory (default: settings.models_dir)
+    """
+    return SalesForecaster(
+        models_dir=models_dir or settings.models_dir,
+        engine=settings.inference_engine,
+        cache_size=settings.prediction_cache_size,
+        use_prediction_table=settings.prediction_table,
+        mmap_forest=settings.mmap_forest,
+        compact_forest=settings.compact_forest,
+        stage_observer=record_stage,
+        interval_mode=settings.interval_mode,
+    )
+
+
+# Initialize forecaster global (replaced by hot reloads)
+forecaster = create_forecaster()
+
+
+def get_forecaster() -> SalesForecaster:
+    """Get the forecaster currently serving requests."""
+    return forecaster
+
+
+def install_forecaster(new_forecaster: SalesForecaster) -> None:
+    """
+    Make a loaded forecaster the one serving requests.
+
+    Routers and the inference executor look the forecaster up on app.core
+    per request, so rebinding it there is an atomic swap; requests that
+    already hold the previous forecaster finish on it.
+    """
+    global forecaster
+    from .. import core
+
+    forecaster = new_forecaster
+    core.forecaster = new_forecaster
+
+
+# Runs forest evaluation off the event loop
+inference_executor = InferenceExecutor(
+    kind=settings.inference_executor,
+    max_workers=settings.inference_workers,
+    max_queue=settings.inference_queue_size,
+)
+
+# Optional: coalesces concurrent single predictions
+micro_batcher = (
+    MicroBatcher(
+        inference_executor,
+        max_batch_size=settings.micro_batch_size,
+        max_wait_ms=settings.micro_batch_wait_ms,
+    )
+    if settings.micro_batching
+    else None
+)
+
+# Synthetic predictions run on a new model before it serves traffic
+warmup = functools.partial(
+    warm_up, n_rows=settings.warmup_rows, n_locations=settings.warmup_locations
+)
+
+# Other model versions, selected per request and loaded on first use
+model_registry = ModelRegistry(
+    create_forecaster,
+    settings.model_versions_dir or str(Path(settings.models_dir) / "versions"),
+    max_memory_mb=settings.model_versions_memory_mb,
+)
+
+# Reloads new artifacts from models_dir without a restart
+model_reloader = ModelReloader(
+    create_forecaster,
+    get_forecaster,
+    install_forecaster,
+    executor=inference_executor,
+    watch_interval=settings.model_watch_interval,
+    warmup=warmup,
+)
+
+
+def _on_model_ready() -> None:
+    """Start what needs the loaded model."""
+    logger.info(f"Model info: {forecaster.get_model_info()}")
+    versions = model_registry.available()
+    if versions:
+        logger.info(f"Model versions available on request: {', '.join(versions)}")
+    # Started after loading so forked process workers inherit the model
+    inference_executor.start()
+    model_reloader.start_watching()
+
+
+# Loads the model after startup while the server accepts connections
+model_loader = ModelLoader(get_forecaster, on_ready=_on_model_ready, warmup=warmup)
 
 
 async def startup_event():
-    """Load ML model on application startup."""
-    try:
-        logger.info("Loading model...")
-        forecaster.load()
-        logger.info("Model loaded successfully!")
-        logger.info(f"Model info: {forecaster.get_model_info()}")
-    except Exception as e:
-        logger.error(f"Error loading model: {e}")
-        raise
+    """Start loading the ML model in the background."""
+    model_loader.start()
 
 
 async def shutdown_event():
     """Clean up resources on shutdown."""
     logger.info("Shutting down API...")
+    model_loader.stop()
+    model_reloader.stop_watching()
+    inference_executor.shutdown()
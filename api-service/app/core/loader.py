@@ -0,0 +1,118 @@
+"""
+Background model loading.
+
+Loads and warms the forecaster in a thread after startup, so the server
+accepts connections (and answers liveness checks) immediately; readiness
+is reported once the model has served its test and warm-up predictions.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..models import SalesForecaster
+from .reloader import validate_forecaster
+
+logger = logging.getLogger(__name__)
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelLoader:
+    """Loads the serving forecaster in the background and tracks readiness."""
+
+    def __init__(
+        self,
+        current: Callable[[], SalesForecaster],
+        on_ready: Optional[Callable[[], None]] = None,
+        warmup: Optional[Callable[[SalesForecaster], float]] = None,
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            current: Returns the forecaster serving requests
+            on_ready: Called on the event loop once the model is ready
+                (e.g. to start inference workers that must fork after
+                loading)
+            warmup: Optional warm-up run on the validated forecaster before
+                it is reported ready (see warm_up); returns its seconds
+        """
+        self.current = current
+        self.on_ready = on_ready
+        self.warmup = warmup
+        self.status = LOADING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the serving model is loaded and warmed."""
+        return self.status == READY and self.current().is_loaded
+
+    def start(self) -> None:
+        """Start loading in the background (once)."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._load())
+
+    async def wait(self) -> None:
+        """Wait until loading has finished or failed."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    def stop(self) -> None:
+        """Cancel a load still waiting to finish."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def _load(self) -> None:
+        """Load unless preloaded, then warm with test predictions."""
+        forecaster = self.current()
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            if forecaster.is_loaded:
+                # Preloaded by the master process (app.server) before forking
+                logger.info("Model already loaded, warming up")
+            else:
+                logger.info("Loading model in the background...")
+                await loop.run_in_executor(None, forecaster.load)
+            await loop.run_in_executor(None, validate_forecaster, forecaster)
+            if self.warmup is not None:
+                seconds = await loop.run_in_executor(None, self.warmup, forecaster)
+                self.warmup_seconds = round(seconds, 3)
+        except Exception as e:
+            self.status = FAILED
+            self.error = str(e)
+            logger.error(f"Error loading model: {e}")
+            return
+
+        self.load_seconds = round(time.perf_counter() - start, 3)
+        if self.on_ready is not None:
+            self.on_ready()
+        self.status = READY
+        logger.info(f"Model ready in {self.load_seconds:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get readiness information.
+
+        Returns:
+            Dictionary with status (loading, ready or failed), model_loaded,
+            load_seconds, warmup_seconds, load_timings (seconds per artifact
+            and step) and error
+        """
+        forecaster = self.current()
+        return {
+            "status": self.status,
+            "model_loaded": forecaster.is_loaded,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "load_timings": dict(forecaster.load_timings) or None,
+            "error": self.error,
+        }
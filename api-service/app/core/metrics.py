@@ -0,0 +1,350 @@
+"""
+Prometheus metrics.
+
+Request counts and latency histograms per route, per-stage forecaster
+latencies and serving state, rendered in the Prometheus text format by
+/metrics. Recording an observation is a bucket search and a few additions
+under an uncontended lock, about a microsecond, so collection can stay on
+under full load.
+
+Each worker process keeps its own metrics; the worker_info pid label
+tells the series of different workers apart.
+"""
+
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a cached prediction to a large batch
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Route label of requests that matched no route, so unknown paths cannot
+# grow the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    """Render {name="value",...}, or nothing without labels."""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value (integers without a trailing .0)."""
+    if math.isfinite(value) and value == int(value) and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Labelled metric family with its samples kept per label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Labels = ()):
+        """
+        Initialize metric.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            label_names: Names of the labels given with each observation
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _sample_lines(self) -> List[str]:
+        """Sample lines of the family."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """HELP, TYPE and sample lines of the family."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._sample_lines(),
+        ]
+
+
+class _ValueMetric(Metric):
+    """Metric holding a single value per label values."""
+
+    def __init__(self, name: str, documentation: str, label_names: Labels = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        """Add amount to the value of the given label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        """Current value of the given label values."""
+        return self._values.get(labels, 0.0)
+
+    def _sample_lines(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Counter(_ValueMetric):
+    """Monotonically increasing count per label values."""
+
+    kind = "counter"
+
+
+class Gauge(_ValueMetric):
+    """Value that can go up and down (inc with a negative amount)."""
+
+    kind = "gauge"
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Set the value of the given label values."""
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def clear(self) -> None:
+        """Drop every sample (e.g. label values that no longer apply)."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """Observation counts per bucket, with their sum, per label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Labels = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Increasing upper bounds; +Inf is added
+        """
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(float(bound) for bound in buckets)
+        # Per label values: [count per bucket (+Inf last)..., sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record an observation for the given label values."""
+        # First bucket whose upper bound is >= value (+Inf past the end)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[bucket] += 1
+            series[-1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        """Observations recorded for the given label values."""
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series is not None else 0
+
+    def _sample_lines(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, list(s)) for labels, s in self._series.items())
+
+        lines = []
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, values in series:
+            cumulative = 0.0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    self.label_names + ("le",), labels + (bound,)
+                )
+                lines.append(
+                    f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}"
+                )
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {repr(values[-1])}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metric families rendered together by /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric family.
+
+        Raises:
+            ValueError: If a family with the same name is registered
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every family in the Prometheus text format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests handled, by method, route and status code.",
+        ("method", "route", "status"),
+    )
+)
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from receiving a request to sending its last byte.",
+        ("method", "route"),
+    )
+)
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests being handled.")
+)
+STAGE_LATENCY = registry.register(
+    Histogram(
+        "forecaster_stage_seconds",
+        "Time per prediction call spent in each stage (validation, encoding, "
+        "forest, interval, serialization).",
+        ("stage",),
+    )
+)
+MODEL_LOADED = registry.register(
+    Gauge("model_loaded", "Whether the serving model is loaded (1) or not (0).")
+)
+MODEL_LOAD_SECONDS = registry.register(
+    Gauge(
+        "model_load_seconds",
+        "Seconds spent per artifact and step by the last model load.",
+        ("step",),
+    )
+)
+INFERENCE_IN_FLIGHT = registry.register(
+    Gauge("inference_in_flight", "Calls running or waiting in the inference pool.")
+)
+INFERENCE_QUEUE_DEPTH = registry.register(
+    Gauge("inference_queue_depth", "Calls waiting for a free inference worker.")
+)
+WORKER_INFO = registry.register(
+    Gauge("worker_info", "Identity of the worker process serving /metrics.", ("pid",))
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record the time a prediction call spent in a stage."""
+    STAGE_LATENCY.observe(seconds, (stage,))
+
+
+def render_metrics(forecaster, executor=None) -> str:
+    """
+    Update the serving-state gauges and render every metric.
+
+    Args:
+        forecaster: SalesForecaster serving requests
+        executor: Optional InferenceExecutor whose load is reported
+    """
+    MODEL_LOADED.set(1 if forecaster.is_loaded else 0)
+    MODEL_LOAD_SECONDS.clear()
+    for step, seconds in forecaster.load_timings.items():
+        MODEL_LOAD_SECONDS.set(seconds, (step,))
+    if executor is not None:
+        INFERENCE_IN_FLIGHT.set(executor.in_flight)
+        INFERENCE_QUEUE_DEPTH.set(executor.queue_depth)
+    # Forked workers inherit the parent's samples, so set the pid afresh
+    WORKER_INFO.clear()
+    WORKER_INFO.set(1, (str(os.getpid()),))
+    return registry.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting and timing requests per route.
+
+    Routes are labelled with their path template (/api/v1/predict), read
+    from the route FastAPI matched, so path parameters and unknown paths
+    do not create new series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: Optional[int] = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.inc(amount=-1)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            # No response started: the exception becomes a 500
+            status = str(status_code if status_code is not None else 500)
+            REQUESTS.inc((method, route, status))
+            REQUEST_LATENCY.observe(elapsed, (method, route))
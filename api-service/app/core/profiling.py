@@ -0,0 +1,185 @@
+"""
+On-demand request profiling.
+
+With REQUEST_PROFILING enabled, a request sent with an X-Profile header
+gets a Server-Timing header breaking its time down by stage (validation,
+encoding, forest, interval, inference wait, serialization), and with
+"X-Profile: cprofile" also a cProfile dump of its forecaster call in
+PROFILE_DIR. Other requests pay only a ContextVar lookup per stage.
+"""
+
+import cProfile
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .config import settings
+from .metrics import observe_stage
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_DUMP_HEADER = "X-Profile-Dump"
+CPROFILE = "cprofile"
+
+# Stage timings of the profiled call running in this thread or task
+_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "profile_stages", default=None
+)
+
+# cProfile allows a single active profiler per process from Python 3.12
+_cprofile_lock = threading.Lock()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Report the time spent in a prediction stage.
+
+    Recorded in the metrics (when enabled) and, inside a profiled call, in
+    that call's stage timings. Used as the forecaster's stage observer.
+    """
+    if settings.metrics:
+        observe_stage(stage, seconds)
+    stages = _stages.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+class RequestProfile:
+    """Stage timings (and optional cProfile dump) of a single request."""
+
+    def __init__(self, name: str, dump_path: Optional[Path] = None):
+        """
+        Initialize profile.
+
+        Args:
+            name: Route name, used as the dump file prefix
+            dump_path: Where to write a cProfile dump, or None for
+                Server-Timing only
+        """
+        self.name = name
+        self.dump_path = dump_path
+        self.dumped = False
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def merge(self, stages: Dict[str, float]) -> None:
+        """Add the stage timings collected by a profiled call."""
+        for stage, seconds in stages.items():
+            self.add(stage, seconds)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time a block of this process as a stage (cProfiled if requested)."""
+        started = time.perf_counter()
+        with _cprofile(self.dump_path) as dumped:
+            try:
+                yield
+            finally:
+                self.add(stage, time.perf_counter() - started)
+        self.dumped = self.dumped or dumped[0]
+
+    def server_timing(self) -> str:
+        """
+        Render the stages as a Server-Timing header value (milliseconds).
+
+        total covers the route from the profile's creation (after request
+        body validation) until now.
+        """
+        total = time.perf_counter() - self._started
+        metrics = [
+            f"{stage};dur={seconds * 1000:.3f}"
+            for stage, seconds in self.stages.items()
+        ]
+        metrics.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(metrics)
+
+    def apply(self, headers) -> None:
+        """Set Server-Timing (and the dump file name) on response headers."""
+        headers["Server-Timing"] = self.server_timing()
+        if self.dumped:
+            headers[PROFILE_DUMP_HEADER] = self.dump_path.name
+
+
+def start_profile(name: str, header: Optional[str]) -> Optional[RequestProfile]:
+    """
+    Start profiling a request if it asks to and profiling is enabled.
+
+    Args:
+        name: Route name
+        header: Value of the request's X-Profile header ("cprofile" also
+            dumps a cProfile; any other value only adds Server-Timing)
+
+    Returns:
+        RequestProfile, or None when the request is not profiled
+    """
+    if not settings.request_profiling or not header:
+        return None
+
+    dump_path = None
+    if header.strip().lower() == CPROFILE:
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        dump_path = (
+            Path(settings.profile_dir)
+            / f"{name}-{stamp}-{os.getpid()}-{uuid.uuid4().hex[:8]}.prof"
+        )
+    return RequestProfile(name, dump_path)
+
+
+@contextmanager
+def _cprofile(dump_path: Optional[Path]) -> Iterator[list]:
+    """
+    cProfile the block into dump_path.
+
+    Yields a one-item list set to True once the dump is written. Nothing
+    is profiled without a path or while another request is profiled.
+    """
+    dumped = [False]
+    if dump_path is None or not _cprofile_lock.acquire(blocking=False):
+        yield dumped
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield dumped
+        finally:
+            profiler.disable()
+            dump_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(dump_path))
+            dumped[0] = True
+    finally:
+        _cprofile_lock.release()
+
+
+def profiled_call(
+    target: Callable[[], Any],
+    method: str,
+    args: Tuple[Any, ...],
+    dump_path: Optional[Path] = None,
+) -> Tuple[Any, Dict[str, float], bool]:
+    """
+    Call a method on the target, collecting its stage timings.
+
+    Runs inside the inference pool (a module-level function, so process
+    workers can receive it).
+
+    Returns:
+        Tuple (method result, stage timings, whether a cProfile dump was
+        written to dump_path)
+    """
+    token = _stages.set({})
+    try:
+        with _cprofile(dump_path) as dumped:
+            result = getattr(target(), method)(*args)
+        return result, _stages.get(), dumped[0]
+    finally:
+        _stages.reset(token)
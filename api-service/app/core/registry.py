@@ -0,0 +1,228 @@
+"""
+Model version registry.
+
+Serves several trained models side by side (per-year retrains, candidate
+vs production) next to the default one in models_dir. Every subdirectory
+of the versions directory holding a complete artifact set is a version,
+named after the directory. A version is loaded and validated on its first
+request and kept in an LRU bounded by the estimated memory of the loaded
+versions; loading one past the budget drops the least recently used.
+Process inference workers keep their own registry and load a version on
+the first call they get for it, so the pool is not re-forked per version.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models import SalesForecaster
+from .reloader import validate_forecaster
+
+logger = logging.getLogger(__name__)
+
+MB = 2**20
+
+
+class UnknownModelVersion(Exception):
+    """Raised when no complete artifact set has the requested version."""
+
+
+def version_forecaster(version: str) -> SalesForecaster:
+    """
+    Resolve a model version in the current process (inference target).
+
+    Module-level so process workers can unpickle it; a worker forked
+    before the version was loaded loads its own copy.
+    """
+    from .. import core
+
+    return core.model_registry.resolve(version)
+
+
+class ModelRegistry:
+    """Lazily loaded model versions in a memory-bounded LRU."""
+
+    def __init__(
+        self,
+        factory: Callable[[str], SalesForecaster],
+        versions_dir: str,
+        max_memory_mb: float = 1024.0,
+    ):
+        """
+        Initialize registry (nothing is loaded until requested).
+
+        Args:
+            factory: Creates an unloaded forecaster for a models directory
+                with the serving settings
+            versions_dir: Directory whose subdirectories are the versions
+            max_memory_mb: Budget for the loaded versions' estimated memory,
+                memory-mapped forests included (see
+                SalesForecaster.memory_bytes); the most recently used
+                version is kept even if it alone exceeds it
+        """
+        self.factory = factory
+        self.versions_dir = Path(versions_dir)
+        self.max_memory_bytes = int(max_memory_mb * MB)
+
+        # Loaded versions, least recently used first
+        self._versions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        # Loads also happen in inference threads (see resolve)
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def available(self) -> List[str]:
+        """Names of the versions with a complete artifact set on disk."""
+        if not self.versions_dir.is_dir():
+            return []
+        return sorted(
+            path.name
+            for path in self.versions_dir.iterdir()
+            if path.is_dir() and None not in self.factory(str(path)).artifacts_stamp()
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory of the loaded versions."""
+        return sum(entry["memory_bytes"] for entry in self._versions.values())
+
+    def _touch(self, version: str) -> Optional[SalesForecaster]:
+        """Mark a loaded version as most recently used and return it."""
+        with self._lock:
+            entry = self._versions.get(version)
+            if entry is None:
+                return None
+            self._versions.move_to_end(version)
+            entry["last_used"] = time.monotonic()
+            return entry["forecaster"]
+
+    async def get(self, version: str) -> SalesForecaster:
+        """
+        Get a version for a request, loading it first if needed.
+
+        Loading runs in a thread, so the event loop keeps serving requests
+        meanwhile; concurrent requests for the same version share one load.
+
+        Raises:
+            UnknownModelVersion: If the version has no complete artifact set
+            Exception: Whatever loading or validation raised
+        """
+        forecaster = self._touch(version)
+        if forecaster is None:
+            loading = self._loading.get(version)
+            if loading is None:
+                if version not in self.available():
+                    raise UnknownModelVersion(f"Unknown model version '{version}'")
+                loop = asyncio.get_running_loop()
+                loading = loop.run_in_executor(None, self.load, version)
+                self._loading[version] = loading
+                loading.add_done_callback(lambda _: self._loading.pop(version, None))
+            forecaster = await asyncio.shield(loading)
+
+        with self._lock:
+            entry = self._versions.get(version)
+            if entry is not None:
+                entry["requests"] += 1
+        return forecaster
+
+    def load(self, version: str) -> SalesForecaster:
+        """
+        Load and validate a version, then add it to the LRU (any thread).
+
+        Raises:
+            Exception: Whatever loading or validation raised
+        """
+        start = time.perf_counter()
+        forecaster = self.factory(str(self.versions_dir / version))
+        forecaster.load()
+        validate_forecaster(forecaster)
+        entry = {
+            "forecaster": forecaster,
+            # Mapped forests count too: each version maps its own files
+            "memory_bytes": forecaster.memory_bytes(mapped=True),
+            "load_seconds": round(time.perf_counter() - start, 3),
+            "last_used": time.monotonic(),
+            "requests": 0,
+        }
+
+        with self._lock:
+            self._versions[version] = entry
+            self._versions.move_to_end(version)
+            self.loads += 1
+            self._evict()
+        logger.info(
+            f"Model version {version} loaded in {entry['load_seconds']:.2f}s "
+            f"({entry['memory_bytes'] / MB:.1f} MB, trained "
+            f"{forecaster.metadata.get('trained_date')})"
+        )
+        return forecaster
+
+    def _evict(self) -> None:
+        """Drop least recently used versions down to the budget (lock held)."""
+        while self.memory_bytes > self.max_memory_bytes and len(self._versions) > 1:
+            version, entry = self._versions.popitem(last=False)
+            self.evictions += 1
+            logger.info(
+                f"Model version {version} evicted "
+                f"({entry['memory_bytes'] / MB:.1f} MB)"
+            )
+        if self.memory_bytes > self.max_memory_bytes:
+            logger.warning(
+                f"Model version {next(iter(self._versions))} alone exceeds the "
+                f"{self.max_memory_bytes / MB:.0f} MB budget"
+            )
+
+    def resolve(self, version: str) -> SalesForecaster:
+        """
+        Get a version in an inference worker.
+
+        Normally loaded by get() already in this process; a process worker
+        (forked from the server, with its own registry) or a thread running
+        after the version was evicted loads it.
+        """
+        return self._touch(version) or self.load(version)
+
+    def target(self, version: str) -> Callable[[], SalesForecaster]:
+        """Inference executor target resolving a version (picklable)."""
+        return functools.partial(version_forecaster, version)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get available and loaded versions.
+
+        Returns:
+            Dictionary with versions_dir, available, loaded (most recently
+            used first: version, trained_date, n_estimators, memory_mb,
+            load_seconds, requests and idle_seconds), memory_mb,
+            max_memory_mb, loads and evictions
+        """
+        now = time.monotonic()
+        with self._lock:
+            loaded = [
+                {
+                    "version": version,
+                    "trained_date": entry["forecaster"].metadata.get("trained_date"),
+                    "n_estimators": entry["forecaster"].n_estimators,
+                    "memory_mb": round(entry["memory_bytes"] / MB, 2),
+                    "load_seconds": entry["load_seconds"],
+                    "requests": entry["requests"],
+                    "idle_seconds": round(now - entry["last_used"], 3),
+                }
+                for version, entry in reversed(self._versions.items())
+            ]
+            memory_bytes = self.memory_bytes
+        return {
+            "versions_dir": str(self.versions_dir),
+            "available": self.available(),
+            "loaded": loaded,
+            "memory_mb": round(memory_bytes / MB, 2),
+            "max_memory_mb": round(self.max_memory_bytes / MB, 2),
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
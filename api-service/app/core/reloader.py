@@ -0,0 +1,215 @@
+"""
+Hot model reload.
+
+Loads new artifacts from the models directory next to the serving model,
+checks them with a few test predictions and only then swaps them in.
+Requests already running keep the forecaster they started with, so a
+deploy no longer needs a restart. A reload is triggered by the admin
+endpoint or by watching the artifact files for changes.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models import SalesForecaster
+from ..models.sales_forecaster import LABEL_ENCODED_FIELDS
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_ROWS = 8
+
+
+class ReloadInProgress(Exception):
+    """Raised when a reload is requested while another one is running."""
+
+
+def validate_forecaster(
+    forecaster: SalesForecaster, n_rows: int = VALIDATION_ROWS
+) -> None:
+    """
+    Run test predictions over the loaded encoders' labels.
+
+    Args:
+        forecaster: Loaded forecaster to check
+        n_rows: Number of test properties
+
+    Raises:
+        RuntimeError: If a prediction fails or is not a positive price
+    """
+    labels = {
+        field: list(forecaster.label_encoders[field].classes_)
+        for field in LABEL_ENCODED_FIELDS
+    }
+    counties = [c for c in forecaster.target_encodings["county_map"] if c != "UNKNOWN"]
+    regions = [p for p in forecaster.target_encodings["postcode_map"] if p != "UNKNOWN"]
+
+    records: List[Dict[str, Any]] = [
+        {
+            **{field: values[i % len(values)] for field, values in labels.items()},
+            "county": counties[i % len(counties)] if counties else "UNKNOWN",
+            "postcode": regions[i % len(regions)] if regions else "UNKNOWN",
+            "year": 1995 + i * 7 % 30,
+        }
+        for i in range(n_rows)
+    ]
+
+    for record, result in zip(records, forecaster.predict_batch(records)["results"]):
+        if "error" in result:
+            raise RuntimeError(
+                f"Test prediction failed for {record}: {result['error']}"
+            )
+        price = result["predicted_price"]
+        if not (math.isfinite(price) and price > 0):
+            raise RuntimeError(f"Test prediction for {record} returned {price}")
+
+
+class ModelReloader:
+    """Loads, validates and atomically swaps in a new forecaster."""
+
+    def __init__(
+        self,
+        factory: Callable[[], SalesForecaster],
+        current: Callable[[], SalesForecaster],
+        install: Callable[[SalesForecaster], None],
+        executor=None,
+        watch_interval: float = 0.0,
+        warmup: Optional[Callable[[SalesForecaster], float]] = None,
+    ):
+        """
+        Initialize reloader.
+
+        Args:
+            factory: Creates an unloaded forecaster with the serving settings
+            current: Returns the forecaster serving requests
+            install: Makes a forecaster the one serving requests
+            executor: Optional InferenceExecutor restarted after a swap (so
+                process workers are forked with the new model)
+            watch_interval: Seconds between checks of the artifact files
+                (0 disables watching)
+            warmup: Optional warm-up run on the new forecaster before it is
+                swapped in (see warm_up)
+        """
+        self.factory = factory
+        self.current = current
+        self.install = install
+        self.executor = executor
+        self.watch_interval = watch_interval
+        self.warmup = warmup
+
+        self._lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._failed_stamp: Optional[Tuple[Any, ...]] = None
+        self.reloads = 0
+
+    async def reload(self) -> Dict[str, Any]:
+        """
+        Load the artifacts in models_dir and swap them in if they work.
+
+        Loading (and warming up) runs in a thread, so the event loop keeps
+        serving requests on the current model meanwhile.
+
+        Returns:
+            Dictionary with previous and new trained_date, load_seconds and
+            the pid of the reloaded process
+
+        Raises:
+            ReloadInProgress: If another reload is running
+            Exception: Whatever loading or validation raised (the current
+                model keeps serving)
+        """
+        if self._lock.locked():
+            raise ReloadInProgress("A model reload is already in progress")
+
+        async with self._lock:
+            start = time.perf_counter()
+            forecaster = self.factory()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._load_and_validate, forecaster)
+            if self.warmup is not None:
+                await loop.run_in_executor(None, self.warmup, forecaster)
+
+            previous = self.current()
+            self.install(forecaster)
+            if self.executor is not None:
+                self.executor.restart()
+            self.reloads += 1
+
+            elapsed = time.perf_counter() - start
+            trained_date = forecaster.metadata.get("trained_date")
+            logger.info(
+                f"Model reloaded in process {os.getpid()} in {elapsed:.2f}s "
+                f"(trained {trained_date})"
+            )
+            return {
+                "previous_trained_date": (
+                    previous.metadata.get("trained_date")
+                    if previous.is_loaded
+                    else None
+                ),
+                "trained_date": trained_date,
+                "load_seconds": round(elapsed, 3),
+                "pid": os.getpid(),
+            }
+
+    @staticmethod
+    def _load_and_validate(forecaster: SalesForecaster) -> None:
+        """Load artifacts and run test predictions (in a worker thread)."""
+        forecaster.load()
+        validate_forecaster(forecaster)
+
+    async def check_for_update(
+        self, previous_stamp: Optional[Tuple[Any, ...]]
+    ) -> Tuple[Any, ...]:
+        """
+        Reload if the artifact files changed and have stopped changing.
+
+        Args:
+            previous_stamp: Stamp seen at the previous check
+
+        Returns:
+            The current stamp, to pass to the next check
+        """
+        forecaster = self.current()
+        stamp = forecaster.artifacts_stamp()
+        if (
+            stamp == forecaster.loaded_stamp
+            or stamp == self._failed_stamp
+            or None in stamp
+            or stamp != previous_stamp  # still being copied, wait a round
+        ):
+            return stamp
+
+        try:
+            await self.reload()
+        except ReloadInProgress:
+            pass
+        except Exception as e:
+            # Keep serving; retried once the files change again
+            logger.error(f"Model reload failed, keeping current model: {e}")
+            self._failed_stamp = stamp
+        return stamp
+
+    async def _watch(self) -> None:
+        """Check the artifact files every watch_interval seconds."""
+        stamp = None
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            stamp = await self.check_for_update(stamp)
+
+    def start_watching(self) -> None:
+        """Start the file watcher if an interval is configured."""
+        if self.watch_interval > 0 and self._watch_task is None:
+            self._watch_task = asyncio.ensure_future(self._watch())
+            logger.info(
+                f"Watching model artifacts every {self.watch_interval}s for changes"
+            )
+
+    def stop_watching(self) -> None:
+        """Stop the file watcher."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
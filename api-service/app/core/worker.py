@@ -0,0 +1,41 @@
+"""
+Worker process information.
+
+Identity and memory usage of the current worker process.
+"""
+
+import os
+import resource
+from typing import Any, Dict, Optional
+
+PROC_STATUS = "/proc/self/status"
+STATUS_FIELDS = {"VmRSS": "rss_mb", "RssAnon": "rss_anon_mb", "RssFile": "rss_file_mb"}
+
+
+def get_worker_info() -> Dict[str, Any]:
+    """
+    Get the current worker's pid and resident memory.
+
+    On Linux, RSS is split into anonymous (private) and file-backed
+    memory; memory-mapped model arrays show up as file-backed pages,
+    shared with the other workers. Elsewhere only peak RSS is reported.
+
+    Returns:
+        Dictionary with pid, rss_mb, rss_anon_mb and rss_file_mb
+    """
+    info: Dict[str, Optional[Any]] = {"pid": os.getpid()}
+    info.update({name: None for name in STATUS_FIELDS.values()})
+
+    try:
+        with open(PROC_STATUS) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in STATUS_FIELDS:
+                    # Values are reported in kB
+                    info[STATUS_FIELDS[key]] = round(int(value.split()[0]) / 1024, 2)
+    except OSError:
+        # Peak RSS (kB on Linux, bytes on macOS; this branch is not Linux)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        info["rss_mb"] = round(peak / (1024 * 1024), 2)
+
+    return info
@@ -9,7 +9,8 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .core import shutdown_event, startup_event
+from .core import settings, shutdown_event, startup_event
+from .core.metrics import MetricsMiddleware
 from .routers import health_router, predictions_router
 
 # Configure logging
@@ -35,6 +36,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts and latencies per route (outermost, so CORS is included)
+if settings.metrics:
+    app.add_middleware(MetricsMiddleware)
+
 # Lifecycle events
 app.on_event("startup")(startup_event)
 app.on_event("shutdown")(shutdown_event)
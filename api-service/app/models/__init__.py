@@ -0,0 +1,19 @@
+"""
+ML models.
+"""
+
+from .conformal_intervals import ConformalIntervals
+from .flat_forest import FlatForest
+from .postcode_encoder import PostcodeEncoder
+from .prediction_cache import PredictionCache
+from .prediction_table import PredictionTable
+from .sales_forecaster import SalesForecaster
+
+__all__ = [
+    "SalesForecaster",
+    "ConformalIntervals",
+    "FlatForest",
+    "PostcodeEncoder",
+    "PredictionCache",
+    "PredictionTable",
+]
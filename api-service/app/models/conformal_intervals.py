@@ -0,0 +1,198 @@
+"""
+Conformal Intervals - calibrated prediction intervals per segment.
+
+Per-tree percentiles describe how much the trees disagree, not how far
+prices fall from the prediction, and cost a percentile over the trees of
+every row. Split conformal intervals instead take held-out log-price
+residuals (observed minus predicted, e.g. the forest's out-of-bag
+predictions) of the training pipeline and keep, per segment (property
+type x postcode area), the two residual quantiles giving the target
+coverage. At serving time a row's interval is its predicted log price
+shifted by its segment's quantiles: a dict lookup per row. Segments with
+fewer than min_segment_size residuals fall back to their property type,
+then to all residuals.
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+from .postcode_encoder import postcode_area
+
+DEFAULT_COVERAGE = 0.8
+MIN_SEGMENT_SIZE = 30
+
+# (lower log offset, upper log offset, residuals)
+Quantiles = Tuple[float, float, int]
+
+
+def residual_quantiles(residuals: np.ndarray, coverage: float) -> Quantiles:
+    """
+    Lower and upper residual quantiles with finite-sample coverage.
+
+    The upper bound is the ceil((n + 1)(1 - alpha / 2))-th smallest
+    residual and the lower bound the floor((n + 1) alpha / 2)-th, clipped to
+    the observed range, so new residuals from the same distribution fall
+    between them with probability at least coverage (up to the clipping).
+
+    Args:
+        residuals: Held-out log-price residuals
+        coverage: Target coverage in (0, 1)
+    """
+    ordered = np.sort(np.asarray(residuals, dtype=np.float64))
+    n = len(ordered)
+    alpha = 1.0 - coverage
+    # Rounded first so 0.8 coverage of 99 residuals gives ranks 10 and 90
+    upper = min(math.ceil(round((n + 1) * (1 - alpha / 2), 9)), n)
+    lower = max(math.floor(round((n + 1) * alpha / 2, 9)), 1)
+    return float(ordered[lower - 1]), float(ordered[upper - 1]), n
+
+
+class ConformalIntervals:
+    """Residual quantiles per segment, applied to predicted log prices."""
+
+    INTERVALS_FILE = "final_conformal_intervals.joblib"
+
+    def __init__(self, index: Dict[str, Any]):
+        """
+        Initialize from an intervals index.
+
+        Args:
+            index: Dictionary with coverage, min_segment_size, trained_date,
+                overall (Quantiles of all residuals), property_types
+                (property type -> Quantiles) and segments ((property type,
+                postcode area) -> Quantiles)
+        """
+        self.index = index
+        self.coverage = float(index["coverage"])
+        self._overall = tuple(index["overall"][:2])
+        self._property_types = {
+            property_type: tuple(quantiles[:2])
+            for property_type, quantiles in index["property_types"].items()
+        }
+        self._segments = {
+            tuple(segment): tuple(quantiles[:2])
+            for segment, quantiles in index["segments"].items()
+        }
+
+    @classmethod
+    def from_residuals(
+        cls,
+        residuals: Sequence[float],
+        property_types: Sequence[str],
+        outward_codes: Sequence[str],
+        coverage: float = DEFAULT_COVERAGE,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        trained_date: Optional[str] = None,
+    ) -> "ConformalIntervals":
+        """
+        Compute the quantiles of held-out residuals per segment.
+
+        Args:
+            residuals: Log-price residuals (log price minus predicted log
+                price) of rows the model was not fitted on
+            property_types: Property type of each row
+            outward_codes: Postcode outward code (postcode_region) of each row
+            coverage: Target coverage in (0, 1)
+            min_segment_size: Fewest residuals for a segment or property
+                type to get its own quantiles
+            trained_date: trained_date of the model the residuals are for
+
+        Raises:
+            ValueError: If coverage is not in (0, 1) or there are no residuals
+        """
+        if not 0 < coverage < 1:
+            raise ValueError(f"Coverage must be in (0, 1), got {coverage}")
+        residuals = np.asarray(residuals, dtype=np.float64)
+        if len(residuals) == 0:
+            raise ValueError("No residuals to calibrate intervals on")
+
+        property_types = [str(value) for value in property_types]
+        areas = [postcode_area(str(code)) for code in outward_codes]
+
+        def grouped(keys):
+            rows: Dict[Any, list] = {}
+            for i, key in enumerate(keys):
+                rows.setdefault(key, []).append(i)
+            return {
+                key: residual_quantiles(residuals[members], coverage)
+                for key, members in sorted(rows.items())
+                if len(members) >= min_segment_size
+            }
+
+        return cls(
+            {
+                "coverage": float(coverage),
+                "min_segment_size": int(min_segment_size),
+                "trained_date": trained_date,
+                "overall": residual_quantiles(residuals, coverage),
+                "property_types": grouped(property_types),
+                "segments": grouped(list(zip(property_types, areas))),
+            }
+        )
+
+    def offsets(
+        self, property_types: Sequence[str], outward_codes: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Look up the log offsets of the interval bounds of each row.
+
+        Args:
+            property_types: Property type of each row
+            outward_codes: Outward code of each row
+
+        Returns:
+            Array of shape (2, n_rows) with lower and upper log offsets
+        """
+        segments, by_type, overall = (
+            self._segments,
+            self._property_types,
+            self._overall,
+        )
+        return np.array(
+            [
+                segments.get((property_type, postcode_area(code)))
+                or by_type.get(property_type, overall)
+                for property_type, code in zip(property_types, outward_codes)
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2).T
+
+    def matches(self, forecaster) -> bool:
+        """
+        Check the intervals were calibrated for the forecaster's model.
+
+        Args:
+            forecaster: Loaded SalesForecaster
+        """
+        return self.index.get("trained_date") == forecaster.metadata.get(
+            "trained_date"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the coverage and number of calibrated segments."""
+        return {
+            "coverage": self.coverage,
+            "segments": len(self._segments),
+            "property_types": len(self._property_types),
+            "min_segment_size": int(self.index["min_segment_size"]),
+        }
+
+    def save(self, models_dir: Path) -> Path:
+        """Write the intervals file into models_dir; returns its path."""
+        path = Path(models_dir) / self.INTERVALS_FILE
+        joblib.dump(self.index, path)
+        return path
+
+    @classmethod
+    def load(cls, models_dir: Path) -> "ConformalIntervals":
+        """
+        Load the intervals file of models_dir.
+
+        Raises:
+            FileNotFoundError: If the file is missing
+        """
+        return cls(joblib.load(Path(models_dir) / cls.INTERVALS_FILE))
@@ -0,0 +1,388 @@
+"""
+Flat Forest - native Random Forest inference engine.
+
+Flattens every tree of a fitted RandomForestRegressor into contiguous
+NumPy arrays and evaluates all trees for all rows with a vectorized
+level-by-level traversal, without going through sklearn at request time.
+
+The forest can also be stored in a compact single-file format (see
+save_compact): float32 thresholds and values, the narrowest integer type
+for feature indices and int32 child indices, behind a header holding the
+feature list and a checksum of the arrays.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+INDEX_FILE = "index.joblib"
+
+COMPACT_MAGIC = b"RFCF"
+COMPACT_VERSION = 1
+# Magic, format version, header length
+COMPACT_PREFIX = struct.Struct("<4sHI")
+COMPACT_ALIGNMENT = 64
+
+
+class FlatForest:
+    """Random Forest flattened into contiguous node arrays.
+
+    Nodes of all trees are stored back to back. Child indices are global
+    (already offset by the tree position) and leaves point to themselves.
+    Traversal advances all (tree, row) pairs one level at a time and drops
+    pairs from the active set as soon as they reach a leaf.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+    ):
+        """
+        Initialize from flattened node arrays.
+
+        Args:
+            feature: Feature index tested at each node (0 for leaves)
+            threshold: Split threshold at each node
+            left: Global index of the left child (self for leaves)
+            right: Global index of the right child (self for leaves)
+            value: Node value (log-price for leaves)
+            roots: Global index of each tree root
+            max_depth: Depth of the deepest tree
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.is_leaf = left == np.arange(len(left))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the node arrays."""
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the forest."""
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        """Total number of nodes across all trees."""
+        return len(self.value)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatForest":
+        """
+        Flatten a fitted sklearn RandomForestRegressor.
+
+        Args:
+            model: Fitted forest with estimators_
+
+        Returns:
+            FlatForest with the same predictions as the model
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left < 0
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+        )
+
+    def save(self, directory: Path, metadata: Dict[str, Any]) -> None:
+        """
+        Save node arrays as .npy files that can be memory-mapped.
+
+        Each file is written to a temporary name and renamed, and the index
+        is written last, so concurrent readers never see a partial forest.
+
+        Args:
+            directory: Target directory (created if missing)
+            metadata: Extra values stored in the index (e.g. trained_date)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+
+        for name in ARRAYS:
+            tmp_path = directory / f"{name}.npy{suffix}"
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(getattr(self, name)))
+            os.replace(tmp_path, directory / f"{name}.npy")
+
+        tmp_path = directory / f"{INDEX_FILE}{suffix}"
+        joblib.dump({"max_depth": self.max_depth, **metadata}, tmp_path)
+        os.replace(tmp_path, directory / INDEX_FILE)
+
+    @classmethod
+    def load(
+        cls, directory: Path, mmap_mode: Optional[str] = "r"
+    ) -> Tuple["FlatForest", Dict[str, Any]]:
+        """
+        Load node arrays saved with save().
+
+        With mmap_mode="r" the arrays are read-only memory maps, so every
+        process loading the same files shares one physical copy through
+        the page cache.
+
+        Args:
+            directory: Directory written by save()
+            mmap_mode: numpy mmap mode, or None to read into memory
+
+        Returns:
+            Tuple (forest, index metadata)
+
+        Raises:
+            FileNotFoundError: If the index or an array file is missing
+        """
+        directory = Path(directory)
+        index = joblib.load(directory / INDEX_FILE)
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in ARRAYS
+        }
+        return cls(max_depth=index["max_depth"], **arrays), index
+
+    def quantize(self) -> "FlatForest":
+        """
+        Convert to the compact dtypes.
+
+        Thresholds are rounded down to float32: features are compared as
+        float32, and for any float32 x, x <= t holds exactly when x is <=
+        the largest float32 not above t, so every row reaches the same
+        leaves. Leaf values are stored as float32 (relative error ~6e-8).
+
+        Returns:
+            FlatForest with float32 thresholds/values, uint8 or uint16
+            feature indices and int32 child indices
+        """
+        threshold = self.threshold.astype(np.float32)
+        above = threshold.astype(np.float64) > self.threshold
+        threshold[above] = np.nextafter(threshold[above], np.float32(-np.inf))
+
+        feature_type = np.uint8 if self.feature.max(initial=0) < 2**8 else np.uint16
+        if self.n_nodes >= 2**31:
+            raise ValueError(f"Forest too large for int32 indices ({self.n_nodes})")
+
+        return FlatForest(
+            feature=self.feature.astype(feature_type),
+            threshold=threshold,
+            left=self.left.astype(np.int32),
+            right=self.right.astype(np.int32),
+            value=self.value.astype(np.float32),
+            roots=self.roots.astype(np.int32),
+            max_depth=self.max_depth,
+        )
+
+    def save_compact(
+        self, path: Path, features: Sequence[str], metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Write the forest to a single compact binary file.
+
+        Layout: magic, version and header length; a JSON header (features,
+        max_depth, array dtypes/shapes/offsets, sha256 of the array bytes
+        and metadata); then each array, 64-byte aligned. The file is
+        written to a temporary name and renamed.
+
+        Args:
+            path: Target file
+            features: Feature names in model input order
+            metadata: Extra values stored in the header (e.g. trained_date)
+        """
+        forest = self.quantize()
+        arrays, offset, checksum = [], 0, hashlib.sha256()
+        layout: Dict[str, Dict[str, Any]] = {}
+        for name in ARRAYS:
+            array = np.ascontiguousarray(getattr(forest, name))
+            offset = -(-offset // COMPACT_ALIGNMENT) * COMPACT_ALIGNMENT
+            layout[name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            arrays.append((offset, array))
+            checksum.update(array.tobytes())
+            offset += array.nbytes
+
+        header = json.dumps(
+            {
+                "features": list(features),
+                "max_depth": forest.max_depth,
+                "arrays": layout,
+                "sha256": checksum.hexdigest(),
+                "metadata": metadata,
+            }
+        ).encode()
+        prefix = COMPACT_PREFIX.pack(COMPACT_MAGIC, COMPACT_VERSION, len(header))
+        data_start = -(-(len(prefix) + len(header)) // COMPACT_ALIGNMENT)
+        data_start *= COMPACT_ALIGNMENT
+
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(prefix + header)
+            for array_offset, array in arrays:
+                f.seek(data_start + array_offset)
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_compact(
+        cls, path: Path, verify: bool = True
+    ) -> Tuple["FlatForest", List[str], Dict[str, Any]]:
+        """
+        Memory-map a forest written by save_compact.
+
+        Args:
+            path: Compact forest file
+            verify: Check the array bytes against the header checksum
+
+        Returns:
+            Tuple (forest, feature names, header metadata)
+
+        Raises:
+            FileNotFoundError: If the file is missing
+            ValueError: If the file is not a compact forest of a supported
+                version, or the checksum does not match
+        """
+        if os.path.getsize(path) < COMPACT_PREFIX.size:
+            raise ValueError(f"{path} is not a compact forest")
+        # Plain ndarray view: memmap subclass overhead adds up per traversal step
+        data = np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+        magic, version, header_size = COMPACT_PREFIX.unpack(
+            data[: COMPACT_PREFIX.size].tobytes()
+        )
+        if magic != COMPACT_MAGIC or version != COMPACT_VERSION:
+            raise ValueError(
+                f"{path} is not a version {COMPACT_VERSION} compact forest"
+            )
+
+        header_end = COMPACT_PREFIX.size + header_size
+        header = json.loads(data[COMPACT_PREFIX.size : header_end].tobytes())
+        data_start = -(-header_end // COMPACT_ALIGNMENT) * COMPACT_ALIGNMENT
+
+        arrays, checksum = {}, hashlib.sha256()
+        for name in ARRAYS:
+            spec = header["arrays"][name]
+            dtype = np.dtype(spec["dtype"])
+            start = data_start + spec["offset"]
+            count = int(np.prod(spec["shape"]))
+            end = start + count * dtype.itemsize
+            if end > len(data):
+                raise ValueError(f"{path} is truncated")
+            arrays[name] = data[start:end].view(dtype).reshape(spec["shape"])
+            if verify:
+                checksum.update(arrays[name])
+
+        if verify and checksum.hexdigest() != header["sha256"]:
+            raise ValueError(f"{path} failed its checksum")
+
+        forest = cls(max_depth=header["max_depth"], **arrays)
+        return forest, header["features"], header["metadata"]
+
+    def apply(self, X: np.ndarray, n_trees: Optional[int] = None) -> np.ndarray:
+        """
+        Find the leaf reached by every row in every tree.
+
+        Args:
+            X: Feature matrix of shape (n_rows, n_features)
+            n_trees: Evaluate only the first n_trees trees (all if None)
+
+        Returns:
+            Global leaf indices of shape (n_trees, n_rows)
+        """
+        roots = self.roots[:n_trees]
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        X_flat = X.ravel()
+
+        # Traversal state stays intp: numpy converts narrower index arrays
+        # (compact forests) to intp on every fancy-indexing operation
+        nodes = np.repeat(roots.astype(np.intp), n_rows)
+        row_starts = np.tile(np.arange(n_rows, dtype=np.intp) * n_features, len(roots))
+        active = np.flatnonzero(~self.is_leaf[nodes])
+
+        while active.size:
+            current = nodes[active]
+            go_left = X_flat[row_starts[active] + self.feature[current]] <= (
+                self.threshold[current]
+            )
+            current = np.where(
+                go_left, self.left[current], self.right[current]
+            ).astype(np.intp, copy=False)
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+
+        return nodes.reshape(len(roots), n_rows)
+
+    def predict_trees(self, X: np.ndarray, n_trees: Optional[int] = None) -> np.ndarray:
+        """
+        Predict with every tree.
+
+        Args:
+            X: Feature matrix of shape (n_rows, n_features)
+            n_trees: Evaluate only the first n_trees trees (all if None)
+
+        Returns:
+            Per-tree predictions of shape (n_trees, n_rows)
+        """
+        return self.value[self.apply(X, n_trees)].astype(np.float64, copy=False)
+
+    def predict(
+        self, X: np.ndarray, n_trees: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict with the forest, or with its first n_trees trees.
+
+        Trees of a random forest are independent draws, so a prefix of the
+        forest is itself a smaller forest: evaluation cost is linear in
+        n_trees while the mean converges to the full forest's.
+
+        Args:
+            X: Feature matrix of shape (n_rows, n_features)
+            n_trees: Evaluate only the first n_trees trees (all if None)
+
+        Returns:
+            Tuple (mean prediction per row, per-tree prediction matrix)
+        """
+        tree_predictions = self.predict_trees(X, n_trees)
+        return tree_predictions.mean(axis=0), tree_predictions
@@ -0,0 +1,226 @@
+"""
+Postcode Encoder - hierarchical postcode target encoding.
+
+Training target-encodes the postcode outward code (the part before the
+space, e.g. SW1A). At serving time an outward code missing from the map
+used to fall back to a single UNKNOWN value. This encoder indexes every
+outward code together with its district (SW1) and area (SW), as means of
+the outward codes they contain, and resolves each postcode to the most
+specific known level, falling back to the county encoding.
+"""
+
+import re
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+LEVELS = ("outward", "district", "area")
+# Area letters, district digits and an optional sub-district letter or digit
+OUTWARD_PATTERN = re.compile(r"^[A-Z]{1,2}\d[A-Z\d]?$")
+INWARD_LENGTH = 3
+# Below this many codes, resolving each with dict lookups beats the arrays
+SMALL_BATCH = 16
+
+_DIGIT_0, _DIGIT_9 = ord("0"), ord("9")
+_LETTER_A, _LETTER_Z = ord("A"), ord("Z")
+
+
+def outward_code(postcode: str) -> str:
+    """
+    Get the outward code of a normalized (upper-case, stripped) postcode.
+
+    Like training, the outward code is the part before the first space;
+    postcodes written without a space (SW1A1AA) lose their 3-character
+    inward code instead.
+    """
+    parts = postcode.split(maxsplit=1)
+    if len(parts) > 1 or len(postcode) <= INWARD_LENGTH + 1:
+        return parts[0]
+    return postcode[:-INWARD_LENGTH]
+
+
+def postcode_area(code: str) -> str:
+    """
+    Get the postcode area of an outward code (SW1A -> SW, M1 -> M).
+
+    Returns:
+        The 1-2 letters before the first digit, or the whole code if it
+        does not start like an outward code
+    """
+    for position, char in enumerate(code[:3]):
+        if "0" <= char <= "9":
+            return code[:position] if position else code
+    return code
+
+
+class PostcodeEncoder:
+    """Sorted-array index of outward code, district and area encodings.
+
+    Keys of all levels live in one sorted array, tagged with their level
+    ("0SW1A", "1SW1", "2SW"), so resolving a batch of postcodes is a
+    single searchsorted over all candidate keys. Small batches (a single
+    /predict) use a dict of the same keys instead.
+    """
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray, width: int):
+        """
+        Initialize from a built index (see from_target_map).
+
+        Args:
+            keys: Sorted level-tagged keys
+            values: Encoding of each key
+            width: Longest indexed outward code
+        """
+        self.keys = keys
+        self.values = values
+        self.width = width
+        # The same index as dicts, for small batches
+        self._tables: Dict[str, float] = dict(zip(keys.tolist(), values.tolist()))
+
+    @classmethod
+    def from_target_map(cls, postcode_map: Dict[str, float]) -> "PostcodeEncoder":
+        """
+        Index a postcode target map (outward code -> encoding).
+
+        District and area encodings are the unweighted mean of the outward
+        codes they contain (the artifacts carry no per-code counts).
+        UNKNOWN is left out, as the county encoding is the better fallback;
+        other entries that are not outward codes are only matched exactly.
+
+        Args:
+            postcode_map: postcode_map of the target encodings artifact
+        """
+        codes = [code for code in postcode_map if code != "UNKNOWN"]
+        width = max([4, *(len(code) for code in codes)])
+        encodings = np.array([postcode_map[code] for code in codes], dtype=np.float64)
+        levels = cls._level_keys(np.array(codes, dtype=f"U{width}"), width)
+
+        keys, values = [levels[0]], [encodings]
+        is_outward = np.array([bool(OUTWARD_PATTERN.match(code)) for code in codes])
+        members = encodings[is_outward]
+        for parent_keys in levels[1:]:
+            parents, inverse = np.unique(parent_keys[is_outward], return_inverse=True)
+            keys.append(parents)
+            values.append(
+                np.bincount(inverse, weights=members, minlength=len(parents))
+                / np.bincount(inverse, minlength=len(parents))
+            )
+
+        keys = np.concatenate(keys)
+        order = np.argsort(keys, kind="stable")
+        return cls(keys[order], np.concatenate(values)[order], width)
+
+    @staticmethod
+    def _level_keys(codes: np.ndarray, width: int) -> np.ndarray:
+        """
+        Build the level-tagged keys of outward codes.
+
+        Works on the UCS-4 code points of the fixed-width string array, so
+        no Python string operation runs per code.
+
+        Args:
+            codes: Outward codes as a fixed-width unicode array
+            width: Character width to use (codes are padded or cut to it)
+
+        Returns:
+            Array of shape (3, n) with the outward, district and area keys
+        """
+        codes = np.ascontiguousarray(codes, dtype=f"U{width}")
+        chars = codes.view(np.uint32).reshape(len(codes), width)
+        n_chars = np.count_nonzero(chars, axis=1)
+        rows = np.arange(len(codes))
+        columns = np.arange(width)
+
+        is_digit = (chars >= _DIGIT_0) & (chars <= _DIGIT_9)
+        has_digit = is_digit.any(axis=1)
+        first_digit = np.argmax(is_digit, axis=1)
+        # Area: the 1-2 letters before the first digit
+        area_length = np.where(has_digit & (first_digit <= 2), first_digit, 0)
+        # District: without a trailing sub-district letter (SW1A -> SW1)
+        last = chars[rows, np.maximum(n_chars - 1, 0)]
+        ends_in_letter = (last >= _LETTER_A) & (last <= _LETTER_Z)
+        district_length = np.where(
+            has_digit & ends_in_letter & (n_chars - 1 > first_digit),
+            n_chars - 1,
+            n_chars,
+        )
+
+        tagged = np.zeros((3, len(codes), width + 1), dtype=np.uint32)
+        for level, length in enumerate((n_chars, district_length, area_length)):
+            tagged[level, :, 0] = _DIGIT_0 + level
+            tagged[level, :, 1:] = np.where(columns < length[:, None], chars, 0)
+        return tagged.view(f"U{width + 1}")[..., 0]
+
+    def encode(self, outward_codes: Sequence[str], fallback: np.ndarray) -> np.ndarray:
+        """
+        Encode outward codes at the most specific level known.
+
+        Args:
+            outward_codes: Outward codes (see outward_code)
+            fallback: Encoding per code when no level is known (e.g. the
+                county encoding)
+
+        Returns:
+            float64 array of encodings aligned with outward_codes
+        """
+        if len(outward_codes) < SMALL_BATCH:
+            # A single /predict: a few dict lookups beat the array machinery
+            values = map(self._resolve, outward_codes)
+            defaults = np.asarray(fallback, dtype=np.float64).tolist()
+            return np.array(
+                [
+                    default if value is None else value
+                    for value, default in zip(values, defaults)
+                ],
+                dtype=np.float64,
+            )
+
+        position = self._lookup(outward_codes)
+        return np.where(
+            position >= 0,
+            self.values[position],
+            np.asarray(fallback, dtype=np.float64),
+        )
+
+    def _resolve(self, code: str) -> Optional[float]:
+        """
+        Encode one outward code with dict lookups (see _level_keys).
+
+        Returns:
+            Encoding of the most specific known level, None if none
+        """
+        value = self._tables.get("0" + code)
+        if value is not None:
+            return value
+        first_digit = next((i for i, char in enumerate(code) if "0" <= char <= "9"), -1)
+        if first_digit < 0:
+            return None
+        if "A" <= code[-1] <= "Z" and len(code) - 1 > first_digit:
+            value = self._tables.get("1" + code[:-1])
+        else:
+            value = self._tables.get("1" + code)
+        if value is None and first_digit <= 2:
+            value = self._tables.get("2" + code[:first_digit])
+        return value
+
+    def _lookup(self, outward_codes: Sequence[str]) -> np.ndarray:
+        """
+        Find the most specific indexed key of each outward code.
+
+        Returns:
+            Index position of the resolving key per code, -1 if none
+        """
+        codes = np.asarray(outward_codes, dtype=np.str_)
+        queries = self._level_keys(codes, max(self.width, codes.dtype.itemsize // 4))
+
+        # One search over the candidate keys of every level
+        positions = np.searchsorted(self.keys, queries)
+        positions[positions == len(self.keys)] = 0
+        found = self.keys[positions] == queries
+        position = positions[np.argmax(found, axis=0), np.arange(len(codes))]
+        return np.where(found.any(axis=0), position, -1)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of indexed keys per level."""
+        tags = self.keys.astype("U1")
+        return {name: int(np.sum(tags == str(i))) for i, name in enumerate(LEVELS)}
@@ -0,0 +1,225 @@
+"""
+Prediction Table - precomputed predictions served from a memory map.
+
+Every model feature is categorical or a bounded year, so predictions can
+be precomputed for each (county, postcode region) pair, label combination
+and year. The table is a dense float64 array of shape
+(n_pairs, n_property_types, n_old_new, n_durations, n_years, 3) holding
+price, interval lower and interval upper, stored as .npy so it can be
+memory-mapped and shared through the page cache.
+"""
+
+import copy
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from numpy.lib.format import open_memmap
+
+logger = logging.getLogger(__name__)
+
+LABEL_FIELDS = ("property_type", "old_new", "duration")
+DEFAULT_YEARS = (1995, 2030)
+
+
+class PredictionTable:
+    """Dense lookup table of precomputed predictions."""
+
+    TABLE_FILE = "final_prediction_table.npy"
+    INDEX_FILE = "final_prediction_table_index.joblib"
+
+    def __init__(self, values: np.ndarray, index: Dict[str, Any]):
+        """
+        Initialize from table values and index.
+
+        Args:
+            values: Array of shape (n_pairs, *label_sizes, n_years, 3)
+            index: Dictionary with pairs, classes, years, trained_date,
+                interval_percentiles and interval_mode
+        """
+        self.values = values
+        self.index = index
+        self.first_year, self.last_year = index["years"]
+        self.hits = 0
+        self.misses = 0
+        # Lookups run concurrently in the inference threads
+        self._lock = threading.Lock()
+
+        self._pairs = {tuple(pair): i for i, pair in enumerate(index["pairs"])}
+        self._codes = [
+            {label: code for code, label in enumerate(index["classes"][field])}
+            for field in LABEL_FIELDS
+        ]
+
+    @property
+    def n_entries(self) -> int:
+        """Number of precomputed combinations."""
+        return int(np.prod(self.values.shape[:-1]))
+
+    def lookup(self, row: Tuple[Any, ...]) -> Optional[Tuple[float, float, float]]:
+        """
+        Look up a normalized row.
+
+        Args:
+            row: (property_type, old_new, duration, county, postcode_region, year)
+
+        Returns:
+            Tuple (price, lower, upper), or None if the combination is not
+            in the table
+        """
+        property_type, old_new, duration, county, postcode_region, year = row
+
+        pair = self._pairs.get((county, postcode_region))
+        codes = [
+            codes.get(value)
+            for codes, value in zip(self._codes, (property_type, old_new, duration))
+        ]
+        if (
+            pair is None
+            or None in codes
+            or not self.first_year <= year <= self.last_year
+        ):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        price, lower, upper = self.values[(pair, *codes, year - self.first_year)]
+        return float(price), float(lower), float(upper)
+
+    def detached(self) -> "PredictionTable":
+        """Get a table sharing the values and index, with its own counters."""
+        table = copy.copy(self)
+        table.hits = table.misses = 0
+        table._lock = threading.Lock()
+        return table
+
+    def matches(self, forecaster) -> bool:
+        """
+        Check the table was built for the forecaster's model and interval.
+
+        Args:
+            forecaster: Loaded SalesForecaster
+        """
+        return (
+            self.index["trained_date"] == forecaster.metadata.get("trained_date")
+            and tuple(self.index["interval_percentiles"])
+            == tuple(forecaster.interval_percentiles)
+            # Tables from before interval modes hold per-tree intervals
+            and self.index.get("interval_mode", "trees")
+            == forecaster.active_interval_mode
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Get table size and lookup counters."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {"entries": self.n_entries, "hits": hits, "misses": misses}
+
+    @classmethod
+    def load(cls, models_dir: Path) -> "PredictionTable":
+        """
+        Load a table with its values memory-mapped read-only.
+
+        Args:
+            models_dir: Directory containing the table files
+
+        Raises:
+            FileNotFoundError: If the table files are missing
+        """
+        models_dir = Path(models_dir)
+        index = joblib.load(models_dir / cls.INDEX_FILE)
+        values = np.load(models_dir / cls.TABLE_FILE, mmap_mode="r")
+        return cls(values, index)
+
+    @classmethod
+    def build(
+        cls,
+        forecaster,
+        pairs: Iterable[Tuple[str, str]],
+        output_dir: Path,
+        years: Tuple[int, int] = DEFAULT_YEARS,
+        chunk_pairs: int = 64,
+    ) -> "PredictionTable":
+        """
+        Precompute predictions and write the table files.
+
+        Args:
+            forecaster: Loaded SalesForecaster
+            pairs: (county, postcode_region) pairs to enumerate
+            output_dir: Directory to write the table files to
+            years: First and last year (inclusive)
+            chunk_pairs: Pairs evaluated per forest pass (bounds memory)
+
+        Returns:
+            The built table, memory-mapped from output_dir
+        """
+        output_dir = Path(output_dir)
+        pairs: List[Tuple[str, str]] = sorted(set(pairs))
+        classes = {
+            field: [str(c) for c in forecaster.label_encoders[field].classes_]
+            for field in LABEL_FIELDS
+        }
+        year_values = np.arange(years[0], years[1] + 1)
+        label_sizes = tuple(len(classes[field]) for field in LABEL_FIELDS)
+
+        values = open_memmap(
+            output_dir / cls.TABLE_FILE,
+            mode="w+",
+            dtype=np.float64,
+            shape=(len(pairs), *label_sizes, len(year_values), 3),
+        )
+
+        county_enc = np.array(
+            [forecaster._target_encode("county_map", c) for c, _ in pairs]
+        )
+        postcode_enc = forecaster._postcode_encode([p for _, p in pairs], county_enc)
+        # Segment keys of each entry, for conformal intervals
+        property_types = np.array(classes["property_type"])
+        postcode_regions = np.array([p for _, p in pairs])
+
+        for start in range(0, len(pairs), chunk_pairs):
+            stop = min(start + chunk_pairs, len(pairs))
+            shape = (stop - start, *label_sizes, len(year_values))
+            pair, property_type, old_new, duration, year = (
+                grid.ravel() for grid in np.indices(shape)
+            )
+            pair += start
+
+            price, lower, upper = forecaster.predict_encoded(
+                {
+                    "property_type_enc": property_type,
+                    "old_new_enc": old_new,
+                    "duration_enc": duration,
+                    "county_enc": county_enc[pair],
+                    "postcode_region_enc": postcode_enc[pair],
+                    "year": year_values[year],
+                },
+                segments=(
+                    property_types[property_type].tolist(),
+                    postcode_regions[pair].tolist(),
+                ),
+            )
+            values[start:stop] = np.stack([price, lower, upper], axis=-1).reshape(
+                (*shape, 3)
+            )
+
+        values.flush()
+        del values
+
+        index = {
+            "pairs": pairs,
+            "classes": classes,
+            "years": (int(years[0]), int(years[1])),
+            "trained_date": forecaster.metadata.get("trained_date"),
+            "interval_percentiles": tuple(forecaster.interval_percentiles),
+            "interval_mode": forecaster.active_interval_mode,
+        }
+        joblib.dump(index, output_dir / cls.INDEX_FILE)
+
+        logger.info(f"Prediction table built: {len(pairs)} pairs in {output_dir}")
+        return cls.load(output_dir)
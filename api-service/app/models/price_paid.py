@@ -0,0 +1,123 @@
+"""
+Price Paid records - Land Registry rows as SalesForecaster input.
+
+pp-complete.csv has no header: each row holds the transaction id followed
+by the columns named in notebooks/01_exploratory_analysis. Files with a
+header row (e.g. uk_property_cleaned.csv) and NDJSON objects are also
+accepted. Each row becomes the dictionary SalesForecaster.predict expects,
+plus an "id" when the source carries a transaction id.
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+PRICE_PAID_COLUMNS = (
+    "transaction_id",
+    "price",
+    "transfer_date",
+    "postcode",
+    "property_type",
+    "old_new",
+    "duration",
+    "paon",
+    "saon",
+    "street",
+    "locality",
+    "town_city",
+    "district",
+    "county",
+    "ppd_category",
+    "record_status",
+)
+MODEL_FIELDS = ("property_type", "old_new", "duration", "county", "postcode")
+
+Record = Dict[str, Any]
+
+
+def to_record(fields: Dict[str, Any]) -> Record:
+    """
+    Convert a parsed row to a prediction record.
+
+    Args:
+        fields: Row values keyed by column name; the sale year comes from
+            "year" or the first four characters of "transfer_date"
+
+    Returns:
+        Dictionary with the model fields and year present in the row (a
+        missing field makes the prediction fail for that row) and, if
+        present, id
+    """
+    fields = {name: value for name, value in fields.items() if value not in (None, "")}
+    record = {name: fields[name] for name in MODEL_FIELDS if name in fields}
+
+    if "year" in fields:
+        record["year"] = fields["year"]
+    elif "transfer_date" in fields:
+        record["year"] = str(fields["transfer_date"])[:4]
+
+    transaction_id = fields.get("transaction_id", fields.get("id"))
+    if transaction_id is not None:
+        record["id"] = str(transaction_id).strip("{}")
+    return record
+
+
+class CsvRecordParser:
+    """Parses CSV lines, detecting the column layout from the first row."""
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        """
+        Initialize parser.
+
+        Args:
+            columns: Column names; detected from the first row when None
+                (a header row, or the headerless Price Paid layout with or
+                without the transaction id)
+        """
+        self.columns = list(columns) if columns is not None else None
+
+    def parse(self, lines: Iterable[str]) -> Iterator[Record]:
+        """
+        Parse lines into records (state carries over between calls).
+
+        Args:
+            lines: CSV lines, without or with line terminators
+        """
+        for fields in csv.reader(lines):
+            if not fields:
+                continue
+            if self.columns is None:
+                if "property_type" in fields:
+                    self.columns = fields
+                    continue
+                self.columns = list(
+                    PRICE_PAID_COLUMNS
+                    if len(fields) == len(PRICE_PAID_COLUMNS)
+                    else PRICE_PAID_COLUMNS[1:]
+                )
+            yield to_record(dict(zip(self.columns, fields)))
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Union[Record, ValueError]]:
+    """
+    Parse NDJSON lines into records.
+
+    Args:
+        lines: One JSON object per line; blank lines are skipped
+
+    Yields:
+        A record per line, or a ValueError for lines that are not JSON
+        objects (so the caller can report the row and continue)
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(fields, dict):
+            yield ValueError("Invalid JSON: expected an object")
+            continue
+        yield to_record(fields)
@@ -0,0 +1,1263 @@
+"""
+Sales Forecaster - Random Forest property price model.
+
+Loads the trained artifacts exported by notebooks/04_pipeline and
+performs price predictions with confidence intervals.
+"""
+
+import copy
+import logging
+import mmap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .conformal_intervals import ConformalIntervals
+from .flat_forest import ARRAYS as FLAT_FOREST_ARRAYS
+from .flat_forest import FlatForest
+from .postcode_encoder import PostcodeEncoder, outward_code
+from .prediction_cache import PredictionCache
+from .prediction_table import PredictionTable
+
+logger = logging.getLogger(__name__)
+
+LABEL_ENCODED_FIELDS = ("property_type", "old_new", "duration")
+DEFAULT_INTERVAL_PERCENTILES = (10.0, 90.0)
+ENGINES = ("sklearn", "native")
+INTERVAL_MODES = ("trees", "conformal")
+PARITY_ROWS = 256
+PARITY_TOLERANCE = 1e-9
+COMPACT_PARITY_ROWS = 10000
+# Tree budgets profiled on load, as fractions of the forest
+TREE_BUDGET_FRACTIONS = (0.1, 0.25, 0.5, 1.0)
+BUDGET_PROFILE_ROWS = 1000
+BUDGET_PROFILE_REPEATS = 5
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    """Whether an array (or the array it views) is backed by a file mapping."""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class SalesForecaster:
+    """UK property price forecaster backed by a Random Forest model."""
+
+    MODEL_FILE = "final_model.joblib"
+    LABEL_ENCODERS_FILE = "final_label_encoders.joblib"
+    TARGET_ENCODINGS_FILE = "final_target_encodings.joblib"
+    METADATA_FILE = "final_metadata.joblib"
+    FLAT_FOREST_DIR = "final_flat_forest"
+    COMPACT_FOREST_FILE = "final_forest.bin"
+
+    def __init__(
+        self,
+        models_dir: str = "models",
+        interval_percentiles: Tuple[float, float] = DEFAULT_INTERVAL_PERCENTILES,
+        engine: str = "sklearn",
+        cache_size: int = 0,
+        use_prediction_table: bool = False,
+        mmap_forest: bool = False,
+        compact_forest: bool = False,
+        stage_observer: Optional[Callable[[str, float], None]] = None,
+        interval_mode: str = "trees",
+    ):
+        """
+        Initialize forecaster.
+
+        Args:
+            models_dir: Directory containing the trained model artifacts
+            interval_percentiles: Lower and upper percentiles of the per-tree
+                predictions used as confidence interval
+            engine: Forest evaluation engine, "sklearn" or "native"
+                (FlatForest, parity-checked against sklearn on load)
+            cache_size: Maximum entries of the predict() LRU cache
+                (0 disables caching)
+            use_prediction_table: Answer predict() from the precomputed
+                table in models_dir when available, falling back to the
+                forest for combinations it does not cover
+            mmap_forest: Serve the native engine from memory-mapped node
+                arrays in models_dir, shared by all worker processes
+                (requires engine="native")
+            compact_forest: Serve the native engine from the compact forest
+                file in models_dir when it matches the metadata, without
+                deserializing the sklearn model (requires engine="native")
+            stage_observer: Optional callable receiving (stage, seconds) for
+                the validation, encoding, forest and interval stages of
+                every prediction call
+            interval_mode: "trees" for percentiles of the per-tree
+                predictions, or "conformal" for the calibrated residual
+                quantiles per segment in models_dir (constant time per row;
+                per-tree intervals are used if the file is missing or stale)
+
+        Raises:
+            ValueError: If percentiles are not 0 <= lower < upper <= 100,
+                the engine or interval mode is unknown or
+                mmap_forest/compact_forest is used without the native engine
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+        if interval_mode not in INTERVAL_MODES:
+            raise ValueError(
+                f"Unknown interval mode '{interval_mode}', "
+                f"expected one of {INTERVAL_MODES}"
+            )
+        if mmap_forest and engine != "native":
+            raise ValueError("mmap_forest requires the native engine")
+        if compact_forest and engine != "native":
+            raise ValueError("compact_forest requires the native engine")
+
+        lower, upper = interval_percentiles
+        if not 0 <= lower < upper <= 100:
+            raise ValueError(
+                f"Invalid interval percentiles {interval_percentiles}: "
+                "expected 0 <= lower < upper <= 100"
+            )
+
+        self.models_dir = Path(models_dir)
+        self.interval_percentiles = (float(lower), float(upper))
+        self.engine = engine
+        self.model = None
+        self.label_encoders: Optional[Dict[str, Any]] = None
+        self.target_encodings: Optional[Dict[str, Dict[str, float]]] = None
+        self.metadata: Optional[Dict[str, Any]] = None
+        self.is_loaded = False
+        # Artifact file stamps seen when loading (see artifacts_stamp)
+        self.loaded_stamp: Optional[Tuple[Any, ...]] = None
+        # Seconds per artifact file and load step of the last load()
+        self.load_timings: Dict[str, float] = {}
+        # Error versus the full forest and latency per tree budget
+        self.tree_budgets: List[Dict[str, float]] = []
+
+        # Node values of every tree, concatenated, and each tree's offset
+        self._node_values: Optional[np.ndarray] = None
+        self._node_offsets: Optional[np.ndarray] = None
+        self._flat_forest: Optional[FlatForest] = None
+        self.mmap_forest = mmap_forest
+
+        # Encoders compiled into lookup tables (see _compile_encoders)
+        self._label_codes: Optional[Dict[str, Dict[str, int]]] = None
+        self._target_tables: Dict[str, Tuple[Dict[str, float], float]] = {}
+        self._postcode_encoder: Optional[PostcodeEncoder] = None
+        self._feature_columns: Dict[str, int] = {}
+        self.compact_forest = compact_forest
+
+        # Cache keys include the model version so entries computed by a
+        # previous model are never served after a reload
+        self.cache = PredictionCache(cache_size) if cache_size > 0 else None
+        self._model_version = 0
+        # Response fields fixed for a loaded model, per tree budget
+        self._static_responses: Dict[Optional[int], Dict[str, Any]] = {}
+
+        self.use_prediction_table = use_prediction_table
+        self.prediction_table: Optional[PredictionTable] = None
+        self.stage_observer = stage_observer
+
+        self.interval_mode = interval_mode
+        self.conformal_intervals: Optional[ConformalIntervals] = None
+
+    def load(self) -> None:
+        """
+        Load model artifacts from disk.
+
+        The artifact files are deserialized concurrently. With
+        compact_forest or mmap_forest, an up-to-date compact forest file or
+        shared forest in models_dir is memory-mapped (in that order) and
+        the sklearn model is not deserialized at all. Otherwise the sklearn
+        model is loaded and, with mmap_forest, its flattened arrays are
+        written for the other workers to map. Seconds spent per artifact
+        and step are kept in load_timings.
+
+        Raises:
+            FileNotFoundError: If any artifact is missing
+            RuntimeError: If the native engine disagrees with sklearn
+        """
+        paths = self._artifact_paths()
+
+        for path in paths.values():
+            if not path.exists():
+                raise FileNotFoundError(f"Model artifact not found: {path}")
+
+        # Taken before reading, so files replaced mid-load look changed
+        self.loaded_stamp = self.artifacts_stamp()
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def load_artifact(name: str) -> Any:
+            started = time.perf_counter()
+            value = joblib.load(paths[name])
+            timings[paths[name].name] = time.perf_counter() - started
+            return value
+
+        with ThreadPoolExecutor(
+            max_workers=len(paths), thread_name_prefix="artifact-load"
+        ) as pool:
+            futures = {
+                name: pool.submit(load_artifact, name)
+                for name in paths
+                # A current compact or shared forest makes the model unnecessary
+                if not (
+                    name == "model" and (self.compact_forest or self.mmap_forest)
+                )
+            }
+            self.label_encoders = futures["label_encoders"].result()
+            self.target_encodings = futures["target_encodings"].result()
+            self.metadata = futures["metadata"].result()
+            self._compile_encoders()
+
+            self._flat_forest = None
+            self._node_values = self._node_offsets = None
+            step = time.perf_counter()
+            if self.compact_forest and self._load_compact_forest():
+                timings["compact_forest"] = time.perf_counter() - step
+            elif self.mmap_forest and self._load_shared_forest():
+                timings["shared_forest"] = time.perf_counter() - step
+            else:
+                model = futures.get("model") or pool.submit(load_artifact, "model")
+                self.model = model.result()
+                step = time.perf_counter()
+                self._build_node_index()
+                if self.engine == "native":
+                    self._build_flat_forest()
+                if self.mmap_forest:
+                    self._share_flat_forest()
+                timings["forest_setup"] = time.perf_counter() - step
+
+        self._model_version += 1
+        self._static_responses = {}
+        if self.cache is not None:
+            self.cache.clear()
+        step = time.perf_counter()
+        self.tree_budgets = self._profile_tree_budgets()
+        timings["tree_budgets"] = time.perf_counter() - step
+        if self.interval_mode == "conformal":
+            step = time.perf_counter()
+            self.conformal_intervals = self._load_conformal_intervals()
+            timings["conformal_intervals"] = time.perf_counter() - step
+        step = time.perf_counter()
+        self.prediction_table = (
+            self._load_prediction_table() if self.use_prediction_table else None
+        )
+        if self.use_prediction_table:
+            timings["prediction_table"] = time.perf_counter() - step
+        timings["total"] = time.perf_counter() - start
+        self.load_timings = {name: round(t, 4) for name, t in timings.items()}
+        self.is_loaded = True
+
+        logger.info(
+            f"Artifacts loaded from {self.models_dir} in {timings['total']:.2f}s: "
+            + ", ".join(f"{name} {t:.3f}s" for name, t in self.load_timings.items())
+        )
+
+    def _artifact_paths(self) -> Dict[str, Path]:
+        """Paths of the artifacts read by load(), keyed by name."""
+        return {
+            name: self.models_dir / filename
+            for name, filename in (
+                ("model", self.MODEL_FILE),
+                ("label_encoders", self.LABEL_ENCODERS_FILE),
+                ("target_encodings", self.TARGET_ENCODINGS_FILE),
+                ("metadata", self.METADATA_FILE),
+            )
+        }
+
+    def artifacts_stamp(self) -> Tuple[Any, ...]:
+        """
+        Get the modification time and size of each artifact file.
+
+        Returns:
+            Tuple with one (mtime_ns, size) per artifact, None for missing
+            files; differs from loaded_stamp once new artifacts are deployed
+        """
+        stamps = []
+        for path in self._artifact_paths().values():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def _build_node_index(self) -> None:
+        """
+        Concatenate the node values of all trees into one array.
+
+        With it, the whole (n_trees x n_rows) prediction matrix is a single
+        fancy-indexing operation over the leaf ids returned by model.apply.
+        """
+        values = [tree.tree_.value[:, 0, 0] for tree in self.model.estimators_]
+        sizes = np.array([len(v) for v in values], dtype=np.intp)
+
+        self._node_values = np.concatenate(values)
+        self._node_offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    def _load_shared_forest(self) -> bool:
+        """
+        Memory-map the shared flattened forest if it matches the model.
+
+        Returns:
+            True if the shared forest is now serving predictions
+        """
+        directory = self.models_dir / self.FLAT_FOREST_DIR
+        try:
+            flat_forest, index = FlatForest.load(directory, mmap_mode="r")
+        except FileNotFoundError:
+            return False
+
+        if index.get("trained_date") != self.metadata.get("trained_date"):
+            logger.warning(f"Shared forest in {directory} is stale, rebuilding")
+            return False
+
+        self.model = None
+        self._flat_forest = flat_forest
+        logger.info(f"Shared forest memory-mapped from {directory}")
+        return True
+
+    def _load_compact_forest(self) -> bool:
+        """
+        Memory-map the compact forest file if it matches the model.
+
+        Returns:
+            True if the compact forest is now serving predictions
+        """
+        path = self.models_dir / self.COMPACT_FOREST_FILE
+        try:
+            flat_forest, features, index = FlatForest.load_compact(path)
+        except FileNotFoundError:
+            logger.warning(f"Compact forest not found: {path}")
+            return False
+        except ValueError as e:
+            logger.warning(f"Ignoring compact forest: {e}")
+            return False
+
+        if features != list(self.metadata["features"]) or index.get(
+            "trained_date"
+        ) != self.metadata.get("trained_date"):
+            logger.warning(f"Compact forest {path} is stale, loading the model")
+            return False
+
+        self.model = None
+        self._flat_forest = flat_forest
+        logger.info(
+            f"Compact forest memory-mapped from {path}: "
+            f"{flat_forest.n_trees} trees, {flat_forest.n_nodes} nodes"
+        )
+        return True
+
+    def export_compact_forest(self, path: Path) -> Dict[str, Any]:
+        """
+        Write the sklearn model as a compact forest and check its parity.
+
+        The file is read back and compared with the sklearn model on random
+        rows covering the encoders' value domains.
+
+        Args:
+            path: Target file (normally COMPACT_FOREST_FILE in a models dir)
+
+        Returns:
+            Parity report: rows compared, share of (tree, row) pairs reaching
+            the same leaf, largest log-price error, largest relative price
+            and interval errors, file sizes (MB) and load times (s)
+
+        Raises:
+            RuntimeError: If the sklearn model is not loaded
+        """
+        self._check_loaded()
+        if self.model is None:
+            raise RuntimeError("Exporting requires the sklearn model")
+
+        path = Path(path)
+        FlatForest.from_sklearn(self.model).save_compact(
+            path,
+            list(self.metadata["features"]),
+            {"trained_date": self.metadata.get("trained_date")},
+        )
+        start = time.perf_counter()
+        compact, _, _ = FlatForest.load_compact(path)
+        load_seconds = time.perf_counter() - start
+
+        X = self._probe_rows(COMPACT_PARITY_ROWS)
+        leaves = (self.model.apply(self._frame(X)) + self._node_offsets).T
+        mean = self.model.predict(self._frame(X))
+        interval = self._interval(self._node_values[leaves])
+        compact_mean, compact_tree_predictions = compact.predict(X)
+        compact_interval = self._interval(compact_tree_predictions)
+
+        def max_relative(actual: np.ndarray, expected: np.ndarray) -> float:
+            return float(np.max(np.abs(actual / expected - 1)))
+
+        model_path = self.models_dir / self.MODEL_FILE
+        return {
+            "rows": COMPACT_PARITY_ROWS,
+            "leaf_agreement": float(np.mean(compact.apply(X) == leaves)),
+            "max_log_error": float(np.max(np.abs(compact_mean - mean))),
+            "max_price_relative_error": max_relative(
+                np.exp(compact_mean), np.exp(mean)
+            ),
+            "max_interval_relative_error": max_relative(compact_interval, interval),
+            "model_mb": round(model_path.stat().st_size / 2**20, 2),
+            "compact_mb": round(path.stat().st_size / 2**20, 2),
+            "model_load_seconds": self.load_timings.get(self.MODEL_FILE),
+            "compact_load_seconds": round(load_seconds, 4),
+        }
+
+    def _share_flat_forest(self) -> None:
+        """
+        Write the parity-checked forest for other workers and map it.
+
+        The sklearn model is released afterwards so this worker serves from
+        the same shared pages as the others.
+        """
+        directory = self.models_dir / self.FLAT_FOREST_DIR
+        try:
+            self._flat_forest.save(
+                directory, {"trained_date": self.metadata.get("trained_date")}
+            )
+        except OSError as e:
+            logger.warning(f"Could not write shared forest to {directory}: {e}")
+            return
+
+        self._load_shared_forest()
+
+    def _load_prediction_table(self) -> Optional[PredictionTable]:
+        """
+        Load the precomputed prediction table if it matches the model.
+
+        Returns:
+            Memory-mapped table, or None if missing or stale
+        """
+        table_path = self.models_dir / PredictionTable.TABLE_FILE
+        if not table_path.exists():
+            logger.warning(f"Prediction table not found: {table_path}")
+            return None
+
+        table = PredictionTable.load(self.models_dir)
+        if not table.matches(self):
+            logger.warning(
+                "Prediction table was built for another model or interval, ignoring"
+            )
+            return None
+
+        logger.info(f"Prediction table loaded: {table.n_entries} entries")
+        return table
+
+    def _load_conformal_intervals(self) -> Optional[ConformalIntervals]:
+        """
+        Load the conformal intervals if they match the model.
+
+        Returns:
+            Intervals, or None if missing or stale (per-tree intervals
+            are served instead)
+        """
+        path = self.models_dir / ConformalIntervals.INTERVALS_FILE
+        if not path.exists():
+            logger.warning(f"Conformal intervals not found: {path}")
+            return None
+
+        intervals = ConformalIntervals.load(self.models_dir)
+        if not intervals.matches(self):
+            logger.warning(
+                "Conformal intervals were calibrated for another model, ignoring"
+            )
+            return None
+
+        logger.info(
+            f"Conformal intervals loaded: {intervals.coverage:.0%} coverage, "
+            f"{intervals.stats()['segments']} segments"
+        )
+        return intervals
+
+    @property
+    def active_interval_mode(self) -> str:
+        """Interval mode in effect ("trees" when conformal is unavailable)."""
+        return "conformal" if self.conformal_intervals is not None else "trees"
+
+    def _build_flat_forest(self) -> None:
+        """
+        Flatten the forest and verify it reproduces sklearn predictions.
+
+        Raises:
+            RuntimeError: If any probe row differs from sklearn
+        """
+        flat_forest = FlatForest.from_sklearn(self.model)
+
+        X = self._probe_rows(PARITY_ROWS)
+        mean, tree_predictions = flat_forest.predict(X)
+        frame = self._frame(X)
+        expected = self._node_values[(self.model.apply(frame) + self._node_offsets).T]
+        error = max(
+            float(np.max(np.abs(tree_predictions - expected))),
+            float(np.max(np.abs(mean - self.model.predict(frame)))),
+        )
+        if error > PARITY_TOLERANCE:
+            raise RuntimeError(
+                f"Native engine parity check failed (max abs error {error:.3g})"
+            )
+
+        self._flat_forest = flat_forest
+        logger.info(
+            f"Native engine ready: {flat_forest.n_trees} trees, "
+            f"{flat_forest.n_nodes} nodes, parity error {error:.3g}"
+        )
+
+    def _probe_rows(self, n_rows: int, seed: int = 0) -> np.ndarray:
+        """
+        Build random feature rows covering the encoders' value domains.
+
+        Args:
+            n_rows: Number of rows
+            seed: Random seed
+        """
+        rng = np.random.default_rng(seed)
+        columns = {
+            field + "_enc": rng.integers(
+                0, len(self.label_encoders[field].classes_), n_rows
+            )
+            for field in LABEL_ENCODED_FIELDS
+        }
+        for name, map_name in (
+            ("county_enc", "county_map"),
+            ("postcode_region_enc", "postcode_map"),
+        ):
+            values = np.fromiter(self.target_encodings[map_name].values(), float)
+            columns[name] = rng.choice(values, n_rows)
+        columns["year"] = rng.integers(1995, 2031, n_rows)
+        return self._feature_matrix(columns)
+
+    def _profile_tree_budgets(self) -> List[Dict[str, float]]:
+        """
+        Measure accuracy and latency of each supported tree budget.
+
+        Errors are relative to the full forest's price and interval over
+        random rows covering the encoders' value domains. Latency is the
+        median single-row evaluation and the per-row time of one batch.
+
+        Returns:
+            One entry per budget (10%, 25%, 50% and all trees)
+        """
+        X = self._probe_rows(BUDGET_PROFILE_ROWS, seed=1)
+        full_log, full_tree_predictions = self._forest_predict(X)
+        full_price = np.exp(full_log)
+        full_interval = self._interval(full_tree_predictions)
+        single_row = X[:1]
+        n_estimators = self.n_estimators
+
+        profile = []
+        for n_trees in sorted(
+            {max(1, round(f * n_estimators)) for f in TREE_BUDGET_FRACTIONS}
+        ):
+            budget = self._tree_budget(n_trees)
+            start = time.perf_counter()
+            predictions_log, tree_predictions = self._forest_predict(X, budget)
+            interval = self._interval(tree_predictions)
+            batch_seconds = time.perf_counter() - start
+
+            row_seconds = []
+            for _ in range(BUDGET_PROFILE_REPEATS):
+                start = time.perf_counter()
+                self._interval(self._forest_predict(single_row, budget)[1])
+                row_seconds.append(time.perf_counter() - start)
+
+            price_error = np.abs(np.exp(predictions_log) / full_price - 1)
+            profile.append(
+                {
+                    "n_trees": n_trees,
+                    "price_error_mean": round(float(price_error.mean()), 6),
+                    "price_error_p95": round(
+                        float(np.percentile(price_error, 95)), 6
+                    ),
+                    "interval_error_mean": round(
+                        float(np.mean(np.abs(interval / full_interval - 1))), 6
+                    ),
+                    "row_latency_ms": round(float(np.median(row_seconds)) * 1e3, 4),
+                    "batch_row_us": round(batch_seconds / len(X) * 1e6, 3),
+                }
+            )
+        return profile
+
+    def _tree_budget(self, n_trees: Optional[int]) -> Optional[int]:
+        """
+        Resolve a requested tree budget.
+
+        Args:
+            n_trees: Leading trees to evaluate, or None for all
+
+        Returns:
+            Number of leading trees to evaluate, or None for the full forest
+            (also when the budget covers every tree)
+
+        Raises:
+            ValueError: If n_trees is below 1
+        """
+        if n_trees is None:
+            return None
+        if n_trees < 1:
+            raise ValueError(f"n_trees must be at least 1, got {n_trees}")
+        return int(n_trees) if n_trees < self.n_estimators else None
+
+    @property
+    def n_estimators(self) -> int:
+        """Number of trees of the loaded forest."""
+        if self.model is not None:
+            return int(self.model.n_estimators)
+        return self._flat_forest.n_trees
+
+    def memory_bytes(self, mapped: bool = False) -> int:
+        """
+        Estimate the memory held by the loaded model.
+
+        Counts the forest arrays (sklearn trees, node index and native
+        forest) and the prediction table. Memory-mapped arrays live in the
+        page cache, shared by every process mapping them, and are only
+        counted with mapped; encoders and cache entries are small next to
+        the forest.
+
+        Args:
+            mapped: Also count memory-mapped arrays (their mapped size), for
+                budgets that must hold however the forest is served
+
+        Returns:
+            Bytes of the model's arrays (0 if not loaded)
+        """
+        if not self.is_loaded:
+            return 0
+        arrays = [self._node_values, self._node_offsets]
+        if self.model is not None:
+            for tree in self.model.estimators_:
+                state = tree.tree_.__getstate__()
+                arrays += [state.get("nodes"), state.get("values")]
+        if self._flat_forest is not None:
+            arrays += [getattr(self._flat_forest, name) for name in FLAT_FOREST_ARRAYS]
+            arrays.append(self._flat_forest.is_leaf)
+        if self.prediction_table is not None:
+            arrays.append(self.prediction_table.values)
+        return sum(
+            array.nbytes
+            for array in arrays
+            if isinstance(array, np.ndarray) and (mapped or not _is_mapped(array))
+        )
+
+    def _check_loaded(self) -> None:
+        """Raise if artifacts have not been loaded."""
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+    @staticmethod
+    def _normalize(property_data: Dict[str, Any]) -> Tuple[str, ...]:
+        """
+        Extract and normalize the raw fields used by the model.
+
+        Returns:
+            Tuple (property_type, old_new, duration, county, postcode_region, year)
+        """
+        postcode = str(property_data["postcode"]).upper().strip()
+        if not postcode:
+            raise ValueError("Postcode is empty")
+
+        return (
+            str(property_data["property_type"]),
+            str(property_data["old_new"]),
+            str(property_data["duration"]),
+            str(property_data["county"]).upper().strip(),
+            outward_code(postcode),
+            int(property_data["year"]),
+        )
+
+    def _compile_encoders(self) -> None:
+        """
+        Compile the encoders into plain lookup tables.
+
+        For a single row, LabelEncoder.transform and building a pandas
+        DataFrame cost far more than the forest itself; dict lookups
+        written into a preallocated array (see _encode) do not.
+        """
+        self._label_codes = {
+            field: {
+                str(label): code
+                for code, label in enumerate(self.label_encoders[field].classes_)
+            }
+            for field in LABEL_ENCODED_FIELDS
+        }
+        self._target_tables = {}
+        for map_name in ("county_map", "postcode_map"):
+            mapping = self.target_encodings[map_name]
+            if "UNKNOWN" in mapping:
+                default = mapping["UNKNOWN"]
+            else:
+                default = float(np.mean(list(mapping.values())))
+            self._target_tables[map_name] = (dict(mapping), default)
+        self._postcode_encoder = PostcodeEncoder.from_target_map(
+            self.target_encodings["postcode_map"]
+        )
+        self._feature_columns = {
+            name: position for position, name in enumerate(self.metadata["features"])
+        }
+
+    def _target_encode(self, map_name: str, key: str) -> float:
+        """
+        Target-encode a value, falling back to UNKNOWN or the map mean.
+
+        Args:
+            map_name: Key in target_encodings (county_map or postcode_map)
+            key: Value to encode
+        """
+        if self._label_codes is None:
+            self._compile_encoders()
+        mapping, default = self._target_tables[map_name]
+        return mapping.get(key, default)
+
+    def _postcode_encode(
+        self, outward_codes: List[str], county_encodings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Target-encode outward codes at the most specific known level.
+
+        Unseen codes fall back to their district (SW1A -> SW1), then area
+        (SW), then the county encoding (see PostcodeEncoder).
+
+        Args:
+            outward_codes: Outward codes (the postcode_region of a row)
+            county_encodings: Target encoding of each row's county
+        """
+        if self._label_codes is None:
+            self._compile_encoders()
+        return self._postcode_encoder.encode(outward_codes, county_encodings)
+
+    def _encode(self, rows: List[Tuple[Any, ...]]) -> Tuple[np.ndarray, List[Any]]:
+        """
+        Encode normalized rows straight into a preallocated feature matrix.
+
+        Args:
+            rows: Normalized rows as returned by _normalize
+
+        Returns:
+            Tuple (float32 matrix of shape (n_rows, n_features) in
+            metadata["features"] order, list aligned with rows holding an
+            error message for rows with labels unknown to the encoders,
+            else None)
+        """
+        if self._label_codes is None:
+            self._compile_encoders()
+        columns = self._feature_columns
+        X = np.empty((len(rows), len(columns)), dtype=np.float32)
+        errors: List[Optional[str]] = [None] * len(rows)
+
+        for position, field in enumerate(LABEL_ENCODED_FIELDS):
+            codes = self._label_codes[field]
+            values = [codes.get(row[position], -1) for row in rows]
+            if -1 in values:
+                for i, code in enumerate(values):
+                    if code < 0 and errors[i] is None:
+                        errors[i] = f"unknown {field} '{rows[i][position]}'"
+            X[:, columns[field + "_enc"]] = values
+
+        mapping, default = self._target_tables["county_map"]
+        county = np.array([mapping.get(row[3], default) for row in rows])
+        X[:, columns["county_enc"]] = county
+        X[:, columns["postcode_region_enc"]] = self._postcode_encoder.encode(
+            [row[4] for row in rows], county
+        )
+        X[:, columns["year"]] = [row[5] for row in rows]
+        return X, errors
+
+    def _feature_matrix(self, columns: Dict[str, Any]) -> np.ndarray:
+        """Stack encoded columns in the feature order used during training."""
+        return np.column_stack(
+            [
+                np.asarray(columns[name], dtype=np.float32)
+                for name in self.metadata["features"]
+            ]
+        )
+
+    def _frame(self, X: np.ndarray) -> pd.DataFrame:
+        """Wrap a feature matrix with the feature names sklearn was fitted on."""
+        return pd.DataFrame(X, columns=self.metadata["features"], copy=False)
+
+    def _model_summary(self, n_trees: Optional[int] = None) -> Dict[str, Any]:
+        """Short model description included in prediction responses."""
+        return {
+            "type": "RandomForest",
+            "n_estimators": self.n_estimators,
+            "expected_r2": float(self.metadata.get("expected_r2", 0.0)),
+            "n_trees": n_trees,
+        }
+
+    def _static_response(self, n_trees: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Response fields that only change with the loaded model.
+
+        Built once per model and tree budget and shared by every response,
+        so callers must not mutate them. Like the rest of the responses,
+        they follow the response schemas field for field (n_trees included
+        when None), which lets the routes serialize them unvalidated.
+        """
+        static = self._static_responses.get(n_trees)
+        if static is None:
+            static = {
+                "features_used": list(self.metadata["features"]),
+                "model_info": self._model_summary(n_trees),
+            }
+            self._static_responses[n_trees] = static
+        return static
+
+    def _forest_predict(
+        self, X: np.ndarray, n_trees: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the forest, or its first n_trees trees, on a feature matrix.
+
+        Args:
+            X: Encoded features, one row per property (feature order)
+            n_trees: Tree budget resolved by _tree_budget (None for all)
+
+        Returns:
+            Tuple (mean log-price per row, per-tree log-price matrix of
+            shape (n_trees, n_rows))
+        """
+        if self._flat_forest is not None:
+            return self._flat_forest.predict(X, n_trees)
+
+        if self._node_values is not None:
+            model = self.model
+            if n_trees is not None:
+                # Same forest object limited to its first n_trees estimators
+                model = copy.copy(self.model)
+                model.estimators_ = self.model.estimators_[:n_trees]
+            leaves = model.apply(self._frame(X))
+            tree_predictions = self._node_values[
+                (leaves + self._node_offsets[:n_trees]).T
+            ]
+            # Forest prediction is the mean of its trees
+            return tree_predictions.mean(axis=0), tree_predictions
+
+        # Models assigned without load() have no node index; trees are
+        # fitted without feature names, so they take the array
+        tree_predictions = np.stack(
+            [tree.predict(X) for tree in self.model.estimators_[:n_trees]]
+        )
+        if n_trees is not None:
+            return tree_predictions.mean(axis=0), tree_predictions
+        return np.asarray(self.model.predict(self._frame(X))), tree_predictions
+
+    def _stage_done(self, stage: str, started: float) -> float:
+        """Report the time since started to the stage observer; returns now."""
+        now = time.perf_counter()
+        if self.stage_observer is not None:
+            self.stage_observer(stage, now - started)
+        return now
+
+    def _segments(
+        self, rows: List[Tuple[Any, ...]]
+    ) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Conformal segment keys of normalized rows.
+
+        Returns:
+            Tuple (property types, outward codes), or None when intervals
+            come from the trees
+        """
+        if self.conformal_intervals is None:
+            return None
+        return [row[0] for row in rows], [row[4] for row in rows]
+
+    def _predict_matrix(
+        self,
+        X: np.ndarray,
+        n_trees: Optional[int] = None,
+        segments: Optional[Tuple[Sequence[str], Sequence[str]]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the forest and interval on a feature matrix.
+
+        Args:
+            X: Encoded features, one row per property (feature order)
+            n_trees: Tree budget resolved by _tree_budget (None for all)
+            segments: (property types, outward codes) of the rows; with
+                conformal intervals loaded, the interval is looked up by
+                segment instead of taken from the per-tree predictions
+
+        Returns:
+            Tuple of arrays (predicted price, interval lower, interval upper)
+        """
+        started = time.perf_counter()
+        predictions_log, tree_predictions = self._forest_predict(X, n_trees)
+        started = self._stage_done("forest", started)
+        if self.conformal_intervals is not None and segments is not None:
+            lower, upper = np.exp(
+                predictions_log + self.conformal_intervals.offsets(*segments)
+            )
+        else:
+            lower, upper = self._interval(tree_predictions)
+        self._stage_done("interval", started)
+        # Model was trained on log(price)
+        return np.exp(predictions_log), lower, upper
+
+    def _interval(self, tree_predictions: np.ndarray) -> np.ndarray:
+        """
+        Compute the confidence interval from per-tree log-price predictions.
+
+        Args:
+            tree_predictions: Matrix of shape (n_trees, n_rows)
+
+        Returns:
+            Array of shape (2, n_rows) with lower and upper prices
+        """
+        return np.percentile(
+            np.exp(tree_predictions), self.interval_percentiles, axis=0
+        )
+
+    def predict(
+        self, property_data: Dict[str, Any], n_trees: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Predict the price of a single property.
+
+        Args:
+            property_data: Dictionary with property_type, old_new, duration,
+                county, postcode and year
+            n_trees: Evaluate only the first n_trees trees, price and
+                interval included (faster, less accurate; see tree_budgets).
+                None or the forest size uses every tree.
+
+        Returns:
+            Dictionary with predicted price, confidence interval,
+            features used and model information
+
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If a categorical value is unknown to the encoders,
+                or n_trees is below 1
+        """
+        self._check_loaded()
+
+        n_trees = self._tree_budget(n_trees)
+        started = time.perf_counter()
+        row = self._normalize(property_data)
+        self._stage_done("validation", started)
+        prediction = self._stored_prediction(row, n_trees)
+        if prediction is None:
+            prediction = self._predict_row(row, n_trees)
+            self._cache_prediction(row, prediction, n_trees)
+        return self._prediction_response(*prediction, n_trees=n_trees)
+
+    def predict_many(
+        self, records: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Answer several independent predict() requests together.
+
+        Used by the micro-batcher: each record gets exactly what predict()
+        would return (prediction table and cache included), but the rows
+        missing from both are evaluated in a single forest pass.
+
+        Args:
+            records: List of property dictionaries (same shape as predict)
+
+        Returns:
+            List aligned with records holding the predict() response, or the
+            exception predict() would have raised for that record
+
+        Raises:
+            RuntimeError: If model is not loaded
+        """
+        self._check_loaded()
+
+        responses: List[Union[Dict[str, Any], Exception, None]] = [None] * len(
+            records
+        )
+        pending: Dict[Tuple[Any, ...], List[int]] = {}
+
+        started = time.perf_counter()
+        rows: List[Optional[Tuple[Any, ...]]] = []
+        for i, record in enumerate(records):
+            try:
+                rows.append(self._normalize(record))
+            except (KeyError, TypeError, ValueError) as e:
+                rows.append(None)
+                responses[i] = e
+        self._stage_done("validation", started)
+
+        for i, row in enumerate(rows):
+            if row is None:
+                continue
+            prediction = self._stored_prediction(row)
+            if prediction is None:
+                # Identical concurrent requests share one forest row
+                pending.setdefault(row, []).append(i)
+            else:
+                responses[i] = self._prediction_response(*prediction)
+
+        unique_rows = list(pending)
+        for row, prediction in zip(
+            unique_rows, self._predict_normalized(unique_rows)
+        ):
+            if isinstance(prediction, str):
+                response: Union[Dict[str, Any], Exception] = ValueError(prediction)
+            else:
+                self._cache_prediction(row, prediction)
+                response = self._prediction_response(*prediction)
+            for i in pending[row]:
+                responses[i] = response
+
+        return responses
+
+    def _stored_prediction(
+        self, row: Tuple[Any, ...], n_trees: Optional[int] = None
+    ) -> Optional[Tuple[float, float, float]]:
+        """
+        Look a normalized row up in the prediction table, then the cache.
+
+        The table holds full-forest predictions only.
+
+        Returns:
+            Rounded (price, lower, upper), or None if the forest must run
+        """
+        if self.prediction_table is not None and n_trees is None:
+            prediction = self.prediction_table.lookup(row)
+            if prediction is not None:
+                return tuple(round(value, 2) for value in prediction)
+
+        if self.cache is None:
+            return None
+
+        # Cache hits skip encoding and forest evaluation entirely
+        return self.cache.get((self._model_version, n_trees, row))
+
+    def _cache_prediction(
+        self,
+        row: Tuple[Any, ...],
+        prediction: Tuple[float, float, float],
+        n_trees: Optional[int] = None,
+    ) -> None:
+        """Store a forest prediction in the cache (if enabled)."""
+        if self.cache is not None:
+            self.cache.put((self._model_version, n_trees, row), prediction)
+
+    def _predict_row(
+        self, row: Tuple[Any, ...], n_trees: Optional[int] = None
+    ) -> Tuple[float, float, float]:
+        """
+        Encode a normalized row and evaluate the forest.
+
+        Args:
+            row: Normalized fields as returned by _normalize
+            n_trees: Tree budget resolved by _tree_budget (None for all)
+
+        Returns:
+            Tuple (predicted price, interval lower, interval upper)
+
+        Raises:
+            ValueError: If a label is unknown to the encoders
+        """
+        started = time.perf_counter()
+        X, errors = self._encode([row])
+        self._stage_done("encoding", started)
+        if errors[0] is not None:
+            raise ValueError(errors[0])
+
+        price, lower, upper = self._predict_matrix(X, n_trees, self._segments([row]))
+        return (
+            round(float(price[0]), 2),
+            round(float(lower[0]), 2),
+            round(float(upper[0]), 2),
+        )
+
+    def _prediction_response(
+        self,
+        predicted_price: float,
+        lower: float,
+        upper: float,
+        n_trees: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build the predict() response for a predicted price and interval."""
+        return {
+            "predicted_price": predicted_price,
+            "confidence_interval": {"min": lower, "max": upper},
+            **self._static_response(n_trees),
+        }
+
+    def predict_batch(
+        self, records: List[Dict[str, Any]], n_trees: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Predict prices for many properties in one vectorized pass.
+
+        All valid rows are encoded together and the forest is evaluated
+        once over the whole matrix. Rows that cannot be encoded get an
+        error entry instead of failing the batch.
+
+        Args:
+            records: List of property dictionaries (same shape as predict)
+            n_trees: Evaluate only the first n_trees trees (see predict)
+
+        Returns:
+            Dictionary with per-row results (aligned with records), features
+            used and model information. Each result holds either
+            predicted_price and confidence_interval, or error.
+
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If n_trees is below 1
+        """
+        self._check_loaded()
+        n_trees = self._tree_budget(n_trees)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        rows: List[Tuple[str, ...]] = []
+        row_index: List[int] = []
+
+        started = time.perf_counter()
+        for i, record in enumerate(records):
+            try:
+                rows.append(self._normalize(record))
+                row_index.append(i)
+            except (KeyError, TypeError, ValueError) as e:
+                results[i] = {"error": f"Invalid data: {e}"}
+        self._stage_done("validation", started)
+
+        for i, prediction in zip(row_index, self._predict_normalized(rows, n_trees)):
+            if isinstance(prediction, str):
+                results[i] = {"error": f"Invalid data: {prediction}"}
+            else:
+                price, lower, upper = prediction
+                results[i] = {
+                    "predicted_price": price,
+                    "confidence_interval": {"min": lower, "max": upper},
+                }
+
+        return {"results": results, **self._static_response(n_trees)}
+
+    def _predict_normalized(
+        self, rows: List[Tuple[Any, ...]], n_trees: Optional[int] = None
+    ) -> List[Union[Tuple[float, float, float], str]]:
+        """
+        Encode normalized rows together and evaluate the forest once.
+
+        Args:
+            rows: Normalized rows as returned by _normalize
+            n_trees: Tree budget resolved by _tree_budget (None for all)
+
+        Returns:
+            List aligned with rows holding the rounded (price, lower, upper),
+            or an error message for rows with labels unknown to the encoders
+        """
+        results: List[Union[Tuple[float, float, float], str, None]] = [None] * len(
+            rows
+        )
+        if not rows:
+            return results
+
+        started = time.perf_counter()
+        X, errors = self._encode(rows)
+        self._stage_done("encoding", started)
+        valid = np.fromiter((error is None for error in errors), bool, len(rows))
+        if not valid.all():
+            results = errors
+            if not valid.any():
+                return results
+            X = X[valid]
+            rows = [row for row, ok in zip(rows, valid) if ok]
+        predictions, lower, upper = self._predict_matrix(
+            X, n_trees, self._segments(rows)
+        )
+
+        for j, i in enumerate(np.flatnonzero(valid)):
+            results[i] = (
+                round(float(predictions[j]), 2),
+                round(float(lower[j]), 2),
+                round(float(upper[j]), 2),
+            )
+        return results
+
+    def predict_encoded(
+        self,
+        columns: Dict[str, Any],
+        n_trees: Optional[int] = None,
+        segments: Optional[Tuple[Sequence[str], Sequence[str]]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Predict from already encoded feature columns.
+
+        Args:
+            columns: Encoded values keyed by feature name (metadata features)
+            n_trees: Evaluate only the first n_trees trees (see predict)
+            segments: (property types, outward codes) of the rows, needed
+                for conformal intervals (per-tree intervals without them)
+
+        Returns:
+            Tuple of arrays (predicted price, interval lower, interval upper),
+            unrounded, one entry per row
+
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If n_trees is below 1
+        """
+        self._check_loaded()
+
+        return self._predict_matrix(
+            self._feature_matrix(columns), self._tree_budget(n_trees), segments
+        )
+
+    def detached(self) -> "SalesForecaster":
+        """
+        Get a view of this forecaster without its cache and stage observer.
+
+        The view shares the loaded model, encoders, forest arrays and
+        prediction table values, so its predictions run the same code on
+        the same memory as requests do, but they neither use the prediction
+        cache, reach the observer nor count in the table's lookup stats.
+        The forecaster itself is left untouched (it may be serving).
+        """
+        view = copy.copy(self)
+        view.cache = view.stage_observer = None
+        if self.prediction_table is not None:
+            view.prediction_table = self.prediction_table.detached()
+        return view
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """
+        Get model metadata.
+
+        Returns:
+            Dictionary with model information
+        """
+        if not self.is_loaded:
+            return {"loaded": False}
+
+        return {
+            "loaded": True,
+            "model_type": self.metadata.get("model_type"),
+            "n_estimators": self.n_estimators,
+            "features": list(self.metadata["features"]),
+            "training_samples": self.metadata.get("training_samples"),
+            "cv_r2_mean": self.metadata.get("cv_r2_mean"),
+            "expected_r2": self.metadata.get("expected_r2"),
+            "trained_date": self.metadata.get("trained_date"),
+            "interval_percentiles": list(self.interval_percentiles),
+            "interval_mode": self.active_interval_mode,
+            "conformal_intervals": (
+                self.conformal_intervals.stats()
+                if self.conformal_intervals is not None
+                else None
+            ),
+            "engine": self.engine,
+            "shared_forest": self.model is None,
+            "memory_mb": round(self.memory_bytes() / 2**20, 2),
+            "load_timings": dict(self.load_timings),
+            "tree_budgets": [dict(budget) for budget in self.tree_budgets],
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "prediction_table": (
+                self.prediction_table.stats()
+                if self.prediction_table is not None
+                else None
+            ),
+        }
@@ -2,10 +2,12 @@
 Health check router (View layer).
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+from fastapi.responses import PlainTextResponse
 
 from ..controllers import HealthController
-from ..schemas import HealthResponse
+from ..core.metrics import CONTENT_TYPE
+from ..schemas import HealthResponse, ReadinessResponse
 
 router = APIRouter()
 
@@ -22,14 +24,58 @@ router = APIRouter()
     summary="Health Check",
     description="Check if service is running and model is loaded",
 )
-async def health_check() -> HealthResponse:
+async def health_check(response: Response) -> HealthResponse:
     """
-    Health check endpoint.
+    Health check endpoint (liveness).
 
-    Returns service status and model loading state.
-    Available at both / and /health.
+    Returns service status and model loading state; 503 only if the model
+    failed to load. Available at both / and /health.
     """
-    from ..core import forecaster
+    from ..core import forecaster, model_loader
 
-    health_data = HealthController.get_health_status(forecaster)
+    health_data = HealthController.get_health_status(forecaster, model_loader)
+    if health_data["status"] != "healthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return HealthResponse(**health_data)
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    summary="Readiness Check",
+    description="Succeeds (200) once the model is loaded and warmed, 503 before",
+)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    Readiness check endpoint.
+
+    Returns load status and per-artifact load times.
+    """
+    from ..core import model_loader
+
+    readiness = HealthController.get_readiness(model_loader)
+    if not readiness["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(**readiness)
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Metrics",
+    description=(
+        "Request counts and latency histograms per route, per-stage "
+        "prediction latencies and serving state of this worker process, "
+        "in the Prometheus text format"
+    ),
+)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus metrics endpoint.
+
+    Returns the metrics of the worker process handling the request.
+    """
+    from ..core import forecaster, inference_executor
+
+    text = HealthController.get_metrics(forecaster, inference_executor)
+    return PlainTextResponse(text, media_type=CONTENT_TYPE)
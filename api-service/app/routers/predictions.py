@@ -2,18 +2,46 @@
 Prediction router (View layer).
 """
 
-from fastapi import APIRouter
+from contextlib import nullcontext
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Request, Response
 
 from ..controllers import PredictionController
+from ..core.profiling import PROFILE_HEADER, start_profile
 from ..schemas import (
+    BatchPredictionRequest,
+    BatchPredictionResponse,
     ErrorResponse,
     ModelInfoResponse,
+    ModelReloadResponse,
     PredictionResponse,
     PropertyInput,
 )
+from ..schemas.batch_prediction import MAX_BATCH_SIZE
+from .responses import PredictionJSONResponse
+from .streaming import UploadStream, UploadStreamingResponse
 
 router = APIRouter()
 
+N_TREES_DESCRIPTION = (
+    "Evaluate only the first n_trees trees (price and interval) for lower "
+    "latency; see tree_budgets in /model/info for the measured error and "
+    "latency per budget. Omit for the full forest."
+)
+
+MODEL_VERSION_DESCRIPTION = (
+    "Answer with this model version (a subdirectory of MODEL_VERSIONS_DIR, "
+    "see versions in /model/info), loaded on first use. Omit for the "
+    "default model."
+)
+
+PROFILE_DESCRIPTION = (
+    "With REQUEST_PROFILING enabled, any value adds a Server-Timing header "
+    "with the time per stage; 'cprofile' also writes a cProfile dump of "
+    "this request to PROFILE_DIR (named in X-Profile-Dump)."
+)
+
 
 @router.get(
     "/model/info",
@@ -21,18 +49,67 @@ router = APIRouter()
     summary="Model Information",
     description="Get detailed information about the loaded model",
 )
-async def model_info() -> ModelInfoResponse:
+async def model_info(
+    response: Response,
+    x_profile: Optional[str] = Header(
+        None, alias=PROFILE_HEADER, description=PROFILE_DESCRIPTION
+    ),
+) -> ModelInfoResponse:
     """
     Model information endpoint.
 
     Returns metadata about the trained model.
     """
-    from ..core import forecaster
+    from ..core import forecaster, inference_executor, micro_batcher, model_registry
 
-    info = PredictionController.get_model_info(forecaster)
+    profile = start_profile("model-info", x_profile)
+    with profile.stage("model_info") if profile is not None else nullcontext():
+        info = PredictionController.get_model_info(
+            forecaster, inference_executor, micro_batcher, model_registry
+        )
+    if profile is not None:
+        profile.apply(response.headers)
     return ModelInfoResponse(**info)
 
 
+@router.post(
+    "/model/reload",
+    response_model=ModelReloadResponse,
+    summary="Reload Model",
+    description=(
+        "Load the artifacts currently in the models directory, validate them "
+        "with test predictions and swap them in without a restart. Only the "
+        "worker process handling the request reloads; with several workers "
+        "use MODEL_WATCH_INTERVAL instead. Disabled unless "
+        "ADMIN_RELOAD_ENABLED is set; with ADMIN_TOKEN set, the request must "
+        "send it in X-Admin-Token."
+    ),
+    responses={
+        401: {"model": ErrorResponse, "description": "Missing or invalid token"},
+        403: {"model": ErrorResponse, "description": "Reload disabled"},
+        409: {"model": ErrorResponse, "description": "Reload already running"},
+        500: {"model": ErrorResponse, "description": "New artifacts rejected"},
+    },
+)
+async def reload_model(
+    x_admin_token: Optional[str] = Header(
+        None, description="ADMIN_TOKEN, when one is configured"
+    ),
+) -> ModelReloadResponse:
+    """
+    Hot model reload endpoint.
+
+    Requests already running finish on the previous model.
+    """
+    from ..core import model_reloader, settings
+
+    PredictionController.check_reload_allowed(
+        settings.admin_reload_enabled, settings.admin_token, x_admin_token
+    )
+    result = await PredictionController.reload_model(model_reloader)
+    return ModelReloadResponse(**result)
+
+
 @router.post(
     "/predict",
     response_model=PredictionResponse,
@@ -41,24 +118,152 @@ async def model_info() -> ModelInfoResponse:
     responses={
         200: {"description": "Prediction successful"},
         400: {"model": ErrorResponse, "description": "Invalid input data"},
+        404: {"model": ErrorResponse, "description": "Unknown model version"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Model not loaded or busy"},
     },
 )
-async def predict_price(property_data: PropertyInput) -> PredictionResponse:
+async def predict_price(
+    property_data: PropertyInput,
+    n_trees: Optional[int] = Query(None, ge=1, description=N_TREES_DESCRIPTION),
+    model_version: Optional[str] = Query(None, description=MODEL_VERSION_DESCRIPTION),
+    x_profile: Optional[str] = Header(
+        None, alias=PROFILE_HEADER, description=PROFILE_DESCRIPTION
+    ),
+) -> PredictionJSONResponse:
     """
     Main prediction endpoint.
 
     Args:
         property_data: Property information (PropertyInput schema)
+        n_trees: Optional tree budget
+        model_version: Optional model version
+        x_profile: Optional profiling request (X-Profile header)
 
     Returns:
-        PredictionResponse with predicted price and confidence interval
+        PredictionResponse JSON with predicted price and confidence interval
 
     Raises:
         HTTPException: If prediction fails (handled by controller)
     """
-    from ..core import forecaster
+    from ..core import forecaster, inference_executor, micro_batcher, model_registry
 
+    forecaster, target = await PredictionController.resolve_version(
+        forecaster, model_registry, model_version
+    )
+    profile = start_profile("predict", x_profile)
     data = property_data.model_dump()
-    result = PredictionController.predict_price(forecaster, data)
-    return PredictionResponse(**result)
+    result = await PredictionController.predict_price(
+        forecaster, inference_executor, data, micro_batcher, n_trees, profile, target
+    )
+    return PredictionJSONResponse(result, profile)
+
+
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    summary="Predict Property Prices (Batch)",
+    description=(
+        "Predict prices for many properties in one vectorized model pass. "
+        "Invalid records are reported per row instead of failing the batch."
+    ),
+    responses={
+        200: {"description": "Batch processed"},
+        404: {"model": ErrorResponse, "description": "Unknown model version"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Model not loaded or busy"},
+    },
+)
+async def predict_batch(
+    batch: BatchPredictionRequest,
+    n_trees: Optional[int] = Query(None, ge=1, description=N_TREES_DESCRIPTION),
+    model_version: Optional[str] = Query(None, description=MODEL_VERSION_DESCRIPTION),
+    x_profile: Optional[str] = Header(
+        None, alias=PROFILE_HEADER, description=PROFILE_DESCRIPTION
+    ),
+) -> PredictionJSONResponse:
+    """
+    Batch prediction endpoint.
+
+    Args:
+        batch: List of property records (BatchPredictionRequest schema)
+        n_trees: Optional tree budget
+        model_version: Optional model version
+        x_profile: Optional profiling request (X-Profile header)
+
+    Returns:
+        BatchPredictionResponse JSON with one result (or error) per record
+
+    Raises:
+        HTTPException: If model not loaded or prediction fails
+    """
+    from ..core import forecaster, inference_executor, model_registry
+
+    forecaster, target = await PredictionController.resolve_version(
+        forecaster, model_registry, model_version
+    )
+    profile = start_profile("predict-batch", x_profile)
+    result = await PredictionController.predict_batch(
+        forecaster, inference_executor, batch.properties, n_trees, profile, target
+    )
+    return PredictionJSONResponse(result, profile)
+
+
+@router.post(
+    "/predict/stream",
+    response_class=UploadStreamingResponse,
+    summary="Predict Property Prices (Streaming)",
+    description=(
+        "Score an NDJSON or CSV upload (Price Paid layout, with or without "
+        "header) in fixed-size chunks, streaming NDJSON results back while "
+        "the upload is still being received."
+    ),
+    responses={
+        200: {
+            "description": "One NDJSON line per input row",
+            "content": {"application/x-ndjson": {}},
+        },
+        415: {"model": ErrorResponse, "description": "Unsupported content type"},
+        503: {"model": ErrorResponse, "description": "Model not loaded"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def predict_stream(
+    request: Request,
+    chunk_size: int = Query(
+        1000, ge=1, le=MAX_BATCH_SIZE, description="Rows per forest evaluation"
+    ),
+) -> UploadStreamingResponse:
+    """
+    Streaming bulk prediction endpoint.
+
+    Args:
+        request: Request with an NDJSON or CSV body
+        chunk_size: Rows scored per forest evaluation
+
+    Returns:
+        StreamingResponse of NDJSON results (row, id, prediction or error)
+
+    Raises:
+        HTTPException: If model not loaded or content type unsupported
+    """
+    from ..core import forecaster, inference_executor
+
+    upload = UploadStream(request.receive)
+    results = PredictionController.predict_stream(
+        forecaster,
+        inference_executor,
+        upload,
+        request.headers.get("content-type", ""),
+        chunk_size,
+        upload.is_disconnected,
+    )
+    return UploadStreamingResponse(results, media_type="application/x-ndjson")
@@ -0,0 +1,49 @@
+"""
+Lean JSON responses for endpoints returning already validated data.
+"""
+
+import time
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+from ..core.profiling import RequestProfile, record_stage
+
+
+class PredictionJSONResponse(JSONResponse):
+    """
+    JSON response rendering prediction dictionaries as they are.
+
+    Returning a Response skips FastAPI's response_model validation, and the
+    forecaster already builds its output in the response schema's exact
+    shape (see SalesForecaster._static_response), so validating it again
+    would only cost time. The route keeps response_model for the OpenAPI
+    schema.
+    """
+
+    def __init__(
+        self, content: Any, profile: Optional[RequestProfile] = None, **kwargs: Any
+    ):
+        """
+        Initialize response.
+
+        Args:
+            content: Response dictionary in the response schema's shape
+            profile: Optional request profile; serialization is added to it
+                and its Server-Timing header set on the response
+        """
+        self.profile = profile
+        super().__init__(content, **kwargs)
+        if profile is not None:
+            profile.apply(self.headers)
+
+    def render(self, content: Any) -> bytes:
+        """Serialize with pydantic-core's encoder (Rust, several times json's)."""
+        started = time.perf_counter()
+        body = to_json(content)
+        seconds = time.perf_counter() - started
+        record_stage("serialization", seconds)
+        if self.profile is not None:
+            self.profile.add("serialization", seconds)
+        return body
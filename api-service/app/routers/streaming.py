@@ -0,0 +1,82 @@
+"""
+Streaming upload helpers for endpoints that answer while the body arrives.
+"""
+
+from typing import AsyncIterator, List
+
+import anyio
+from fastapi.responses import StreamingResponse
+from starlette.types import Message, Receive, Scope, Send
+
+
+class UploadStream:
+    """
+    Request body reader that can also poll for a client disconnect.
+
+    Starlette's Request.is_disconnected() may consume a pending body
+    message, so chunks seen while polling are kept here for the reader.
+    """
+
+    def __init__(self, receive: Receive):
+        """
+        Initialize reader.
+
+        Args:
+            receive: ASGI receive callable of the request
+        """
+        self._receive = receive
+        self._chunks: List[bytes] = []
+        self._more_body = True
+        self.disconnected = False
+
+    def _handle(self, message: Message) -> None:
+        """Record a received ASGI message."""
+        if message.get("type") == "http.request":
+            body = message.get("body", b"")
+            if body:
+                self._chunks.append(body)
+            self._more_body = message.get("more_body", False)
+        elif message.get("type") == "http.disconnect":
+            self.disconnected = True
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield body chunks until the upload ends or the client leaves."""
+        while True:
+            while self._chunks:
+                yield self._chunks.pop(0)
+            if not self._more_body or self.disconnected:
+                return
+            self._handle(await self._receive())
+
+    async def is_disconnected(self) -> bool:
+        """Check, without waiting, whether the client has gone away."""
+        if not self.disconnected:
+            message: Message = {}
+
+            # If no message is immediately available, move on
+            with anyio.CancelScope() as scope:
+                scope.cancel()
+                message = await self._receive()
+
+            self._handle(message)
+        return self.disconnected
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator reads the request itself.
+
+    StreamingResponse normally listens for disconnects by calling receive
+    in a parallel task, which would steal body messages from an upload
+    that is still being read; here the UploadStream sees them instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Stream the response without a competing disconnect listener."""
+        try:
+            await self.stream_response(send)
+        except OSError:
+            # Client went away mid-response
+            return
+        if self.background is not None:
+            await self.background()
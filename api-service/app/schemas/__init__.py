@@ -2,18 +2,50 @@
 Pydantic schemas for API validation.
 """
 
+from .batch_prediction import (
+    BatchPredictionItem,
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+)
 from .error import ErrorResponse
-from .health import HealthResponse
-from .model_info import ModelInfoResponse
+from .health import HealthResponse, ReadinessResponse
+from .model_info import (
+    CacheStats,
+    ConformalIntervalStats,
+    InferenceStats,
+    MicroBatchStats,
+    ModelInfoResponse,
+    ModelRegistryStats,
+    ModelReloadResponse,
+    ModelVersionInfo,
+    PredictionTableStats,
+    TreeBudgetProfile,
+    WorkerInfo,
+)
 from .prediction_response import ConfidenceInterval, ModelInfo, PredictionResponse
-from .property_input import PropertyInput
+from .property_input import PropertyInput, validate_property
 
 __all__ = [
     "PropertyInput",
+    "validate_property",
     "PredictionResponse",
     "ConfidenceInterval",
     "ModelInfo",
     "HealthResponse",
+    "ReadinessResponse",
     "ModelInfoResponse",
+    "ModelReloadResponse",
+    "CacheStats",
+    "ConformalIntervalStats",
+    "InferenceStats",
+    "MicroBatchStats",
+    "ModelRegistryStats",
+    "ModelVersionInfo",
+    "PredictionTableStats",
+    "TreeBudgetProfile",
+    "WorkerInfo",
     "ErrorResponse",
+    "BatchPredictionRequest",
+    "BatchPredictionItem",
+    "BatchPredictionResponse",
 ]
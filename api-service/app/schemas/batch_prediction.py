@@ -0,0 +1,75 @@
+"""
+Batch prediction schemas.
+"""
+
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .prediction_response import ConfidenceInterval, ModelInfo
+
+MAX_BATCH_SIZE = 10000
+
+
+class BatchPredictionRequest(BaseModel):
+    """Batch prediction request schema.
+
+    Records are validated one by one against PropertyInput so that an
+    invalid row (including one that is not an object) produces a per-row
+    error instead of rejecting the batch.
+    """
+
+    properties: List[Any] = Field(
+        ...,
+        description="Property records (PropertyInput shape)",
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "properties": [
+                        {
+                            "property_type": "T",
+                            "old_new": "N",
+                            "duration": "F",
+                            "county": "GREATER LONDON",
+                            "postcode": "SW1A 1AA",
+                            "year": 2024,
+                        },
+                        {
+                            "property_type": "D",
+                            "old_new": "N",
+                            "duration": "F",
+                            "county": "SURREY",
+                            "postcode": "GU1 1AA",
+                            "year": 2024,
+                        },
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class BatchPredictionItem(BaseModel):
+    """Result for a single row of a batch."""
+
+    index: int = Field(..., description="Position of the record in the request")
+    predicted_price: Optional[float] = Field(None, description="Predicted price in £")
+    confidence_interval: Optional[ConfidenceInterval] = Field(
+        None, description="Confidence interval"
+    )
+    error: Optional[str] = Field(None, description="Error message for invalid rows")
+
+
+class BatchPredictionResponse(BaseModel):
+    """Batch prediction response schema."""
+
+    results: List[BatchPredictionItem] = Field(..., description="Per-row results")
+    n_success: int = Field(..., description="Rows predicted successfully")
+    n_errors: int = Field(..., description="Rows rejected with an error")
+    features_used: List[str] = Field(..., description="Features used in the model")
+    model_info: ModelInfo = Field(..., description="Model information")
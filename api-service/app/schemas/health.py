@@ -3,6 +3,7 @@ Health response schema.
 """
 
 from datetime import datetime
+from typing import Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -14,3 +15,21 @@ class HealthResponse(BaseModel):
     timestamp: datetime = Field(..., description="Response timestamp")
     model_loaded: bool = Field(..., description="Whether model is loaded")
     version: str = Field(..., description="API version")
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness check response schema."""
+
+    ready: bool = Field(..., description="Whether predictions can be served")
+    status: str = Field(..., description="Model load status: loading, ready or failed")
+    model_loaded: bool = Field(..., description="Whether model is loaded")
+    load_seconds: Optional[float] = Field(
+        None, description="Time from startup to a loaded and warmed model (s)"
+    )
+    warmup_seconds: Optional[float] = Field(
+        None, description="Time spent on warm-up predictions (s)"
+    )
+    load_timings: Optional[Dict[str, float]] = Field(
+        None, description="Seconds per artifact file and load step (incl. warmup)"
+    )
+    error: Optional[str] = Field(None, description="Load error, if it failed")
@@ -2,11 +2,133 @@
 Model information schema.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
 
+class CacheStats(BaseModel):
+    """Prediction cache counters."""
+
+    size: int = Field(..., description="Cached entries")
+    max_size: int = Field(..., description="Maximum cached entries")
+    hits: int = Field(..., description="Cache hits")
+    misses: int = Field(..., description="Cache misses")
+    evictions: int = Field(..., description="LRU evictions")
+    hit_rate: float = Field(..., description="Hits / lookups")
+
+
+class PredictionTableStats(BaseModel):
+    """Precomputed prediction table counters."""
+
+    entries: int = Field(..., description="Precomputed combinations")
+    hits: int = Field(..., description="Predictions served from the table")
+    misses: int = Field(..., description="Lookups that fell back to the forest")
+
+
+class ConformalIntervalStats(BaseModel):
+    """Calibration of the conformal prediction intervals."""
+
+    coverage: float = Field(..., description="Target share of prices inside")
+    segments: int = Field(
+        ..., description="Property type x postcode area segments calibrated"
+    )
+    property_types: int = Field(..., description="Property types calibrated")
+    min_segment_size: int = Field(
+        ..., description="Fewest held-out residuals for a segment's own quantiles"
+    )
+
+
+class WorkerInfo(BaseModel):
+    """Worker process identity and memory."""
+
+    pid: int = Field(..., description="Worker process id")
+    rss_mb: Optional[float] = Field(None, description="Resident memory (MB)")
+    rss_anon_mb: Optional[float] = Field(
+        None, description="Private (anonymous) resident memory (MB)"
+    )
+    rss_file_mb: Optional[float] = Field(
+        None, description="File-backed resident memory, incl. shared mmaps (MB)"
+    )
+
+
+class InferenceStats(BaseModel):
+    """Inference executor queue and wait-time counters."""
+
+    kind: str = Field(..., description="Pool type (thread or process)")
+    max_workers: int = Field(..., description="Pool size")
+    max_queue: int = Field(..., description="Maximum waiting requests")
+    in_flight: int = Field(..., description="Requests running or waiting")
+    queue_depth: int = Field(..., description="Requests waiting for a worker")
+    completed: int = Field(..., description="Completed inference calls")
+    rejected: int = Field(..., description="Requests rejected with queue full")
+    pool_restarts: int = Field(
+        ..., description="Process pools replaced after a worker died"
+    )
+    wait_ms_avg: float = Field(..., description="Mean queue wait (ms)")
+    wait_ms_max: float = Field(..., description="Maximum queue wait (ms)")
+
+
+class MicroBatchStats(BaseModel):
+    """Micro-batching configuration and counters."""
+
+    max_batch_size: int = Field(..., description="Requests per batch")
+    max_wait_ms: float = Field(..., description="Longest wait for a batch (ms)")
+    batches: int = Field(..., description="Batches evaluated")
+    requests: int = Field(..., description="Requests batched")
+    mean_batch_size: float = Field(..., description="Requests / batches")
+    max_batch_seen: int = Field(..., description="Largest batch evaluated")
+
+
+class TreeBudgetProfile(BaseModel):
+    """Accuracy and latency of evaluating the first n_trees trees."""
+
+    n_trees: int = Field(..., description="Trees evaluated")
+    price_error_mean: float = Field(
+        ..., description="Mean relative price difference from the full forest"
+    )
+    price_error_p95: float = Field(
+        ..., description="95th percentile relative price difference"
+    )
+    interval_error_mean: float = Field(
+        ..., description="Mean relative interval bound difference"
+    )
+    row_latency_ms: float = Field(..., description="Single-row evaluation (ms)")
+    batch_row_us: float = Field(..., description="Per-row time in a batch (µs)")
+
+
+class ModelVersionInfo(BaseModel):
+    """A loaded model version."""
+
+    version: str = Field(..., description="Version (artifact subdirectory name)")
+    trained_date: Optional[str] = Field(None, description="Training date")
+    n_estimators: int = Field(..., description="Number of estimators")
+    memory_mb: float = Field(
+        ..., description="Estimated model memory, memory-mapped forest included (MB)"
+    )
+    load_seconds: float = Field(..., description="Time to load and validate (s)")
+    requests: int = Field(..., description="Requests answered since loading")
+    idle_seconds: float = Field(..., description="Time since the last request (s)")
+
+
+class ModelRegistryStats(BaseModel):
+    """Model versions available and loaded in this worker."""
+
+    versions_dir: str = Field(..., description="Directory of versioned artifacts")
+    available: List[str] = Field(
+        ..., description="Versions with a complete artifact set"
+    )
+    loaded: List[ModelVersionInfo] = Field(
+        ..., description="Loaded versions, most recently used first"
+    )
+    memory_mb: float = Field(..., description="Estimated memory of loaded versions")
+    max_memory_mb: float = Field(
+        ..., description="Memory budget; least recently used versions are evicted"
+    )
+    loads: int = Field(..., description="Versions loaded")
+    evictions: int = Field(..., description="Versions evicted")
+
+
 class ModelInfoResponse(BaseModel):
     """Detailed model information schema."""
 
@@ -20,3 +142,72 @@ class ModelInfoResponse(BaseModel):
     )
     expected_r2: Optional[float] = Field(None, description="Expected R2 score")
     trained_date: Optional[str] = Field(None, description="Training date")
+    interval_percentiles: Optional[List[float]] = Field(
+        None, description="Per-tree percentiles used as confidence interval"
+    )
+    interval_mode: Optional[str] = Field(
+        None,
+        description=(
+            "Confidence interval source: trees (per-tree percentiles) or "
+            "conformal (calibrated residual quantiles per segment)"
+        ),
+    )
+    conformal_intervals: Optional[ConformalIntervalStats] = Field(
+        None, description="Conformal interval calibration (None when not serving)"
+    )
+    engine: Optional[str] = Field(None, description="Forest evaluation engine")
+    shared_forest: Optional[bool] = Field(
+        None, description="Whether the forest is served from shared memory maps"
+    )
+    memory_mb: Optional[float] = Field(
+        None,
+        description="Estimated memory of the model's arrays, not counting "
+        "memory-mapped ones (MB)",
+    )
+    load_timings: Optional[Dict[str, float]] = Field(
+        None, description="Seconds per artifact file and step of the last load"
+    )
+    tree_budgets: Optional[List[TreeBudgetProfile]] = Field(
+        None,
+        description=(
+            "Error versus the full forest and latency per tree budget "
+            "(n_trees query parameter), measured on load"
+        ),
+    )
+    cache: Optional[CacheStats] = Field(
+        None,
+        description=(
+            "Prediction cache counters (None when disabled, or with the "
+            "process executor, where each pool child keeps its own)"
+        ),
+    )
+    prediction_table: Optional[PredictionTableStats] = Field(
+        None,
+        description=(
+            "Prediction table counters (None when not serving, or with the "
+            "process executor, where each pool child keeps its own)"
+        ),
+    )
+    worker: Optional[WorkerInfo] = Field(None, description="Worker process")
+    inference: Optional[InferenceStats] = Field(
+        None, description="Inference executor counters"
+    )
+    micro_batching: Optional[MicroBatchStats] = Field(
+        None, description="Micro-batching counters (None when disabled)"
+    )
+    versions: Optional[ModelRegistryStats] = Field(
+        None, description="Model versions selectable with model_version"
+    )
+
+
+class ModelReloadResponse(BaseModel):
+    """Hot model reload result schema."""
+
+    previous_trained_date: Optional[str] = Field(
+        None, description="Training date of the replaced model"
+    )
+    trained_date: Optional[str] = Field(
+        None, description="Training date of the model now serving"
+    )
+    load_seconds: float = Field(..., description="Time to load and validate (s)")
+    pid: int = Field(..., description="Process that reloaded its model")
@@ -2,7 +2,7 @@
 Prediction response schemas.
 """
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -10,8 +10,12 @@ from pydantic import BaseModel, Field
 class ConfidenceInterval(BaseModel):
     """Prediction confidence interval."""
 
-    min: float = Field(..., description="Minimum price (10th percentile)")
-    max: float = Field(..., description="Maximum price (90th percentile)")
+    min: float = Field(
+        ..., description="Minimum price (lower percentile, 10th by default)"
+    )
+    max: float = Field(
+        ..., description="Maximum price (upper percentile, 90th by default)"
+    )
 
 
 class ModelInfo(BaseModel):
@@ -20,6 +24,9 @@ class ModelInfo(BaseModel):
     type: str = Field(..., description="Model type")
     n_estimators: int = Field(..., description="Number of trees")
     expected_r2: float = Field(..., description="Expected R2 score")
+    n_trees: Optional[int] = Field(
+        None, description="Trees evaluated, when a tree budget was requested"
+    )
 
 
 class PredictionResponse(BaseModel):
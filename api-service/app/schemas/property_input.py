@@ -2,7 +2,9 @@
 Property input schema for predictions.
 """
 
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 
 class PropertyInput(BaseModel):
@@ -55,3 +57,33 @@ class PropertyInput(BaseModel):
             ]
         }
     }
+
+
+def validate_property(record: Any) -> Dict[str, Any]:
+    """
+    Validate a raw record as PropertyInput.
+
+    Shared by the batch, streaming and offline scoring paths so every
+    entry point accepts the same rows as /predict.
+
+    Args:
+        record: Raw property record (anything, e.g. a parsed JSON value)
+
+    Returns:
+        Normalized fields in the predict() input shape (extra keys such as
+        id are dropped)
+
+    Raises:
+        ValueError: Naming each invalid field and pydantic's reason, e.g.
+            "Invalid data: year: Input should be greater than or equal to
+            1995" ("record" for records that are not objects)
+    """
+    try:
+        return PropertyInput.model_validate(record).model_dump()
+    except ValidationError as e:
+        reasons = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'record'}: "
+            f"{error['msg']}"
+            for error in e.errors()
+        )
+        raise ValueError(f"Invalid data: {reasons}") from None
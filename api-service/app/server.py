@@ -0,0 +1,198 @@
+"""
+Production server launcher.
+
+Loads the SalesForecaster once in the master process, then forks worker
+processes that inherit the loaded model copy-on-write and serve the API
+with uvicorn on a shared listening socket. Crashed workers are re-forked
+from the master, so restarts do not reload the model. Workers that die
+right after starting are restarted with exponential backoff, and the
+server exits after too many such failures in a row.
+
+Usage:
+    python -m app.server  (PORT, WORKERS, LOG_LEVEL from the environment)
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict
+
+import uvicorn
+
+from .core import forecaster
+from .main import app
+
+logger = logging.getLogger(__name__)
+
+# A worker exiting sooner than this after its fork counts as a quick failure
+MIN_UPTIME_SECONDS = 5.0
+# Restart delay after quick failures: doubles from base up to max
+RESTART_BACKOFF_SECONDS = 0.5
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+# Give up after this many quick failures in a row
+MAX_QUICK_FAILURES = 5
+
+
+class WorkerSupervisor:
+    """Forks and supervises worker processes."""
+
+    def __init__(self, target: Callable[[], None], workers: int):
+        """
+        Initialize supervisor.
+
+        Args:
+            target: Function run in each forked worker
+            workers: Number of workers to keep alive
+        """
+        self.target = target
+        self.workers = workers
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+        self.quick_failures = 0
+        self.gave_up = False
+
+    def spawn(self) -> int:
+        """
+        Fork a worker.
+
+        Returns:
+            Worker pid (in the master)
+        """
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                self.target()
+            except BaseException:
+                logger.exception("Worker failed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.children[pid] = time.perf_counter()
+        logger.info(f"Worker {pid} started")
+        return pid
+
+    def stop(self, signum=None, frame=None) -> None:
+        """Stop all workers (signal handler)."""
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> bool:
+        """
+        Start the workers and restart them until stopped.
+
+        Returns:
+            True when stopped by a signal, False when workers kept failing
+            right after starting (MAX_QUICK_FAILURES in a row); either way
+            all workers have exited
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        while self.children:
+            pid, status = os.wait()
+            started = self.children.pop(pid, None)
+            if started is None:
+                continue
+
+            if self.stopping:
+                logger.info(f"Worker {pid} stopped")
+                continue
+
+            uptime = time.perf_counter() - started
+            if uptime >= MIN_UPTIME_SECONDS:
+                self.quick_failures = 0
+                logger.warning(
+                    f"Worker {pid} exited (status {status}) after {uptime:.1f}s, "
+                    "restarting"
+                )
+                self.spawn()
+                continue
+
+            self.quick_failures += 1
+            if self.quick_failures >= MAX_QUICK_FAILURES:
+                logger.error(
+                    f"Worker {pid} exited (status {status}) after {uptime:.1f}s; "
+                    f"{self.quick_failures} quick failures in a row, giving up"
+                )
+                self.gave_up = True
+                self.stop()
+                continue
+
+            delay = min(
+                RESTART_BACKOFF_SECONDS * 2 ** (self.quick_failures - 1),
+                MAX_RESTART_BACKOFF_SECONDS,
+            )
+            logger.warning(
+                f"Worker {pid} exited (status {status}) after {uptime:.1f}s, "
+                f"restarting in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            if not self.stopping:
+                self.spawn()
+
+        return not self.gave_up
+
+
+def create_socket(host: str, port: int) -> socket.socket:
+    """
+    Create the listening socket shared by all workers.
+
+    Args:
+        host: Bind address
+        port: Bind port
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def main() -> None:
+    """Preload the model, then fork and supervise uvicorn workers."""
+    host = os.environ.get("HOST", "0.0.0.0")
+    port = int(os.environ.get("PORT", "8000"))
+    workers = int(os.environ.get("WORKERS", "4"))
+    log_level = os.environ.get("LOG_LEVEL", "info")
+
+    start = time.perf_counter()
+    forecaster.load()
+    logger.info(
+        f"Model loaded in master {os.getpid()} in {time.perf_counter() - start:.2f}s"
+    )
+
+    # Move preloaded objects out of the GC's reach so collections in the
+    # workers do not touch (and copy) the inherited pages
+    gc.collect()
+    gc.freeze()
+
+    sock = create_socket(host, port)
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+
+    def serve() -> None:
+        uvicorn.Server(config).run(sockets=[sock])
+
+    logger.info(f"Serving on {host}:{port} with {workers} forked workers")
+    stopped_cleanly = WorkerSupervisor(serve, workers).run()
+    sock.close()
+    if not stopped_cleanly:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ Commands:
   test          Run tests with coverage (90%+ required)
   dev           Start development server (hot reload)
   runserver     Start production server (multi-worker)
+  serve         Start production server (model loaded once, forked workers)
   health        Check API health and model status
   *             Display this help message
 
@@ -22,6 +23,28 @@ Environment Variables:
   PORT          Server port (default: 8000)
   WORKERS       Number of workers for production (default: 4)
   LOG_LEVEL     Logging level (default: info)
+  INFERENCE_ENGINE  Forest engine: native or sklearn (default: native)
+  PREDICTION_CACHE_SIZE  Prediction LRU cache entries, 0 disables (default: 10000)
+  PREDICTION_TABLE  Serve from the precomputed prediction table (default: false)
+  MMAP_FOREST   Share the native forest across workers via mmap (default: false)
+  COMPACT_FOREST  Serve the native forest from final_forest.bin (default: false)
+  INTERVAL_MODE  Confidence intervals: trees or conformal (default: trees)
+  INFERENCE_EXECUTOR  Pool running inference: thread or process (default: thread)
+  INFERENCE_WORKERS  Inference pool size per API worker (default: 2)
+  INFERENCE_QUEUE_SIZE  Requests waiting for inference before 503 (default: 64)
+  MICRO_BATCHING  Coalesce concurrent /predict requests (default: false)
+  MICRO_BATCH_SIZE  Requests per micro-batch (default: 32)
+  MICRO_BATCH_WAIT_MS  Longest wait for a micro-batch to fill (default: 2)
+  MODEL_VERSIONS_DIR  Versioned artifact sets, one per subdirectory (default: models/versions)
+  MODEL_VERSIONS_MEMORY_MB  Memory budget of loaded model versions (default: 1024)
+  WARMUP_ROWS   Synthetic predictions before reporting ready, 0 = off (default: 200)
+  WARMUP_LOCATIONS  Most frequent counties/postcode regions warmed (default: 20)
+  MODEL_WATCH_INTERVAL  Seconds between checks for new artifacts, 0 = off (default: 0)
+  ADMIN_RELOAD_ENABLED  Allow POST /api/v1/model/reload (default: false)
+  ADMIN_TOKEN   Token reloads must send in X-Admin-Token (default: none)
+  METRICS       Record request and stage latency metrics for /metrics (default: true)
+  REQUEST_PROFILING  Honour X-Profile request headers (default: false)
+  PROFILE_DIR   Directory for per-request cProfile dumps (default: profiles)
 "
   exit 1
 }
@@ -97,6 +120,25 @@ case "${1:-runserver}" in
       --log-level "$LOG_LEVEL"
     ;;
 
+  serve)
+    echo "========================================="
+    echo "ML Sales Forecasting API - PRODUCTION (preload)"
+    echo "========================================="
+    check_models || exit 1
+
+    export PORT=${PORT:-8000}
+    export WORKERS=${WORKERS:-4}
+    export LOG_LEVEL=${LOG_LEVEL:-info}
+
+    echo "Starting production server..."
+    echo "  Port: $PORT"
+    echo "  Workers: $WORKERS (forked after model load)"
+    echo "  Log level: $LOG_LEVEL"
+    echo "========================================="
+
+    exec python -m app.server
+    ;;
+
   health)
     echo "========================================="
     echo "Health Check"
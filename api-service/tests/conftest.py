@@ -4,8 +4,12 @@ Pytest configuration and shared fixtures.
 
 from unittest.mock import MagicMock, Mock
 
+import joblib
 import numpy as np
+import pandas as pd
 import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder
 
 from app.models.sales_forecaster import SalesForecaster
 
@@ -29,6 +33,10 @@ def mock_label_encoders():
     encoders["property_type"].transform.return_value = np.array([0])
     encoders["old_new"].transform.return_value = np.array([1])
     encoders["duration"].transform.return_value = np.array([0])
+    # Same codes for the sample property (T, N, F) when compiled into tables
+    encoders["property_type"].classes_ = np.array(["T", "D", "F", "O", "S"])
+    encoders["old_new"].classes_ = np.array(["Y", "N"])
+    encoders["duration"].classes_ = np.array(["F", "L", "U"])
     return encoders
 
 
@@ -98,3 +106,89 @@ def forecaster_unloaded():
     forecaster = SalesForecaster(models_dir="tests/fixtures/models")
     forecaster.is_loaded = False
     return forecaster
+
+
+FEATURES = [
+    "property_type_enc",
+    "county_enc",
+    "postcode_region_enc",
+    "old_new_enc",
+    "duration_enc",
+    "year",
+]
+
+
+@pytest.fixture(scope="session")
+def trained_artifacts():
+    """Train a small real Random Forest on synthetic data (pipeline layout)."""
+    rng = np.random.default_rng(42)
+    n = 600
+    counties = ["GREATER LONDON", "SURREY", "KENT", "ESSEX"]
+    regions = ["SW1A", "SW1", "GU1", "ME1", "CM1", "E1"]
+    df = pd.DataFrame(
+        {
+            "property_type": rng.choice(list("DSTFO"), n),
+            "old_new": rng.choice(list("YN"), n),
+            "duration": rng.choice(list("FLU"), n),
+            "county": rng.choice(counties, n),
+            "postcode_region": rng.choice(regions, n),
+            "year": rng.integers(1995, 2025, n),
+        }
+    )
+    df["price"] = np.exp(12 + rng.normal(0, 0.5, n) + (df["year"] - 1995) * 0.03)
+
+    label_encoders = {}
+    for col in ["property_type", "old_new", "duration"]:
+        encoder = LabelEncoder()
+        df[col + "_enc"] = encoder.fit_transform(df[col])
+        label_encoders[col] = encoder
+
+    county_map = df.groupby("county")["price"].mean()
+    postcode_map = df.groupby("postcode_region")["price"].mean()
+    df["county_enc"] = df["county"].map(county_map)
+    df["postcode_region_enc"] = df["postcode_region"].map(postcode_map)
+
+    model = RandomForestRegressor(n_estimators=10, max_depth=8, random_state=42)
+    model.fit(df[FEATURES], np.log(df["price"]))
+
+    return {
+        "model": model,
+        "label_encoders": label_encoders,
+        "target_encodings": {
+            "county_map": county_map.to_dict(),
+            "postcode_map": postcode_map.to_dict(),
+        },
+        "metadata": {
+            "model_type": "RandomForestRegressor",
+            "n_estimators": 10,
+            "features": FEATURES,
+            "target_transform": "log",
+            "trained_date": "2024-01-15T00:00:00",
+            "training_samples": n,
+            "cv_r2_mean": 0.43,
+            "expected_r2": 0.11,
+        },
+    }
+
+
+@pytest.fixture
+def models_dir(tmp_path, trained_artifacts):
+    """Write the synthetic artifacts with the deployed file names."""
+    joblib.dump(trained_artifacts["model"], tmp_path / "final_model.joblib")
+    joblib.dump(
+        trained_artifacts["label_encoders"], tmp_path / "final_label_encoders.joblib"
+    )
+    joblib.dump(
+        trained_artifacts["target_encodings"],
+        tmp_path / "final_target_encodings.joblib",
+    )
+    joblib.dump(trained_artifacts["metadata"], tmp_path / "final_metadata.joblib")
+    return tmp_path
+
+
+@pytest.fixture
+def forecaster_trained(models_dir):
+    """Create a SalesForecaster loaded with real synthetic artifacts."""
+    forecaster = SalesForecaster(models_dir=str(models_dir))
+    forecaster.load()
+    return forecaster
@@ -32,3 +32,36 @@ def test_get_health_status_unloaded():
     assert result["status"] == "healthy"
     assert result["model_loaded"] is False
     assert result["version"] == "1.0.0"
+
+
+def test_get_health_status_load_failed():
+    """Test a failed model load makes the service unhealthy."""
+    forecaster = MagicMock(spec=SalesForecaster)
+    forecaster.is_loaded = False
+    loader = MagicMock(status="failed")
+
+    result = HealthController.get_health_status(forecaster, loader)
+
+    assert result["status"] == "unhealthy"
+
+
+def test_get_health_status_loading():
+    """Test the service is healthy while the model is loading."""
+    forecaster = MagicMock(spec=SalesForecaster)
+    forecaster.is_loaded = False
+    loader = MagicMock(status="loading")
+
+    result = HealthController.get_health_status(forecaster, loader)
+
+    assert result["status"] == "healthy"
+    assert result["model_loaded"] is False
+
+
+def test_get_readiness():
+    """Test readiness combines the ready flag with load stats."""
+    loader = MagicMock(is_ready=True)
+    loader.stats.return_value = {"status": "ready", "model_loaded": True}
+
+    result = HealthController.get_readiness(loader)
+
+    assert result == {"ready": True, "status": "ready", "model_loaded": True}
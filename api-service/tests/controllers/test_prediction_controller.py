@@ -2,10 +2,18 @@
 Unit tests for PredictionController.
 """
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from fastapi import HTTPException, status
 
 from app.controllers.prediction_controller import PredictionController
+from app.core.batcher import MicroBatcher
+from app.core.executor import InferenceExecutor, InferenceQueueFull
+from app.core.profiling import RequestProfile, record_stage
+from app.core.registry import UnknownModelVersion
+from app.core.reloader import ReloadInProgress
+from app.models.prediction_cache import PredictionCache
 
 
 def test_get_model_info_success(forecaster_mock):
@@ -15,52 +23,561 @@ def test_get_model_info_success(forecaster_mock):
     assert result["loaded"] is True
     assert "model_type" in result
     assert "n_estimators" in result
+    assert result["worker"]["pid"] > 0
+    assert result["inference"] is None
+    assert result["micro_batching"] is None
+    assert result["versions"] is None
+
+
+def test_get_model_info_with_registry(forecaster_mock):
+    """Test model info lists the registry's versions."""
+    registry = MagicMock()
+    registry.stats.return_value = {"available": ["2023"], "loaded": []}
+
+    result = PredictionController.get_model_info(forecaster_mock, registry=registry)
+
+    assert result["versions"] == {"available": ["2023"], "loaded": []}
+
+
+def test_get_model_info_with_executor(forecaster_mock):
+    """Test model info includes inference executor stats."""
+    executor = InferenceExecutor(max_workers=3)
+
+    result = PredictionController.get_model_info(forecaster_mock, executor)
+
+    assert result["inference"]["max_workers"] == 3
+    assert result["inference"]["queue_depth"] == 0
+
+
+def test_get_model_info_process_executor(forecaster_trained):
+    """Test per-process counters are not reported for the process pool."""
+    forecaster_trained.cache = PredictionCache(max_size=8)
+
+    thread_info = PredictionController.get_model_info(
+        forecaster_trained, InferenceExecutor()
+    )
+    process_info = PredictionController.get_model_info(
+        forecaster_trained, InferenceExecutor(kind="process")
+    )
+
+    assert thread_info["cache"]["max_size"] == 8
+    assert process_info["cache"] is None
+    assert process_info["prediction_table"] is None
+    assert process_info["inference"]["kind"] == "process"
+
+
+async def test_reload_model_success():
+    """Test a successful reload returns the reloader's result."""
+    reloader = MagicMock()
+    reloader.reload = AsyncMock(return_value={"trained_date": "2030-01-01"})
+
+    result = await PredictionController.reload_model(reloader)
+
+    assert result == {"trained_date": "2030-01-01"}
+
+
+@pytest.mark.parametrize(
+    "error, code",
+    [
+        (ReloadInProgress("busy"), status.HTTP_409_CONFLICT),
+        (FileNotFoundError("gone"), status.HTTP_500_INTERNAL_SERVER_ERROR),
+    ],
+)
+async def test_reload_model_errors(error, code):
+    """Test reload errors map to 409 (in progress) and 500 (rejected)."""
+    reloader = MagicMock()
+    reloader.reload = AsyncMock(side_effect=error)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await PredictionController.reload_model(reloader)
+
+    assert exc_info.value.status_code == code
+
+
+@pytest.mark.parametrize(
+    "enabled, admin_token, token, code",
+    [
+        (False, None, None, status.HTTP_403_FORBIDDEN),
+        (False, "secret", "secret", status.HTTP_403_FORBIDDEN),
+        (True, "secret", None, status.HTTP_401_UNAUTHORIZED),
+        (True, "secret", "other", status.HTTP_401_UNAUTHORIZED),
+        (True, "secret", "secret", None),
+        (True, None, None, None),
+        # docker-compose passes ADMIN_TOKEN= when unset
+        (True, "", None, None),
+    ],
+)
+def test_check_reload_allowed(enabled, admin_token, token, code):
+    """Test reloads need ADMIN_RELOAD_ENABLED and the token, if configured."""
+    if code is None:
+        PredictionController.check_reload_allowed(enabled, admin_token, token)
+        return
+
+    with pytest.raises(HTTPException) as exc_info:
+        PredictionController.check_reload_allowed(enabled, admin_token, token)
+
+    assert exc_info.value.status_code == code
+
+
+def executor_for(forecaster):
+    """Thread executor running calls on the given forecaster."""
+    return InferenceExecutor(max_workers=1, target=lambda: forecaster)
+
+
+@pytest.fixture
+def trained_executor(forecaster_trained):
+    """Thread executor running calls on the trained forecaster."""
+    executor = executor_for(forecaster_trained)
+    yield executor
+    executor.shutdown()
+
+
+async def test_resolve_version_default(forecaster_mock):
+    """Test requests without a version get the default forecaster."""
+    registry = MagicMock()
+
+    result = await PredictionController.resolve_version(
+        forecaster_mock, registry, None
+    )
 
+    assert result == (forecaster_mock, None)
+    registry.get.assert_not_called()
 
-def test_predict_price_success(forecaster_mock, sample_property_data):
-    """Test successful price prediction."""
-    result = PredictionController.predict_price(forecaster_mock, sample_property_data)
 
-    assert "predicted_price" in result
-    assert "confidence_interval" in result
+async def test_resolve_version(forecaster_trained):
+    """Test a version resolves to its forecaster and executor target."""
+    registry = MagicMock()
+    registry.get = AsyncMock(return_value=forecaster_trained)
+
+    forecaster, target = await PredictionController.resolve_version(
+        None, registry, "2023"
+    )
+
+    assert forecaster is forecaster_trained
+    assert target is registry.target.return_value
+    registry.target.assert_called_once_with("2023")
+
+
+@pytest.mark.parametrize(
+    "error, code",
+    [
+        (UnknownModelVersion("Unknown model version '2021'"), 404),
+        (FileNotFoundError("final_model.joblib"), 500),
+    ],
+)
+async def test_resolve_version_errors(error, code):
+    """Test unknown versions give 404 and failed loads 500."""
+    registry = MagicMock()
+    registry.get = AsyncMock(side_effect=error)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await PredictionController.resolve_version(None, registry, "2021")
+
+    assert exc_info.value.status_code == code
+
+
+async def test_predict_price_model_version(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test a version's requests run on its target, without micro-batching."""
+    batcher = MicroBatcher(trained_executor, max_wait_ms=0)
+    version = MagicMock()
+    version.predict.return_value = {"predicted_price": 1.0}
+
+    result = await PredictionController.predict_price(
+        forecaster_trained,
+        trained_executor,
+        sample_property_data,
+        batcher,
+        target=lambda: version,
+    )
+
+    assert result == {"predicted_price": 1.0}
+    version.predict.assert_called_once_with(sample_property_data, None)
+    assert batcher.stats()["requests"] == 0
+
+
+async def test_predict_price_success(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test prediction through the inference executor."""
+    result = await PredictionController.predict_price(
+        forecaster_trained, trained_executor, sample_property_data
+    )
+
+    assert result == forecaster_trained.predict(sample_property_data)
     assert "features_used" in result
     assert "model_info" in result
+    assert trained_executor.completed == 1
 
 
-def test_predict_price_model_not_loaded(forecaster_unloaded, sample_property_data):
+async def test_predict_price_model_not_loaded(
+    forecaster_unloaded, sample_property_data
+):
     """Test prediction when model is not loaded."""
     with pytest.raises(HTTPException) as exc_info:
-        PredictionController.predict_price(forecaster_unloaded, sample_property_data)
+        await PredictionController.predict_price(
+            forecaster_unloaded, InferenceExecutor(), sample_property_data
+        )
 
     assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
     assert "Model not loaded" in exc_info.value.detail
 
 
-def test_predict_price_value_error(sample_property_data):
+async def test_predict_price_value_error(sample_property_data):
     """Test prediction with ValueError (invalid data)."""
-    from unittest.mock import MagicMock
-    
     forecaster_mock = MagicMock()
     forecaster_mock.is_loaded = True
     forecaster_mock.predict = MagicMock(side_effect=ValueError("Invalid county"))
 
     with pytest.raises(HTTPException) as exc_info:
-        PredictionController.predict_price(forecaster_mock, sample_property_data)
+        await PredictionController.predict_price(
+            forecaster_mock, executor_for(forecaster_mock), sample_property_data
+        )
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
     assert "Invalid data" in exc_info.value.detail
 
 
-def test_predict_price_generic_error(sample_property_data):
+async def test_predict_price_generic_error(sample_property_data):
     """Test prediction with generic error."""
-    from unittest.mock import MagicMock
-    
     forecaster_mock = MagicMock()
     forecaster_mock.is_loaded = True
     forecaster_mock.predict = MagicMock(side_effect=Exception("Unexpected error"))
 
     with pytest.raises(HTTPException) as exc_info:
-        PredictionController.predict_price(forecaster_mock, sample_property_data)
+        await PredictionController.predict_price(
+            forecaster_mock, executor_for(forecaster_mock), sample_property_data
+        )
 
     assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert "Prediction error" in exc_info.value.detail
+
+
+async def test_predict_price_queue_full(forecaster_trained, sample_property_data):
+    """Test a full inference queue is reported as busy."""
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    executor.in_flight = 1  # one running, no queue slots
+
+    with pytest.raises(HTTPException) as exc_info:
+        await PredictionController.predict_price(
+            forecaster_trained, executor, sample_property_data
+        )
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "Server busy" in exc_info.value.detail
+    assert exc_info.value.headers == {"Retry-After": "1"}
+
+
+async def test_predict_price_micro_batched(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test prediction through the micro-batcher."""
+    batcher = MicroBatcher(trained_executor, max_wait_ms=0)
+
+    result = await PredictionController.predict_price(
+        forecaster_trained, trained_executor, sample_property_data, batcher
+    )
+
+    assert result == forecaster_trained.predict(sample_property_data)
+    info = PredictionController.get_model_info(
+        forecaster_trained, trained_executor, batcher
+    )
+    assert info["micro_batching"]["requests"] == 1
+
+
+async def test_predict_price_tree_budget(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test a tree budget bypasses the micro-batcher."""
+    batcher = MicroBatcher(trained_executor, max_wait_ms=0)
+
+    result = await PredictionController.predict_price(
+        forecaster_trained, trained_executor, sample_property_data, batcher, 2
+    )
+
+    assert result == forecaster_trained.predict(sample_property_data, n_trees=2)
+    assert batcher.stats()["requests"] == 0
+
+
+async def test_predict_batch_success(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test batch prediction with valid and invalid records."""
+    records = [
+        sample_property_data,
+        dict(sample_property_data, property_type="X"),
+        dict(sample_property_data, year=1990),
+        "junk",
+    ]
+
+    result = await PredictionController.predict_batch(
+        forecaster_trained, trained_executor, records
+    )
+
+    assert result["n_success"] == 1
+    assert result["n_errors"] == 3
+    assert result["results"][0]["index"] == 0
+    assert result["results"][0]["predicted_price"] > 0
+    assert "property_type" in result["results"][1]["error"]
+    assert "year: Input should be greater than or equal to 1995" in (
+        result["results"][2]["error"]
+    )
+    assert result["results"][3]["error"].startswith("Invalid data: record: ")
+    assert "model_info" in result
+
+
+async def test_predict_batch_tree_budget(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test a tree budget is passed to the batch prediction."""
+    result = await PredictionController.predict_batch(
+        forecaster_trained, trained_executor, [sample_property_data], n_trees=2
+    )
+
+    assert result["model_info"]["n_trees"] == 2
+
+
+async def test_predict_batch_profiled(
+    forecaster_trained, trained_executor, sample_property_data, monkeypatch
+):
+    """Test a profiled batch collects validation and forecaster stages."""
+    monkeypatch.setattr(forecaster_trained, "stage_observer", record_stage)
+    profile = RequestProfile("predict-batch")
+    batcher = MicroBatcher(trained_executor, max_wait_ms=0)
+
+    await PredictionController.predict_batch(
+        forecaster_trained, trained_executor, [sample_property_data], None, profile
+    )
+    await PredictionController.predict_price(
+        forecaster_trained,
+        trained_executor,
+        sample_property_data,
+        batcher,
+        profile=profile,
+    )
+
+    assert set(profile.stages) == {
+        "request_validation",
+        "inference_wait",
+        "validation",
+        "encoding",
+        "forest",
+        "interval",
+    }
+    assert batcher.stats()["requests"] == 0
+
+
+async def test_predict_batch_model_not_loaded(
+    forecaster_unloaded, sample_property_data
+):
+    """Test batch prediction when model is not loaded."""
+    with pytest.raises(HTTPException) as exc_info:
+        await PredictionController.predict_batch(
+            forecaster_unloaded, InferenceExecutor(), [sample_property_data]
+        )
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+async def test_predict_batch_generic_error(sample_property_data):
+    """Test batch prediction with generic error."""
+    forecaster_mock = MagicMock()
+    forecaster_mock.is_loaded = True
+    forecaster_mock.predict_batch = MagicMock(side_effect=ValueError("Boom"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await PredictionController.predict_batch(
+            forecaster_mock, executor_for(forecaster_mock), [sample_property_data]
+        )
+
+    assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert "Prediction error" in exc_info.value.detail
+
+
+async def test_predict_batch_queue_full(forecaster_mock, sample_property_data):
+    """Test a full queue rejects the batch with 503."""
+    executor = InferenceExecutor()
+    executor.call = AsyncMock(side_effect=InferenceQueueFull("queue full"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await PredictionController.predict_batch(
+            forecaster_mock, executor, [sample_property_data]
+        )
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+async def _body(*chunks):
+    """Async request body from byte chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+def _ndjson(*records):
+    """NDJSON body bytes of records."""
+    import json
+
+    return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+async def _collect(stream):
+    """Collect streamed NDJSON text into parsed lines."""
+    import json
+
+    text = "".join([part async for part in stream])
+    return [json.loads(line) for line in text.splitlines()]
+
+
+async def test_predict_stream_scores_rows(
+    forecaster_trained, trained_executor, sample_property_data
+):
+    """Test streamed rows split across body chunks are scored in order."""
+    import json
+
+    text = "\n".join(
+        [
+            json.dumps(dict(sample_property_data, id="a")),
+            "not json",
+            json.dumps(dict(sample_property_data, property_type="X")),
+            json.dumps(sample_property_data),
+            json.dumps(dict(sample_property_data, id="b", year=1990)),
+            json.dumps({"id": "c", "year": 2020}),
+        ]
+    ).encode()
+    body = _body(b"\xef\xbb\xbf" + text[:10], text[10:50], text[50:])
+
+    stream = PredictionController.predict_stream(
+        forecaster_trained, trained_executor, body, "application/x-ndjson", 2
+    )
+    lines = await _collect(stream)
+
+    expected = forecaster_trained.predict(sample_property_data)
+    assert [line["row"] for line in lines] == [0, 1, 2, 3, 4, 5]
+    assert lines[0]["id"] == "a"
+    assert lines[0]["predicted_price"] == expected["predicted_price"]
+    assert "Invalid JSON" in lines[1]["error"]
+    # Rows are validated like /predict/batch records
+    assert lines[2]["error"].startswith("Invalid data: property_type: ")
+    assert lines[3]["confidence_interval"] == expected["confidence_interval"]
+    assert lines[4] == {
+        "row": 4,
+        "id": "b",
+        "error": "Invalid data: year: Input should be greater than or equal to 1995",
+    }
+    assert lines[5]["id"] == "c"
+    assert "postcode: Field required" in lines[5]["error"]
+    assert "predicted_price" not in lines[5]
+
+
+async def test_predict_stream_waits_when_queue_full(
+    forecaster_mock, sample_property_data
+):
+    """Test a full inference queue delays the chunk instead of failing."""
+    executor = InferenceExecutor()
+    executor.call = AsyncMock(
+        side_effect=[
+            InferenceQueueFull("queue full"),
+            {"results": [{"predicted_price": 1.0}]},
+        ]
+    )
+
+    stream = PredictionController.predict_stream(
+        forecaster_mock,
+        executor,
+        _body(_ndjson(sample_property_data)),
+        "application/json",
+        10,
+    )
+
+    assert await _collect(stream) == [{"row": 0, "predicted_price": 1.0}]
+    assert executor.call.await_count == 2
+
+
+async def test_predict_stream_error_in_band(forecaster_mock, sample_property_data):
+    """Test failures after streaming started are reported in the body."""
+    executor = InferenceExecutor()
+    executor.call = AsyncMock(side_effect=RuntimeError("Boom"))
+
+    stream = PredictionController.predict_stream(
+        forecaster_mock,
+        executor,
+        _body(_ndjson(sample_property_data)),
+        "application/x-ndjson",
+        10,
+    )
+
+    assert await _collect(stream) == [{"error": "Prediction error: Boom"}]
+
+
+def test_predict_stream_model_not_loaded(forecaster_unloaded):
+    """Test streaming when model is not loaded."""
+    with pytest.raises(HTTPException) as exc_info:
+        PredictionController.predict_stream(
+            forecaster_unloaded, InferenceExecutor(), _body(), "text/csv", 10
+        )
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+async def test_predict_stream_queue_timeout(forecaster_mock, sample_property_data):
+    """Test a queue that stays full ends the stream with an error line."""
+    from unittest.mock import patch
+
+    executor = InferenceExecutor()
+    executor.call = AsyncMock(side_effect=InferenceQueueFull("queue full"))
+
+    with patch("app.controllers.prediction_controller.STREAM_QUEUE_TIMEOUT", 0.1):
+        stream = PredictionController.predict_stream(
+            forecaster_mock,
+            executor,
+            _body(_ndjson(sample_property_data)),
+            "application/x-ndjson",
+            10,
+        )
+        lines = await _collect(stream)
+
+    assert len(lines) == 1
+    assert "still full" in lines[0]["error"]
+    assert executor.call.await_count > 1
+
+
+async def test_predict_stream_stops_on_disconnect(
+    forecaster_mock, sample_property_data
+):
+    """Test scoring stops once the client has gone away."""
+    executor = InferenceExecutor()
+    executor.call = AsyncMock(side_effect=InferenceQueueFull("queue full"))
+    disconnected = AsyncMock(side_effect=[False, True])
+
+    stream = PredictionController.predict_stream(
+        forecaster_mock,
+        executor,
+        _body(_ndjson(sample_property_data, sample_property_data)),
+        "application/x-ndjson",
+        1,
+        disconnected,
+    )
+
+    assert await _collect(stream) == []
+    assert executor.call.await_count == 1
+
+
+async def test_predict_stream_disconnected_before_last_chunk(
+    forecaster_mock, sample_property_data
+):
+    """Test the trailing chunk is skipped for a client that left."""
+    executor = InferenceExecutor()
+    executor.call = AsyncMock()
+
+    stream = PredictionController.predict_stream(
+        forecaster_mock,
+        executor,
+        _body(_ndjson(sample_property_data)),
+        "application/x-ndjson",
+        10,
+        AsyncMock(return_value=True),
+    )
+
+    assert await _collect(stream) == []
+    executor.call.assert_not_awaited()
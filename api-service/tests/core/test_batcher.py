@@ -0,0 +1,135 @@
+"""
+Unit tests for the micro-batcher.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.batcher import MicroBatcher
+
+
+class FakeExecutor:
+    """Records batches; predict_many doubles each record's value."""
+
+    def __init__(self, max_workers=1, error=None):
+        self.max_workers = max_workers
+        self.error = error
+        self.batches = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def call(self, method, records):
+        assert method == "predict_many"
+        self.batches.append([record["value"] for record in records])
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return [
+            ValueError("negative") if record["value"] < 0 else record["value"] * 2
+            for record in records
+        ]
+
+
+def test_invalid_arguments():
+    """Test sizes are validated."""
+    with pytest.raises(ValueError, match="max_batch_size"):
+        MicroBatcher(FakeExecutor(), max_batch_size=0)
+
+
+async def test_concurrent_requests_share_a_batch():
+    """Test requests within the window are evaluated together."""
+    executor = FakeExecutor()
+    batcher = MicroBatcher(executor, max_batch_size=10, max_wait_ms=5)
+
+    results = await asyncio.gather(*(batcher.predict({"value": i}) for i in range(4)))
+
+    assert results == [0, 2, 4, 6]
+    assert executor.batches == [[0, 1, 2, 3]]
+    assert batcher.stats() == {
+        "max_batch_size": 10,
+        "max_wait_ms": 5,
+        "batches": 1,
+        "requests": 4,
+        "mean_batch_size": 4.0,
+        "max_batch_seen": 4,
+    }
+
+
+async def test_full_batch_dispatched_immediately():
+    """Test a full batch does not wait for the window."""
+    executor = FakeExecutor(max_workers=2)
+    batcher = MicroBatcher(executor, max_batch_size=2, max_wait_ms=10_000)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.predict({"value": i}) for i in range(4))), 1
+    )
+
+    assert results == [0, 2, 4, 6]
+    assert executor.batches == [[0, 1], [2, 3]]
+
+
+async def test_per_request_errors():
+    """Test each caller gets its own result or exception."""
+    batcher = MicroBatcher(FakeExecutor(), max_wait_ms=0)
+
+    ok, failed = await asyncio.gather(
+        batcher.predict({"value": 1}),
+        batcher.predict({"value": -1}),
+        return_exceptions=True,
+    )
+
+    assert ok == 2
+    assert isinstance(failed, ValueError)
+
+
+async def test_executor_error_fails_whole_batch():
+    """Test an executor failure reaches every caller in the batch."""
+    batcher = MicroBatcher(FakeExecutor(error=RuntimeError("queue full")))
+
+    results = await asyncio.gather(
+        batcher.predict({"value": 1}),
+        batcher.predict({"value": 2}),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_batches_grow_while_workers_busy():
+    """Test requests accumulate until a worker frees up."""
+    executor = FakeExecutor(max_workers=1)
+    executor.release.clear()
+    batcher = MicroBatcher(executor, max_batch_size=3, max_wait_ms=1)
+
+    first = asyncio.ensure_future(batcher.predict({"value": 0}))
+    await asyncio.sleep(0.01)
+    waiting = [
+        asyncio.ensure_future(batcher.predict({"value": i})) for i in range(1, 6)
+    ]
+    await asyncio.sleep(0.01)
+
+    # Worker busy: 1-3 went out as a full batch, 4-5 wait for the window
+    # and then for the worker
+    assert executor.batches == [[0], [1, 2, 3]]
+
+    executor.release.set()
+    assert await first == 0
+    assert await asyncio.gather(*waiting) == [2, 4, 6, 8, 10]
+    assert executor.batches == [[0], [1, 2, 3], [4, 5]]
+
+
+async def test_cancelled_caller_is_skipped():
+    """Test a caller that went away does not break the batch."""
+    executor = FakeExecutor()
+    executor.release.clear()
+    batcher = MicroBatcher(executor, max_wait_ms=0)
+
+    cancelled = asyncio.ensure_future(batcher.predict({"value": 1}))
+    kept = asyncio.ensure_future(batcher.predict({"value": 2}))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    executor.release.set()
+    assert await kept == 4
+    assert cancelled.cancelled()
@@ -0,0 +1,80 @@
+"""
+Unit tests for application settings.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_settings_defaults(monkeypatch):
+    """Test default settings."""
+    monkeypatch.delenv("INFERENCE_ENGINE", raising=False)
+    monkeypatch.delenv("MODELS_DIR", raising=False)
+    monkeypatch.delenv("PREDICTION_CACHE_SIZE", raising=False)
+    monkeypatch.delenv("PREDICTION_TABLE", raising=False)
+    monkeypatch.delenv("MMAP_FOREST", raising=False)
+    monkeypatch.delenv("COMPACT_FOREST", raising=False)
+    monkeypatch.delenv("INFERENCE_EXECUTOR", raising=False)
+    monkeypatch.delenv("INFERENCE_WORKERS", raising=False)
+    monkeypatch.delenv("INFERENCE_QUEUE_SIZE", raising=False)
+    monkeypatch.delenv("MICRO_BATCHING", raising=False)
+    monkeypatch.delenv("MODEL_WATCH_INTERVAL", raising=False)
+    monkeypatch.delenv("METRICS", raising=False)
+    monkeypatch.delenv("REQUEST_PROFILING", raising=False)
+    monkeypatch.delenv("PROFILE_DIR", raising=False)
+    monkeypatch.delenv("INTERVAL_MODE", raising=False)
+    monkeypatch.delenv("MODEL_VERSIONS_DIR", raising=False)
+    monkeypatch.delenv("MODEL_VERSIONS_MEMORY_MB", raising=False)
+    monkeypatch.delenv("WARMUP_ROWS", raising=False)
+    monkeypatch.delenv("ADMIN_RELOAD_ENABLED", raising=False)
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    monkeypatch.delenv("WARMUP_LOCATIONS", raising=False)
+
+    settings = Settings()
+
+    assert settings.models_dir == "models"
+    assert settings.inference_engine == "native"
+    assert settings.prediction_cache_size == 10000
+    assert settings.prediction_table is False
+    assert settings.mmap_forest is False
+    assert settings.compact_forest is False
+    assert settings.inference_executor == "thread"
+    assert settings.inference_workers == 2
+    assert settings.inference_queue_size == 64
+    assert settings.micro_batching is False
+    assert settings.model_watch_interval == 0.0
+    assert settings.metrics is True
+    assert settings.request_profiling is False
+    assert settings.profile_dir == "profiles"
+    assert settings.interval_mode == "trees"
+    assert settings.model_versions_dir is None
+    assert settings.model_versions_memory_mb == 1024.0
+    assert settings.warmup_rows == 200
+    assert settings.warmup_locations == 20
+    assert settings.admin_reload_enabled is False
+    assert settings.admin_token is None
+
+
+def test_settings_from_env(monkeypatch):
+    """Test settings are read from the environment."""
+    monkeypatch.setenv("INFERENCE_ENGINE", "sklearn")
+
+    assert Settings().inference_engine == "sklearn"
+
+
+def test_settings_invalid_engine(monkeypatch):
+    """Test unknown engine is rejected."""
+    monkeypatch.setenv("INFERENCE_ENGINE", "gpu")
+
+    with pytest.raises(ValidationError):
+        Settings()
+
+
+def test_settings_invalid_inference_workers(monkeypatch):
+    """Test the inference pool needs at least one worker."""
+    monkeypatch.setenv("INFERENCE_WORKERS", "0")
+
+    with pytest.raises(ValidationError):
+        Settings()
@@ -0,0 +1,203 @@
+"""
+Unit tests for the inference executor.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.executor import InferenceExecutor, InferenceQueueFull, current_forecaster
+from app.core.profiling import RequestProfile, record_stage
+
+release = threading.Event()
+
+
+class Target:
+    """Stand-in forecaster."""
+
+    def predict(self, value):
+        return value * 2
+
+    def pid(self):
+        return os.getpid()
+
+    def fail(self):
+        raise ValueError("bad input")
+
+    def crash_once(self, marker):
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+        return "recovered"
+
+    def timed(self, value):
+        record_stage("forest", 0.25)
+        return value
+
+    def crash(self):
+        os._exit(1)
+
+    def block(self):
+        release.wait(timeout=5)
+        return "done"
+
+
+target = Target()
+
+
+def get_target():
+    """Module-level target getter (picklable for the process pool)."""
+    return target
+
+
+@pytest.fixture
+def executor():
+    """Thread executor with one worker and one queue slot."""
+    executor = InferenceExecutor(max_workers=1, max_queue=1, target=get_target)
+    yield executor
+    release.set()
+    executor.shutdown()
+    release.clear()
+
+
+def test_invalid_arguments():
+    """Test unknown kind and sizes are rejected."""
+    with pytest.raises(ValueError, match="Unknown executor"):
+        InferenceExecutor(kind="gpu")
+    with pytest.raises(ValueError, match="max_workers"):
+        InferenceExecutor(max_workers=0)
+
+
+def test_current_forecaster():
+    """Test the default target resolves the application forecaster."""
+    from app.core import forecaster
+
+    assert current_forecaster() is forecaster
+
+
+async def test_call_runs_in_pool(executor):
+    """Test calls run in a worker thread and are counted."""
+    assert await executor.call("predict", 21) == 42
+
+    stats = executor.stats()
+    assert stats["kind"] == "thread"
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["wait_ms_max"] >= 0
+
+
+async def test_call_with_target(executor):
+    """Test a per-call target replaces the executor's."""
+    other = Mock()
+    other.predict.return_value = "other"
+
+    assert await executor.call("predict", 21, target=lambda: other) == "other"
+    assert await executor.call("predict", 21) == 42
+
+
+async def test_call_propagates_errors(executor):
+    """Test exceptions raised in the pool reach the caller."""
+    with pytest.raises(ValueError, match="bad input"):
+        await executor.call("fail")
+
+    assert executor.in_flight == 0
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_call_profiled(kind):
+    """Test a profiled call reports its stages and wait from the pool."""
+    executor = InferenceExecutor(kind=kind, max_workers=1, target=get_target)
+    profile = RequestProfile("predict")
+    try:
+        assert await executor.call("timed", 7, profile=profile) == 7
+    finally:
+        executor.shutdown()
+
+    assert profile.stages["forest"] == 0.25
+    assert profile.stages["inference_wait"] >= 0
+
+
+async def test_queue_full(executor):
+    """Test calls beyond workers + queue are rejected."""
+    running = asyncio.ensure_future(executor.call("block"))
+    queued = asyncio.ensure_future(executor.call("block"))
+    await asyncio.sleep(0.05)
+
+    assert executor.stats()["queue_depth"] == 1
+    with pytest.raises(InferenceQueueFull, match="queue full"):
+        await executor.call("predict", 1)
+
+    release.set()
+    assert await running == "done"
+    assert await queued == "done"
+
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["wait_ms_avg"] > 0
+
+
+async def test_process_pool():
+    """Test the process pool runs calls in forked workers."""
+    executor = InferenceExecutor(kind="process", max_workers=1, target=get_target)
+    executor.start()
+    executor.start()  # idempotent
+    try:
+        assert await executor.call("predict", 2) == 4
+        assert await executor.call("pid") != os.getpid()
+    finally:
+        executor.shutdown()
+
+
+async def test_process_pool_recovers_from_dead_worker(tmp_path):
+    """Test a call interrupted by a dying worker is retried on a new pool."""
+    executor = InferenceExecutor(kind="process", max_workers=1, target=get_target)
+    try:
+        assert await executor.call("crash_once", str(tmp_path / "crashed")) == (
+            "recovered"
+        )
+        assert executor.stats()["pool_restarts"] == 1
+        assert executor.in_flight == 0
+    finally:
+        executor.shutdown()
+
+
+async def test_process_pool_gives_up_after_retry():
+    """Test a call that kills the fresh pool too fails, leaving a usable pool."""
+    executor = InferenceExecutor(kind="process", max_workers=1, target=get_target)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            await executor.call("crash")
+
+        assert executor.pool_restarts == 2
+        assert await executor.call("predict", 3) == 6
+    finally:
+        executor.shutdown()
+
+
+async def test_restart_process_pool():
+    """Test restart forks a new pool and lets the old one finish."""
+    executor = InferenceExecutor(kind="process", max_workers=1, target=get_target)
+    try:
+        executor.restart()  # not started: nothing to replace
+        assert executor._pool is None
+
+        first_pid = await executor.call("pid")
+        executor.restart()
+        assert await executor.call("pid") != first_pid
+    finally:
+        executor.shutdown()
+
+
+def test_restart_thread_pool(executor):
+    """Test thread pools are kept (the target is resolved per call)."""
+    executor.start()
+    pool = executor._pool
+
+    executor.restart()
+
+    assert executor._pool is pool
@@ -6,28 +6,65 @@ from unittest.mock import patch
 
 import pytest
 
-from app.core.lifecycle import forecaster, shutdown_event, startup_event
+from app import core
+from app.core import lifecycle
+from app.core.loader import ModelLoader
+from app.core.lifecycle import (
+    forecaster,
+    get_forecaster,
+    install_forecaster,
+    shutdown_event,
+    startup_event,
+)
+
+
+@pytest.fixture
+def model_loader(monkeypatch):
+    """Fresh background loader wired like the application's."""
+    loader = ModelLoader(get_forecaster, on_ready=lifecycle._on_model_ready)
+    monkeypatch.setattr(lifecycle, "model_loader", loader)
+    with patch("app.core.loader.validate_forecaster"), patch.object(
+        lifecycle.inference_executor, "start"
+    ), patch.object(forecaster, "get_model_info", return_value={"loaded": True}):
+        yield loader
 
 
 @pytest.mark.asyncio
-async def test_startup_event_success():
-    """Test successful startup event."""
+async def test_startup_event_success(model_loader):
+    """Test the model is loaded in the background after startup."""
     with patch.object(forecaster, "load") as mock_load:
-        with patch.object(
-            forecaster,
-            "get_model_info",
-            return_value={"loaded": True, "model_type": "RandomForest"},
-        ):
-            await startup_event()
-            mock_load.assert_called_once()
+        await startup_event()
+        assert model_loader.status == "loading"  # startup did not wait
+
+        await model_loader.wait()
+        mock_load.assert_called_once()
+
+    assert model_loader.status == "ready"
+    lifecycle.inference_executor.start.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_startup_event_failure():
-    """Test startup event when model loading fails."""
+async def test_startup_event_failure(model_loader):
+    """Test a failed load is recorded instead of stopping startup."""
     with patch.object(forecaster, "load", side_effect=Exception("Model not found")):
-        with pytest.raises(Exception, match="Model not found"):
+        await startup_event()
+        await model_loader.wait()
+
+    assert model_loader.status == "failed"
+    assert model_loader.error == "Model not found"
+    lifecycle.inference_executor.start.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_startup_event_preloaded(model_loader):
+    """Test startup skips loading when the model was preloaded."""
+    with patch.object(forecaster, "is_loaded", True):
+        with patch.object(forecaster, "load") as mock_load:
             await startup_event()
+            await model_loader.wait()
+            mock_load.assert_not_called()
+
+    assert model_loader.status == "ready"
 
 
 @pytest.mark.asyncio
@@ -42,3 +79,29 @@ def test_forecaster_initialization():
     """Test forecaster is initialized with correct models directory."""
     assert forecaster is not None
     assert str(forecaster.models_dir) == "models"
+
+
+def test_install_forecaster():
+    """Test a reloaded forecaster replaces the one routers look up."""
+    original = get_forecaster()
+    replacement = lifecycle.create_forecaster()
+    try:
+        install_forecaster(replacement)
+
+        assert core.forecaster is replacement
+        assert get_forecaster() is replacement
+    finally:
+        install_forecaster(original)
+    assert core.forecaster is forecaster
+
+
+@pytest.mark.asyncio
+async def test_startup_event_starts_watcher(model_loader):
+    """Test the artifact watcher is started and stopped with the app."""
+    with patch.object(forecaster, "is_loaded", True):
+        with patch.object(lifecycle.model_reloader, "watch_interval", 60):
+            await startup_event()
+            await model_loader.wait()
+            assert lifecycle.model_reloader._watch_task is not None
+            await shutdown_event()
+            assert lifecycle.model_reloader._watch_task is None
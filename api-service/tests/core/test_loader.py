@@ -0,0 +1,104 @@
+"""
+Unit tests for background model loading.
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from app.core.loader import ModelLoader
+from app.models import SalesForecaster
+
+
+async def test_load_and_warm(models_dir):
+    """Test the model is loaded, warmed and reported ready."""
+    forecaster = SalesForecaster(models_dir=str(models_dir))
+    on_ready = MagicMock()
+    loader = ModelLoader(lambda: forecaster, on_ready=on_ready)
+    assert loader.is_ready is False
+
+    loader.start()
+    loader.start()  # once
+    await loader.wait()
+
+    assert loader.is_ready is True
+    on_ready.assert_called_once()
+    stats = loader.stats()
+    assert stats["status"] == "ready"
+    assert stats["model_loaded"] is True
+    assert stats["load_seconds"] > 0
+    assert "final_model.joblib" in stats["load_timings"]
+    assert stats["error"] is None
+
+
+async def test_load_warms_up_before_ready(forecaster_trained):
+    """Test the warm-up runs on the loaded model and its time is reported."""
+    warmup = MagicMock(return_value=0.25)
+    loader = ModelLoader(lambda: forecaster_trained, warmup=warmup)
+
+    loader.start()
+    await loader.wait()
+
+    warmup.assert_called_once_with(forecaster_trained)
+    assert loader.is_ready is True
+    assert loader.stats()["warmup_seconds"] == 0.25
+
+
+async def test_warmup_failure(forecaster_trained):
+    """Test a model failing its warm-up is not ready."""
+    loader = ModelLoader(
+        lambda: forecaster_trained, warmup=MagicMock(side_effect=ValueError("cold"))
+    )
+
+    loader.start()
+    await loader.wait()
+
+    assert loader.status == "failed"
+    assert loader.error == "cold"
+    assert loader.stats()["warmup_seconds"] is None
+
+
+async def test_load_failure(tmp_path):
+    """Test a missing artifact marks the load failed."""
+    loader = ModelLoader(lambda: SalesForecaster(models_dir=str(tmp_path)))
+
+    loader.start()
+    await loader.wait()
+
+    assert loader.status == "failed"
+    assert loader.is_ready is False
+    assert "final_model.joblib" in loader.stats()["error"]
+    assert loader.stats()["load_timings"] is None
+
+
+async def test_warm_up_failure(forecaster_trained):
+    """Test a model failing its test predictions is not ready."""
+    loader = ModelLoader(lambda: forecaster_trained)
+
+    with patch(
+        "app.core.loader.validate_forecaster", side_effect=RuntimeError("bad")
+    ):
+        loader.start()
+        await loader.wait()
+
+    assert loader.status == "failed"
+    assert loader.error == "bad"
+
+
+async def test_stop_cancels_pending_load():
+    """Test stop cancels a load that has not finished."""
+    release = threading.Event()
+    forecaster = MagicMock(is_loaded=False)
+    forecaster.load.side_effect = lambda: release.wait(5)
+    loader = ModelLoader(lambda: forecaster)
+
+    await loader.wait()  # not started: returns
+    loader.start()
+    await asyncio.sleep(0.01)
+    loader.stop()
+    release.set()
+
+    await asyncio.sleep(0.01)
+    assert loader._task.cancelled()
+    assert loader.status == "loading"
+    loader.stop()  # done: no-op
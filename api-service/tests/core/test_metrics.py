@@ -0,0 +1,98 @@
+"""
+Unit tests for Prometheus metrics.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.metrics import (
+    STAGE_LATENCY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    observe_stage,
+)
+
+
+def test_counter_render():
+    """Test counters render one sample per label values."""
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc(("/a",))
+    counter.inc(("/a",), 2)
+    counter.inc(('say "hi"',))
+
+    lines = counter.render()
+
+    assert lines[:2] == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+    ]
+    assert 'requests_total{route="/a"} 3' in lines
+    assert 'requests_total{route="say \\"hi\\""} 1' in lines
+
+
+def test_gauge_set_and_clear():
+    """Test gauges can be set, changed and cleared."""
+    gauge = Gauge("in_flight", "In flight.")
+    gauge.inc()
+    gauge.inc(amount=-1)
+    gauge.set(0.25)
+
+    assert gauge.render()[-1] == "in_flight 0.25"
+    gauge.clear()
+    assert gauge.render() == ["# HELP in_flight In flight.", "# TYPE in_flight gauge"]
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test bucket counts are cumulative and le is inclusive."""
+    histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 2.65" in lines
+    assert "latency_seconds_count 4" in lines
+    assert histogram.count() == 4
+
+
+def test_registry_rejects_duplicates():
+    """Test a metric name can only be registered once."""
+    registry = MetricsRegistry()
+    registry.register(Counter("a_total", "A."))
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(Gauge("a_total", "A."))
+    assert registry.render().endswith("\n")
+
+
+def test_observe_stage():
+    """Test stage observations land in the stage histogram."""
+    before = STAGE_LATENCY.count(("encoding",))
+
+    observe_stage("encoding", 0.001)
+
+    assert STAGE_LATENCY.count(("encoding",)) == before + 1
+
+
+def test_middleware_records_failed_request():
+    """Test a request raising before responding is counted as a 500."""
+    from app.core.metrics import REQUESTS
+
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    middleware = MetricsMiddleware(failing_app)
+    scope = {"type": "http", "method": "GET", "path": "/x"}
+    before = REQUESTS.value(("GET", "unmatched", "500"))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(middleware(scope, None, None))
+
+    assert REQUESTS.value(("GET", "unmatched", "500")) == before + 1
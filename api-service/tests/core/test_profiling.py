@@ -0,0 +1,104 @@
+"""
+Unit tests for on-demand request profiling.
+"""
+
+import pstats
+
+import pytest
+
+from app.core import settings
+from app.core.profiling import (
+    RequestProfile,
+    profiled_call,
+    record_stage,
+    start_profile,
+)
+
+
+class Target:
+    """Stand-in forecaster reporting two stages."""
+
+    def predict(self, value):
+        record_stage("encoding", 0.001)
+        record_stage("forest", 0.002)
+        record_stage("forest", 0.003)
+        return value * 2
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch, tmp_path):
+    """Enable request profiling with dumps under tmp_path."""
+    monkeypatch.setattr(settings, "request_profiling", True)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    return tmp_path
+
+
+def test_start_profile_disabled(monkeypatch):
+    """Test requests are not profiled unless enabled and asked for."""
+    monkeypatch.setattr(settings, "request_profiling", False)
+    assert start_profile("predict", "1") is None
+
+    monkeypatch.setattr(settings, "request_profiling", True)
+    assert start_profile("predict", None) is None
+
+
+def test_start_profile(profiling_enabled):
+    """Test only 'cprofile' requests get a dump path."""
+    assert start_profile("predict", "1").dump_path is None
+
+    profile = start_profile("predict", "cprofile")
+    assert profile.dump_path.parent == profiling_enabled
+    assert profile.dump_path.name.startswith("predict-")
+
+
+def test_profiled_call_collects_stages():
+    """Test stages reported inside a profiled call are returned summed."""
+    result, stages, dumped = profiled_call(Target, "predict", (21,))
+
+    assert result == 42
+    assert stages == pytest.approx({"encoding": 0.001, "forest": 0.005})
+    assert dumped is False
+
+    # Outside a profiled call nothing is collected
+    record_stage("encoding", 1.0)
+
+
+def test_profiled_call_dumps_cprofile(tmp_path):
+    """Test a dump path gets a loadable cProfile dump."""
+    path = tmp_path / "nested" / "call.prof"
+
+    _, _, dumped = profiled_call(Target, "predict", (1,), path)
+
+    assert dumped is True
+    functions = [name for _, _, name in pstats.Stats(str(path)).stats]
+    assert "predict" in functions
+
+
+def test_server_timing_header():
+    """Test stages render as Server-Timing metrics in milliseconds."""
+    profile = RequestProfile("predict")
+    profile.merge({"encoding": 0.0012, "forest": 0.5})
+    with profile.stage("serialization"):
+        pass
+
+    headers = {}
+    profile.apply(headers)
+
+    timing = headers["Server-Timing"]
+    assert timing.startswith("encoding;dur=1.200, forest;dur=500.000, ")
+    assert "serialization;dur=" in timing
+    assert "total;dur=" in timing
+    assert "X-Profile-Dump" not in headers
+
+
+def test_stage_dumps_cprofile(tmp_path):
+    """Test an inline stage is cProfiled and the dump named in the headers."""
+    profile = RequestProfile("model-info", tmp_path / "info.prof")
+    with profile.stage("model_info"):
+        sum(range(10))
+
+    headers = {}
+    profile.apply(headers)
+
+    assert (tmp_path / "info.prof").exists()
+    assert headers["X-Profile-Dump"] == "info.prof"
@@ -0,0 +1,205 @@
+"""
+Unit tests for the model version registry.
+"""
+
+import asyncio
+import joblib
+import pytest
+
+from app.core.executor import InferenceExecutor
+from app.core.registry import ModelRegistry, UnknownModelVersion
+from app.models import SalesForecaster
+
+
+def write_version(versions_dir, version, artifacts):
+    """Write an artifact set whose trained_date is the version name."""
+    path = versions_dir / version
+    path.mkdir(parents=True)
+    joblib.dump(artifacts["model"], path / SalesForecaster.MODEL_FILE)
+    joblib.dump(artifacts["label_encoders"], path / SalesForecaster.LABEL_ENCODERS_FILE)
+    joblib.dump(
+        artifacts["target_encodings"], path / SalesForecaster.TARGET_ENCODINGS_FILE
+    )
+    joblib.dump(
+        dict(artifacts["metadata"], trained_date=version),
+        path / SalesForecaster.METADATA_FILE,
+    )
+    return path
+
+
+@pytest.fixture
+def versions_dir(tmp_path, trained_artifacts):
+    """Three complete versions and an incomplete one."""
+    for version in ("2022", "2023", "candidate"):
+        write_version(tmp_path, version, trained_artifacts)
+    (tmp_path / "partial").mkdir()
+    joblib.dump({}, tmp_path / "partial" / SalesForecaster.METADATA_FILE)
+    return tmp_path
+
+
+@pytest.fixture
+def version_bytes(forecaster_trained):
+    """Estimated memory of one loaded version."""
+    return forecaster_trained.memory_bytes()
+
+
+def make_registry(versions_dir, max_memory_mb=1024.0, **options):
+    """Registry creating forecasters for the versions directory (sklearn)."""
+    return ModelRegistry(
+        lambda models_dir: SalesForecaster(models_dir=models_dir, **options),
+        str(versions_dir),
+        max_memory_mb=max_memory_mb,
+    )
+
+
+def test_available(versions_dir, tmp_path):
+    """Test only complete artifact sets are versions."""
+    assert make_registry(versions_dir).available() == ["2022", "2023", "candidate"]
+    assert make_registry(tmp_path / "missing").available() == []
+
+
+async def test_get_loads_on_first_use(versions_dir):
+    """Test a version is loaded once and then served from the registry."""
+    registry = make_registry(versions_dir)
+    assert registry.stats()["loaded"] == []
+
+    forecaster = await registry.get("2023")
+
+    assert forecaster.is_loaded
+    assert forecaster.metadata["trained_date"] == "2023"
+    assert await registry.get("2023") is forecaster
+    stats = registry.stats()
+    assert stats["loads"] == 1
+    assert [entry["version"] for entry in stats["loaded"]] == ["2023"]
+    assert stats["loaded"][0]["requests"] == 2
+    assert stats["loaded"][0]["memory_mb"] > 0
+
+
+async def test_get_unknown_version(versions_dir):
+    """Test versions without a complete artifact set are rejected."""
+    registry = make_registry(versions_dir)
+
+    for version in ("2021", "partial", "../2023"):
+        with pytest.raises(UnknownModelVersion):
+            await registry.get(version)
+    assert registry.loads == 0
+
+
+async def test_concurrent_requests_share_load(versions_dir):
+    """Test requests for a version being loaded wait for the same load."""
+    registry = make_registry(versions_dir)
+
+    first, second = await asyncio.gather(
+        registry.get("candidate"), registry.get("candidate")
+    )
+
+    assert first is second
+    assert registry.loads == 1
+
+
+async def test_lru_eviction(versions_dir, version_bytes):
+    """Test the least recently used version is evicted over the budget."""
+    registry = make_registry(versions_dir, max_memory_mb=2.5 * version_bytes / 2**20)
+
+    await registry.get("2022")
+    await registry.get("2023")
+    await registry.get("2022")  # 2023 is now the least recently used
+    await registry.get("candidate")
+
+    stats = registry.stats()
+    assert [entry["version"] for entry in stats["loaded"]] == ["candidate", "2022"]
+    assert stats["evictions"] == 1
+    assert stats["memory_mb"] <= stats["max_memory_mb"]
+
+
+async def test_version_over_budget_kept(versions_dir):
+    """Test the requested version stays loaded even alone over the budget."""
+    registry = make_registry(versions_dir, max_memory_mb=0)
+
+    await registry.get("2022")
+    forecaster = await registry.get("2023")
+
+    assert [entry["version"] for entry in registry.stats()["loaded"]] == ["2023"]
+    assert await registry.get("2023") is forecaster
+
+
+async def test_load_failure(versions_dir):
+    """Test a version failing to load is not kept."""
+    registry = make_registry(versions_dir)
+    joblib.dump(
+        {"bad": True}, versions_dir / "2022" / SalesForecaster.TARGET_ENCODINGS_FILE
+    )
+
+    with pytest.raises(KeyError):
+        await registry.get("2022")
+
+    assert registry.stats()["loaded"] == []
+    assert not registry._loading
+
+
+async def test_mapped_versions_count_toward_budget(versions_dir):
+    """Test memory-mapped forests are counted, so the budget still evicts."""
+    registry = make_registry(versions_dir, engine="native", mmap_forest=True)
+    forecaster = await registry.get("2022")
+    mapped_bytes = forecaster.memory_bytes(mapped=True)
+    assert forecaster.memory_bytes() < mapped_bytes
+
+    registry = make_registry(
+        versions_dir,
+        max_memory_mb=1.5 * mapped_bytes / 2**20,
+        engine="native",
+        mmap_forest=True,
+    )
+    await registry.get("2022")
+    await registry.get("2023")
+
+    stats = registry.stats()
+    assert [entry["version"] for entry in stats["loaded"]] == ["2023"]
+    assert stats["loaded"][0]["memory_mb"] == round(mapped_bytes / 2**20, 2)
+    assert stats["evictions"] == 1
+
+
+def test_resolve_loads_missing_version(versions_dir):
+    """Test inference workers load a version they do not hold."""
+    registry = make_registry(versions_dir)
+
+    forecaster = registry.resolve("2023")
+
+    assert forecaster.metadata["trained_date"] == "2023"
+    assert registry.resolve("2023") is forecaster
+
+
+def test_target_resolves_application_registry(versions_dir, monkeypatch):
+    """Test the executor target resolves the version on app.core's registry."""
+    from app import core
+
+    registry = make_registry(versions_dir)
+    monkeypatch.setattr(core, "model_registry", registry)
+
+    forecaster = registry.target("candidate")()
+
+    assert forecaster is registry.resolve("candidate")
+
+
+async def test_process_workers_serve_versions(
+    versions_dir, monkeypatch, sample_property_data
+):
+    """Test forked inference workers answer with the requested version."""
+    from app import core
+
+    executor = InferenceExecutor(kind="process", max_workers=1)
+    registry = make_registry(versions_dir)
+    monkeypatch.setattr(core, "model_registry", registry)
+    try:
+        executor.start()
+        pool = executor._pool
+        forecaster = await registry.get("2023")
+        # Forked before the load: the worker loads its own copy, no re-fork
+        result = await executor.call(
+            "predict", sample_property_data, target=registry.target("2023")
+        )
+        assert executor._pool is pool
+    finally:
+        executor.shutdown()
+
+    assert result == forecaster.predict(sample_property_data)
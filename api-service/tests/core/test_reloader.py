@@ -0,0 +1,231 @@
+"""
+Unit tests for hot model reload.
+"""
+
+import asyncio
+import os
+
+import joblib
+import pytest
+
+from app.core.executor import InferenceExecutor
+from app.core.reloader import ModelReloader, ReloadInProgress, validate_forecaster
+from app.models import SalesForecaster
+
+
+class Serving:
+    """Holds the serving forecaster, like app.core does."""
+
+    def __init__(self, forecaster):
+        self.forecaster = forecaster
+
+    def get(self):
+        return self.forecaster
+
+    def install(self, forecaster):
+        self.forecaster = forecaster
+
+
+@pytest.fixture
+def serving(forecaster_trained):
+    """Serving slot holding the trained forecaster."""
+    return Serving(forecaster_trained)
+
+
+@pytest.fixture
+def reloader(models_dir, serving):
+    """Reloader creating forecasters for the synthetic models directory."""
+    return ModelReloader(
+        lambda: SalesForecaster(models_dir=str(models_dir)),
+        serving.get,
+        serving.install,
+    )
+
+
+def redeploy(models_dir, trained_date):
+    """Rewrite the metadata artifact as a new deploy would."""
+    path = models_dir / SalesForecaster.METADATA_FILE
+    metadata = joblib.load(path)
+    metadata["trained_date"] = trained_date
+    joblib.dump(metadata, path)
+    # Make the change visible even on coarse mtime filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_validate_forecaster(forecaster_trained):
+    """Test a working model passes validation."""
+    validate_forecaster(forecaster_trained)
+
+
+def test_validate_forecaster_rejects_failed_predictions(forecaster_trained):
+    """Test a test prediction returning an error is rejected."""
+    forecaster_trained.predict_batch = lambda records: {
+        "results": [{"error": "Invalid data: boom"} for _ in records]
+    }
+    with pytest.raises(RuntimeError, match="Test prediction failed"):
+        validate_forecaster(forecaster_trained)
+
+
+def test_validate_forecaster_rejects_invalid_price(forecaster_trained):
+    """Test a non-finite price is rejected."""
+    forecaster_trained.predict_batch = lambda records: {
+        "results": [
+            {"predicted_price": float("nan"), "confidence_interval": {}}
+            for _ in records
+        ]
+    }
+    with pytest.raises(RuntimeError, match="returned nan"):
+        validate_forecaster(forecaster_trained)
+
+
+async def test_reload_swaps_forecaster(reloader, serving, models_dir):
+    """Test a reload installs a newly loaded forecaster."""
+    previous = serving.forecaster
+    redeploy(models_dir, "2030-01-01")
+
+    result = await reloader.reload()
+
+    assert serving.forecaster is not previous
+    assert serving.forecaster.is_loaded
+    assert result["previous_trained_date"] != "2030-01-01"
+    assert result["trained_date"] == "2030-01-01"
+    assert result["pid"] == os.getpid()
+    assert reloader.reloads == 1
+
+
+async def test_reload_warms_up_before_swap(models_dir, serving):
+    """Test the new model is warmed up before it serves requests."""
+    warmed = []
+    reloader = ModelReloader(
+        lambda: SalesForecaster(models_dir=str(models_dir)),
+        serving.get,
+        serving.install,
+        warmup=lambda forecaster: warmed.append(serving.forecaster is forecaster),
+    )
+
+    await reloader.reload()
+
+    assert warmed == [False]
+
+
+async def test_reload_failure_keeps_current(reloader, serving, models_dir):
+    """Test artifacts that fail to load leave the current model serving."""
+    previous = serving.forecaster
+    (models_dir / SalesForecaster.MODEL_FILE).unlink()
+
+    with pytest.raises(FileNotFoundError):
+        await reloader.reload()
+
+    assert serving.forecaster is previous
+    assert reloader.reloads == 0
+
+
+async def test_reload_in_progress(reloader):
+    """Test a second concurrent reload is refused."""
+    first = asyncio.ensure_future(reloader.reload())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ReloadInProgress):
+        await reloader.reload()
+
+    await first
+
+
+async def test_reload_restarts_process_pool(models_dir, serving):
+    """Test process workers are forked again with the new model."""
+    executor = InferenceExecutor(kind="process", max_workers=1)
+    executor.start()
+    old_pool = executor._pool
+    reloader = ModelReloader(
+        lambda: SalesForecaster(models_dir=str(models_dir)),
+        serving.get,
+        serving.install,
+        executor=executor,
+    )
+    try:
+        await reloader.reload()
+        assert executor._pool is not old_pool
+    finally:
+        executor.shutdown()
+
+
+async def test_check_for_update_waits_for_stable_files(reloader, serving, models_dir):
+    """Test changed artifacts are reloaded once unchanged for a check."""
+    previous = serving.forecaster
+    stamp = await reloader.check_for_update(None)
+    assert serving.forecaster is previous  # nothing deployed
+
+    redeploy(models_dir, "2030-01-01")
+    stamp = await reloader.check_for_update(stamp)
+    assert serving.forecaster is previous  # changed: wait a round
+
+    await reloader.check_for_update(stamp)
+    assert serving.forecaster is not previous
+    assert serving.forecaster.metadata["trained_date"] == "2030-01-01"
+
+
+async def test_check_for_update_skips_failed_artifacts(reloader, serving, models_dir):
+    """Test artifacts that failed once are not retried until they change."""
+    previous = serving.forecaster
+    redeploy(models_dir, "2030-01-01")
+    joblib.dump({}, models_dir / SalesForecaster.LABEL_ENCODERS_FILE)
+
+    stamp = await reloader.check_for_update(None)
+    stamp = await reloader.check_for_update(stamp)  # fails, logged
+    reloader.reload = None  # a retry would fail loudly
+    await reloader.check_for_update(stamp)
+
+    assert serving.forecaster is previous
+
+
+async def test_check_for_update_during_reload(reloader, serving, models_dir):
+    """Test a change seen while a reload runs is left to that reload."""
+    previous = serving.forecaster
+    redeploy(models_dir, "2030-01-01")
+    stamp = await reloader.check_for_update(None)
+
+    async with reloader._lock:
+        await reloader.check_for_update(stamp)
+
+    assert serving.forecaster is previous
+
+
+async def test_check_for_update_ignores_missing_files(reloader, serving, models_dir):
+    """Test a deploy that removed an artifact is not loaded."""
+    previous = serving.forecaster
+    (models_dir / SalesForecaster.MODEL_FILE).unlink()
+
+    stamp = await reloader.check_for_update(None)
+    await reloader.check_for_update(stamp)
+
+    assert serving.forecaster is previous
+
+
+async def test_watch(models_dir, serving):
+    """Test the watcher reloads new artifacts in the background."""
+    reloader = ModelReloader(
+        lambda: SalesForecaster(models_dir=str(models_dir)),
+        serving.get,
+        serving.install,
+        watch_interval=0.01,
+    )
+    reloader.start_watching()
+    try:
+        redeploy(models_dir, "2030-01-01")
+        for _ in range(200):
+            if reloader.reloads:
+                break
+            await asyncio.sleep(0.01)
+        assert serving.forecaster.metadata["trained_date"] == "2030-01-01"
+    finally:
+        reloader.stop_watching()
+    assert reloader._watch_task is None
+
+
+def test_watch_disabled(reloader):
+    """Test no watcher runs without an interval."""
+    reloader.start_watching()
+    reloader.stop_watching()
+
+    assert reloader._watch_task is None
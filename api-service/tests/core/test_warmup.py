@@ -0,0 +1,108 @@
+"""
+Unit tests for model warm-up.
+"""
+
+import itertools
+from unittest.mock import MagicMock, patch
+
+from app.core.warmup import most_frequent, warm_up, warmup_records
+from app.models import SalesForecaster
+from app.models.prediction_cache import PredictionCache
+from app.models.prediction_table import PredictionTable
+
+
+def test_most_frequent():
+    """Test keys are ranked by training rows, without UNKNOWN."""
+    target_encodings = {
+        "county_map": {"KENT": 1.0, "ESSEX": 2.0, "SURREY": 3.0, "UNKNOWN": 0.0},
+        "county_counts": {"KENT": 5, "ESSEX": 50, "SURREY": 20, "UNKNOWN": 99},
+    }
+
+    assert most_frequent(target_encodings, "county", 2) == ["ESSEX", "SURREY"]
+
+
+def test_most_frequent_without_counts(mock_target_encodings):
+    """Test artifacts without counts keep the map order."""
+    assert most_frequent(mock_target_encodings, "postcode", 5) == ["SW1A", "SW1"]
+
+
+def test_warmup_records(forecaster_trained):
+    """Test records cover every label combination and location."""
+    records = warmup_records(forecaster_trained, n_rows=60, n_locations=10)
+
+    labels = {
+        (record["property_type"], record["old_new"], record["duration"])
+        for record in records
+    }
+    classes = [
+        forecaster_trained.label_encoders[field].classes_
+        for field in ("property_type", "old_new", "duration")
+    ]
+    assert labels == set(itertools.product(*classes))
+    target_encodings = forecaster_trained.target_encodings
+    assert {record["county"] for record in records} == set(
+        target_encodings["county_map"]
+    )
+    assert {record["postcode"].split()[0] for record in records} == set(
+        target_encodings["postcode_map"]
+    )
+    assert len({record["year"] for record in records}) == 5
+
+
+def test_warm_up(forecaster_trained):
+    """Test warm-up skips the cache and observer without detaching them."""
+    cache = PredictionCache(max_size=100)
+    observer = MagicMock()
+    forecaster_trained.cache = cache
+    forecaster_trained.stage_observer = observer
+
+    attached = []
+    predict_batch = SalesForecaster.predict_batch
+
+    def serving_batch(view, records):
+        # Requests served meanwhile still see the cache and observer
+        attached.append(
+            forecaster_trained.cache is cache
+            and forecaster_trained.stage_observer is observer
+        )
+        return predict_batch(view, records)
+
+    with patch.object(SalesForecaster, "predict_batch", serving_batch):
+        seconds = warm_up(forecaster_trained, n_rows=20)
+
+    assert attached == [True]
+
+    assert seconds > 0
+    assert forecaster_trained.load_timings["warmup"] == round(seconds, 4)
+    assert forecaster_trained.cache is cache
+    assert forecaster_trained.stage_observer is observer
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["misses"] == 0
+    observer.assert_not_called()
+
+
+def test_warm_up_leaves_table_stats(forecaster_trained, models_dir):
+    """Test warm-up lookups do not count as prediction table traffic."""
+    counties = list(forecaster_trained.target_encodings["county_map"])
+    regions = list(forecaster_trained.target_encodings["postcode_map"])
+    PredictionTable.build(
+        forecaster_trained,
+        [(county, region) for county in counties for region in regions],
+        models_dir,
+        years=(2020, 2030),
+    )
+    forecaster = SalesForecaster(models_dir=str(models_dir), use_prediction_table=True)
+    forecaster.load()
+    table = forecaster.prediction_table
+    before = table.stats()
+
+    warm_up(forecaster, n_rows=20)
+
+    assert forecaster.prediction_table is table
+    assert table.stats() == before
+
+
+def test_warm_up_disabled(forecaster_trained):
+    """Test zero rows skip the warm-up."""
+    assert warm_up(forecaster_trained, n_rows=0) == 0.0
+    assert "warmup" not in forecaster_trained.load_timings
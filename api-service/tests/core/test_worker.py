@@ -0,0 +1,38 @@
+"""
+Unit tests for worker process information.
+"""
+
+import os
+
+from app.core import worker
+from app.core.worker import get_worker_info
+
+
+def test_get_worker_info_proc(tmp_path, monkeypatch):
+    """Test memory is read from /proc status."""
+    status = tmp_path / "status"
+    status.write_text(
+        "Name:\tpython\nVmRSS:\t  204800 kB\nRssAnon:\t  102400 kB\n"
+        "RssFile:\t  102400 kB\n"
+    )
+    monkeypatch.setattr(worker, "PROC_STATUS", str(status))
+
+    info = get_worker_info()
+
+    assert info == {
+        "pid": os.getpid(),
+        "rss_mb": 200.0,
+        "rss_anon_mb": 100.0,
+        "rss_file_mb": 100.0,
+    }
+
+
+def test_get_worker_info_fallback(tmp_path, monkeypatch):
+    """Test peak RSS fallback without /proc."""
+    monkeypatch.setattr(worker, "PROC_STATUS", str(tmp_path / "missing"))
+
+    info = get_worker_info()
+
+    assert info["pid"] == os.getpid()
+    assert info["rss_mb"] > 0
+    assert info["rss_anon_mb"] is None
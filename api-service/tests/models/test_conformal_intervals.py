@@ -0,0 +1,139 @@
+"""
+Unit tests for ConformalIntervals.
+"""
+
+import numpy as np
+import pytest
+
+from app.models import ConformalIntervals
+from app.models.conformal_intervals import residual_quantiles
+
+
+@pytest.fixture
+def intervals():
+    """Intervals over residuals whose spread differs per segment."""
+    rng = np.random.default_rng(0)
+    residuals = np.concatenate(
+        [
+            rng.normal(0, 0.1, 200),  # T in SW: narrow
+            rng.normal(0, 0.5, 200),  # T in M: wide
+            rng.normal(0, 0.3, 10),  # F in SW: too few for a segment
+            rng.normal(0, 0.3, 50),  # F in M
+        ]
+    )
+    property_types = ["T"] * 400 + ["F"] * 60
+    outward_codes = ["SW1A"] * 150 + ["SW3"] * 50 + ["M14"] * 200
+    outward_codes += ["SW1"] * 10 + ["M1"] * 50
+    return ConformalIntervals.from_residuals(
+        residuals,
+        property_types,
+        outward_codes,
+        coverage=0.8,
+        min_segment_size=30,
+        trained_date="2024-01-15T00:00:00",
+    )
+
+
+def test_residual_quantiles():
+    """Test bounds are the finite-sample conformal order statistics."""
+    residuals = np.arange(1, 100, dtype=float)
+
+    lower, upper, n = residual_quantiles(residuals, 0.8)
+
+    # floor(100 * 0.1) = 10th and ceil(100 * 0.9) = 90th smallest
+    assert (lower, upper, n) == (10.0, 90.0, 99)
+
+
+def test_residual_quantiles_small_sample():
+    """Test bounds are clipped to the observed residuals."""
+    assert residual_quantiles(np.array([-1.0, 2.0]), 0.9) == (-1.0, 2.0, 2)
+
+
+def test_segments(intervals):
+    """Test segments and property types with enough residuals are kept."""
+    assert set(intervals.index["segments"]) == {("T", "SW"), ("T", "M"), ("F", "M")}
+    assert set(intervals.index["property_types"]) == {"T", "F"}
+    assert intervals.index["segments"][("T", "SW")][2] == 200
+    assert intervals.stats() == {
+        "coverage": 0.8,
+        "segments": 3,
+        "property_types": 2,
+        "min_segment_size": 30,
+    }
+
+
+def test_offsets_per_segment(intervals):
+    """Test each row gets its segment's quantiles, narrow or wide."""
+    lower, upper = intervals.offsets(["T", "T"], ["SW7", "M20"])
+
+    narrow = intervals.index["segments"][("T", "SW")]
+    wide = intervals.index["segments"][("T", "M")]
+    assert (lower[0], upper[0]) == narrow[:2]
+    assert (lower[1], upper[1]) == wide[:2]
+    assert upper[1] - lower[1] > 3 * (upper[0] - lower[0])
+
+
+def test_offsets_fallbacks(intervals):
+    """Test sparse segments use the property type, then all residuals."""
+    offsets = intervals.offsets(["F", "X"], ["SW1A", "M1"])
+
+    np.testing.assert_array_equal(
+        offsets[:, 0], intervals.index["property_types"]["F"][:2]
+    )
+    np.testing.assert_array_equal(offsets[:, 1], intervals.index["overall"][:2])
+
+
+def test_offsets_empty(intervals):
+    """Test no rows give an empty (2, 0) array."""
+    assert intervals.offsets([], []).shape == (2, 0)
+
+
+def test_coverage_on_new_residuals(intervals):
+    """Test new residuals from the same distribution are covered."""
+    rng = np.random.default_rng(1)
+    residuals = rng.normal(0, 0.5, 5000)
+
+    lower, upper = intervals.offsets(["T"] * 5000, ["M1"] * 5000)
+
+    assert np.mean((residuals >= lower) & (residuals <= upper)) == pytest.approx(
+        0.8, abs=0.05
+    )
+
+
+@pytest.mark.parametrize("coverage", [0.0, 1.0, 1.5])
+def test_invalid_coverage(coverage):
+    """Test coverage outside (0, 1) is rejected."""
+    with pytest.raises(ValueError, match="Coverage"):
+        ConformalIntervals.from_residuals([0.1], ["T"], ["SW1"], coverage=coverage)
+
+
+def test_no_residuals():
+    """Test calibrating without residuals is rejected."""
+    with pytest.raises(ValueError, match="No residuals"):
+        ConformalIntervals.from_residuals([], [], [])
+
+
+def test_save_load_roundtrip(intervals, tmp_path):
+    """Test the written file loads back the same intervals."""
+    path = intervals.save(tmp_path)
+    loaded = ConformalIntervals.load(tmp_path)
+
+    assert path.name == ConformalIntervals.INTERVALS_FILE
+    np.testing.assert_array_equal(
+        loaded.offsets(["T", "F"], ["SW1", "M1"]),
+        intervals.offsets(["T", "F"], ["SW1", "M1"]),
+    )
+
+
+def test_load_missing(tmp_path):
+    """Test loading a directory without the file raises."""
+    with pytest.raises(FileNotFoundError):
+        ConformalIntervals.load(tmp_path)
+
+
+def test_matches(intervals, forecaster_trained):
+    """Test intervals are tied to the model's trained date."""
+    assert intervals.matches(forecaster_trained)
+
+    forecaster_trained.metadata = dict(forecaster_trained.metadata, trained_date="x")
+    assert not intervals.matches(forecaster_trained)
@@ -0,0 +1,195 @@
+"""
+Unit tests for FlatForest.
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from app.models.flat_forest import FlatForest
+
+
+@pytest.fixture(scope="module")
+def forest_data():
+    """Fit a small forest on data with large and repeated feature values."""
+    rng = np.random.default_rng(0)
+    X = np.column_stack(
+        [
+            rng.integers(0, 5, 400),
+            rng.choice([450000.123, 300000.7, 200000.0 / 3], 400),
+            rng.normal(300000, 50000, 400),
+            rng.integers(0, 2, 400),
+            rng.integers(0, 3, 400),
+            rng.integers(1995, 2025, 400),
+        ]
+    ).astype(float)
+    y = rng.normal(12, 0.5, 400)
+    model = RandomForestRegressor(n_estimators=8, random_state=0).fit(X, y)
+    return model, X
+
+
+def test_from_sklearn_layout(forest_data):
+    """Test flattened arrays cover all nodes of all trees."""
+    model, _ = forest_data
+    flat = FlatForest.from_sklearn(model)
+
+    assert flat.n_trees == 8
+    assert flat.n_nodes == sum(tree.tree_.node_count for tree in model.estimators_)
+    assert flat.max_depth == max(tree.tree_.max_depth for tree in model.estimators_)
+    assert flat.roots[0] == 0
+    assert flat.is_leaf.sum() == sum(tree.tree_.n_leaves for tree in model.estimators_)
+
+
+def test_predict_trees_matches_sklearn(forest_data):
+    """Test per-tree predictions are identical to sklearn."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+
+    expected = np.stack([tree.predict(X) for tree in model.estimators_])
+
+    np.testing.assert_array_equal(flat.predict_trees(X), expected)
+
+
+def test_predict_matches_sklearn(forest_data):
+    """Test forest mean matches sklearn predict."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+
+    mean, matrix = flat.predict(X[:5])
+
+    assert matrix.shape == (8, 5)
+    np.testing.assert_allclose(mean, model.predict(X[:5]), rtol=0, atol=1e-12)
+
+
+def test_apply_returns_leaves(forest_data):
+    """Test apply lands every row on a leaf."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+
+    leaves = flat.apply(X[:3])
+
+    assert leaves.shape == (8, 3)
+    assert flat.is_leaf[leaves].all()
+
+
+def test_predict_tree_budget(forest_data):
+    """Test a budget evaluates only the leading trees."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+
+    mean, matrix = flat.predict(X[:5], n_trees=3)
+
+    expected = np.stack([tree.predict(X[:5]) for tree in model.estimators_[:3]])
+    np.testing.assert_array_equal(matrix, expected)
+    np.testing.assert_array_equal(mean, expected.mean(axis=0))
+
+
+def test_single_node_tree():
+    """Test a forest whose trees are a single leaf."""
+    X = np.zeros((10, 2))
+    model = RandomForestRegressor(n_estimators=2, random_state=0).fit(X, np.ones(10))
+
+    flat = FlatForest.from_sklearn(model)
+    mean, _ = flat.predict(np.array([[1.0, 2.0]]))
+
+    assert flat.max_depth == 0
+    assert mean[0] == pytest.approx(1.0)
+
+
+def test_save_load_mmap(forest_data, tmp_path):
+    """Test saved arrays are memory-mapped on load."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+    flat.save(tmp_path / "forest", {"trained_date": "2024-01-15"})
+
+    loaded, index = FlatForest.load(tmp_path / "forest")
+
+    assert index == {"max_depth": flat.max_depth, "trained_date": "2024-01-15"}
+    assert isinstance(loaded.threshold, np.memmap)
+    assert not list((tmp_path / "forest").glob("*.tmp"))
+    np.testing.assert_array_equal(loaded.predict_trees(X), flat.predict_trees(X))
+
+
+def test_load_in_memory(forest_data, tmp_path):
+    """Test loading without memory mapping."""
+    model, _ = forest_data
+    FlatForest.from_sklearn(model).save(tmp_path, {})
+
+    loaded, _ = FlatForest.load(tmp_path, mmap_mode=None)
+
+    assert not isinstance(loaded.value, np.memmap)
+
+
+def test_load_missing(tmp_path):
+    """Test loading from an empty directory."""
+    with pytest.raises(FileNotFoundError):
+        FlatForest.load(tmp_path)
+
+
+def test_quantize_keeps_leaves(forest_data):
+    """Test compact dtypes reach the same leaves as the float64 forest."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+
+    compact = flat.quantize()
+
+    assert compact.threshold.dtype == np.float32
+    assert compact.value.dtype == np.float32
+    assert compact.feature.dtype == np.uint8
+    assert compact.left.dtype == np.int32
+    np.testing.assert_array_equal(compact.apply(X), flat.apply(X))
+    np.testing.assert_allclose(compact.predict(X)[0], flat.predict(X)[0], rtol=1e-6)
+
+
+def test_save_load_compact(forest_data, tmp_path):
+    """Test the compact file round-trips features, metadata and predictions."""
+    model, X = forest_data
+    flat = FlatForest.from_sklearn(model)
+    path = tmp_path / "forest.bin"
+    features = ["a", "b", "c", "d", "e", "f"]
+
+    flat.save_compact(path, features, {"trained_date": "2024-01-15"})
+    loaded, loaded_features, metadata = FlatForest.load_compact(path)
+
+    assert loaded_features == features
+    assert metadata == {"trained_date": "2024-01-15"}
+    assert loaded.max_depth == flat.max_depth
+    assert loaded.nbytes < flat.nbytes / 2
+    assert path.stat().st_size < flat.nbytes / 2
+    assert not list(tmp_path.glob("*.tmp"))
+    np.testing.assert_array_equal(loaded.apply(X), flat.apply(X))
+
+
+def test_load_compact_checksum(forest_data, tmp_path):
+    """Test corrupted array bytes fail the checksum unless unverified."""
+    model, _ = forest_data
+    path = tmp_path / "forest.bin"
+    FlatForest.from_sklearn(model).save_compact(path, [], {})
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(data)
+
+    with pytest.raises(ValueError, match="checksum"):
+        FlatForest.load_compact(path)
+    FlatForest.load_compact(path, verify=False)
+
+
+def test_load_compact_truncated(forest_data, tmp_path):
+    """Test a partially written file is refused."""
+    model, _ = forest_data
+    path = tmp_path / "forest.bin"
+    FlatForest.from_sklearn(model).save_compact(path, [], {})
+    path.write_bytes(path.read_bytes()[:-100])
+
+    with pytest.raises(ValueError, match="truncated"):
+        FlatForest.load_compact(path)
+
+
+@pytest.mark.parametrize("content", [b"", b"RFCF\x09\x00\x00\x00\x00\x00", b"x" * 64])
+def test_load_compact_not_compact(tmp_path, content):
+    """Test other files and format versions are refused."""
+    path = tmp_path / "forest.bin"
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError, match="compact forest"):
+        FlatForest.load_compact(path)
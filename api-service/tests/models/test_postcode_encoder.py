@@ -0,0 +1,106 @@
+"""
+Unit tests for the hierarchical postcode encoder.
+"""
+
+import numpy as np
+import pytest
+
+from app.models import PostcodeEncoder
+from app.models.postcode_encoder import SMALL_BATCH, outward_code, postcode_area
+
+
+@pytest.fixture
+def encoder():
+    """Encoder over a few London and Manchester outward codes."""
+    return PostcodeEncoder.from_target_map(
+        {
+            "SW1A": 900.0,
+            "SW1E": 700.0,
+            "SW3": 500.0,
+            "M1": 200.0,
+            "M14": 100.0,
+            "UNKNOWN": 50.0,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "postcode, expected",
+    [
+        ("SW1A 1AA", "SW1A"),
+        ("M1 1AE", "M1"),
+        ("SW1A1AA", "SW1A"),
+        ("M11AE", "M1"),
+        ("SW1A", "SW1A"),
+    ],
+)
+def test_outward_code(postcode, expected):
+    """Test outward codes are found with and without the space."""
+    assert outward_code(postcode) == expected
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [("SW1A", "SW"), ("M14", "M"), ("EC2", "EC"), ("UNKNOWN", "UNKNOWN"), ("", "")],
+)
+def test_postcode_area(code, expected):
+    """Test the area letters of outward codes."""
+    assert postcode_area(code) == expected
+
+
+def test_encode_levels(encoder):
+    """Test the most specific known level is used."""
+    encoded = encoder.encode(
+        ["SW1A", "SW1X", "SW9", "M14", "M2", "WC2", "UNKNOWN"],
+        np.full(7, -1.0),
+    )
+
+    np.testing.assert_allclose(
+        encoded,
+        [
+            900.0,  # outward code
+            800.0,  # SW1 district: mean of SW1A and SW1E
+            700.0,  # SW area: mean of SW1A, SW1E and SW3
+            100.0,
+            150.0,  # M area
+            -1.0,  # unknown area: the fallback
+            -1.0,  # not a postcode
+        ],
+    )
+
+
+def test_encode_fallback_per_row(encoder):
+    """Test each row falls back to its own value."""
+    encoded = encoder.encode(["WC1", "SW1A", "EC2"], np.array([1.0, 2.0, 3.0]))
+
+    np.testing.assert_allclose(encoded, [1.0, 900.0, 3.0])
+
+
+def test_encode_small_batch(encoder):
+    """Test small batches (dict lookups) encode like large ones (arrays)."""
+    codes = ["SW1A", "SW1X", "SW3", "SW9", "M1", "M14", "M2", "M1A", "WC2", "SW"]
+    codes += ["1SW", "SW1AXX", "UNKNOWN", ""]
+    large = codes * (SMALL_BATCH // len(codes) + 1)
+    fallback = -np.arange(len(large), dtype=float)
+
+    expected = encoder.encode(large, fallback)
+
+    for i, code in enumerate(codes):
+        assert encoder.encode([code], fallback[i : i + 1])[0] == expected[i], code
+
+
+def test_encode_long_codes(encoder):
+    """Test codes longer than any indexed code are not cut to a match."""
+    encoded = encoder.encode(["SW1AXX", "M140"], np.array([-1.0, -1.0]))
+
+    np.testing.assert_allclose(encoded, [700.0, 150.0])
+
+
+def test_encode_empty(encoder):
+    """Test an empty batch encodes to an empty array."""
+    assert encoder.encode([], np.array([])).shape == (0,)
+
+
+def test_stats(encoder):
+    """Test the index size per level."""
+    assert encoder.stats() == {"outward": 5, "district": 4, "area": 2}
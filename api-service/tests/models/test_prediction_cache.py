@@ -0,0 +1,76 @@
+"""
+Unit tests for PredictionCache.
+"""
+
+import pytest
+
+from app.models.prediction_cache import PredictionCache
+
+
+def test_invalid_size():
+    """Test cache size must be positive."""
+    with pytest.raises(ValueError, match="must be positive"):
+        PredictionCache(0)
+
+
+def test_get_put_counters():
+    """Test hits and misses are counted."""
+    cache = PredictionCache(2)
+
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_lru_eviction():
+    """Test least recently used entry is evicted first."""
+    cache = PredictionCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_put_existing_key():
+    """Test overwriting a key does not evict."""
+    cache = PredictionCache(2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+
+    assert cache.get("a") == 2
+    assert cache.evictions == 0
+
+
+def test_clear_keeps_counters():
+    """Test clear drops entries but keeps counters."""
+    cache = PredictionCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_stats_empty():
+    """Test stats before any lookup."""
+    assert PredictionCache(5).stats() == {
+        "size": 0,
+        "max_size": 5,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "hit_rate": 0.0,
+    }
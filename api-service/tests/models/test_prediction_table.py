@@ -0,0 +1,151 @@
+"""
+Unit tests for PredictionTable.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.models.conformal_intervals import ConformalIntervals
+from app.models.prediction_table import PredictionTable
+from app.models.sales_forecaster import SalesForecaster
+
+PAIRS = [("GREATER LONDON", "SW1A"), ("SURREY", "GU1"), ("KENT", "UNSEEN")]
+
+
+@pytest.fixture
+def table(forecaster_trained, tmp_path):
+    """Build a small table for the synthetic model."""
+    return PredictionTable.build(
+        forecaster_trained, PAIRS, tmp_path, years=(2020, 2024), chunk_pairs=2
+    )
+
+
+def test_build_shape(table):
+    """Test table covers every pair, label combination and year."""
+    assert table.values.shape == (3, 5, 2, 3, 5, 3)
+    assert table.n_entries == 3 * 5 * 2 * 3 * 5
+    assert isinstance(table.values, np.memmap)
+
+
+def test_lookup_matches_forest(table, forecaster_trained, sample_property_data):
+    """Test table values match forest predictions."""
+    for county, postcode in [("GREATER LONDON", "SW1A 1AA"), ("KENT", "UNSEEN 1")]:
+        record = dict(sample_property_data, county=county, postcode=postcode)
+        row = forecaster_trained._normalize(record)
+        expected = forecaster_trained.predict(record)
+
+        price, lower, upper = table.lookup(row)
+
+        assert round(price, 2) == pytest.approx(expected["predicted_price"])
+        assert round(lower, 2) == pytest.approx(expected["confidence_interval"]["min"])
+        assert round(upper, 2) == pytest.approx(expected["confidence_interval"]["max"])
+
+
+def test_lookup_misses(table):
+    """Test unknown pair, label or year are misses."""
+    assert table.lookup(("T", "N", "F", "ESSEX", "SW1A", 2024)) is None
+    assert table.lookup(("X", "N", "F", "SURREY", "GU1", 2024)) is None
+    assert table.lookup(("T", "N", "F", "SURREY", "GU1", 2030)) is None
+    assert table.lookup(("T", "N", "F", "SURREY", "GU1", 2024)) is not None
+
+    assert table.stats() == {"entries": 450, "hits": 1, "misses": 3}
+
+
+def test_lookup_counters_concurrent(table):
+    """Test counters stay exact with lookups from several threads."""
+    rows = [
+        ("T", "N", "F", "SURREY", "GU1", 2024),
+        ("T", "N", "F", "ESSEX", "GU1", 2024),
+    ]
+
+    def lookups(_):
+        for _ in range(2000):
+            for row in rows:
+                table.lookup(row)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lookups, range(8)))
+
+    assert table.stats()["hits"] == 16000
+    assert table.stats()["misses"] == 16000
+
+
+def test_detached_counters(table):
+    """Test a detached table shares the values but counts on its own."""
+    row = ("T", "N", "F", "SURREY", "GU1", 2024)
+    table.lookup(row)
+
+    detached = table.detached()
+    assert detached.lookup(row) == table.lookup(row)
+
+    assert detached.values is table.values
+    assert detached.stats()["hits"] == 1
+    assert table.stats()["hits"] == 2
+
+
+def test_load_roundtrip(table, tmp_path):
+    """Test loading the written files."""
+    loaded = PredictionTable.load(tmp_path)
+
+    assert loaded.index["pairs"] == sorted(PAIRS)
+    np.testing.assert_array_equal(loaded.values, table.values)
+
+
+def test_matches(table, forecaster_trained):
+    """Test table is tied to model and interval percentiles."""
+    assert table.matches(forecaster_trained)
+
+    forecaster_trained.interval_percentiles = (5.0, 95.0)
+    assert not table.matches(forecaster_trained)
+
+
+def test_conformal_table_served(models_dir, trained_artifacts, sample_property_data):
+    """Test a conformal table is served in conformal mode only."""
+    ConformalIntervals.from_residuals(
+        np.linspace(-1, 1, 100),
+        ["T"] * 100,
+        ["SW1A"] * 100,
+        trained_date=trained_artifacts["metadata"]["trained_date"],
+    ).save(models_dir)
+    builder = SalesForecaster(
+        models_dir=str(models_dir), engine="native", interval_mode="conformal"
+    )
+    builder.load()
+    PredictionTable.build(builder, PAIRS, models_dir, years=(2024, 2024))
+
+    served = {}
+    for interval_mode in ("conformal", "trees"):
+        forecaster = SalesForecaster(
+            models_dir=str(models_dir),
+            use_prediction_table=True,
+            interval_mode=interval_mode,
+        )
+        forecaster.load()
+        served[interval_mode] = forecaster.prediction_table is not None
+
+    assert served == {"conformal": True, "trees": False}
+
+
+def test_conformal_table(
+    models_dir, trained_artifacts, forecaster_trained, sample_property_data
+):
+    """Test a table built in conformal mode holds conformal intervals."""
+    ConformalIntervals.from_residuals(
+        np.linspace(-1, 1, 100),
+        ["T"] * 100,
+        ["SW1A"] * 100,
+        trained_date=trained_artifacts["metadata"]["trained_date"],
+    ).save(models_dir)
+    forecaster = SalesForecaster(models_dir=str(models_dir), interval_mode="conformal")
+    forecaster.load()
+
+    table = PredictionTable.build(forecaster, PAIRS, models_dir, years=(2024, 2024))
+    price, lower, upper = table.lookup(forecaster._normalize(sample_property_data))
+
+    expected = forecaster.predict(sample_property_data)
+    assert round(lower, 2) == pytest.approx(expected["confidence_interval"]["min"])
+    assert round(upper, 2) == pytest.approx(expected["confidence_interval"]["max"])
+    assert table.matches(forecaster)
+    assert not table.matches(forecaster_trained)
@@ -0,0 +1,70 @@
+"""
+Unit tests for Price Paid record parsing.
+"""
+
+from app.models.price_paid import CsvRecordParser, parse_ndjson, to_record
+
+PRICE_PAID_ROW = (
+    '"{F887F88E-7D15-4415-804E-52EAC2F10958}","70000","1995-07-07 00:00",'
+    '"MK15 9HP","D","N","F","31","","ALDRICH DRIVE","WILLEN","MILTON KEYNES",'
+    '"MILTON KEYNES","MILTON KEYNES","A","A"'
+)
+EXPECTED = {
+    "property_type": "D",
+    "old_new": "N",
+    "duration": "F",
+    "county": "MILTON KEYNES",
+    "postcode": "MK15 9HP",
+    "year": "1995",
+}
+
+
+def test_to_record_skips_missing_fields():
+    """Test missing and empty fields are left out."""
+    record = to_record({"property_type": "T", "postcode": "", "year": 2020})
+
+    assert record == {"property_type": "T", "year": 2020}
+
+
+def test_csv_price_paid_layout():
+    """Test headerless pp-complete rows, with transaction id."""
+    records = list(CsvRecordParser().parse([PRICE_PAID_ROW]))
+
+    assert records == [dict(EXPECTED, id="F887F88E-7D15-4415-804E-52EAC2F10958")]
+
+
+def test_csv_without_transaction_id():
+    """Test headerless rows in the notebook's 15-column layout."""
+    row = PRICE_PAID_ROW.split(",", 1)[1]
+
+    assert list(CsvRecordParser().parse([row])) == [EXPECTED]
+
+
+def test_csv_with_header_across_calls():
+    """Test a header row is detected and kept between calls."""
+    parser = CsvRecordParser()
+
+    first = list(parser.parse(["property_type,county,postcode,year,old_new"]))
+    second = list(parser.parse(["T,kent,ME1 1AA,2020,N", ""]))
+
+    assert first == []
+    assert second == [
+        {
+            "property_type": "T",
+            "county": "kent",
+            "postcode": "ME1 1AA",
+            "year": "2020",
+            "old_new": "N",
+        }
+    ]
+
+
+def test_parse_ndjson():
+    """Test NDJSON objects, blank lines and invalid lines."""
+    lines = ['{"id": 7, "property_type": "T", "year": 2020}', "", "oops", "[1]"]
+
+    records = list(parse_ndjson(lines))
+
+    assert records[0] == {"property_type": "T", "year": 2020, "id": "7"}
+    assert "Invalid JSON" in str(records[1])
+    assert "expected an object" in str(records[2])
@@ -0,0 +1,885 @@
+"""
+Unit tests for SalesForecaster.
+"""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import joblib
+import numpy as np
+import pytest
+
+from app.models.conformal_intervals import ConformalIntervals
+from app.models.flat_forest import FlatForest
+from app.models.prediction_table import PredictionTable
+from app.models.sales_forecaster import SalesForecaster
+
+
+def test_init_defaults():
+    """Test forecaster starts unloaded."""
+    forecaster = SalesForecaster(models_dir="models")
+
+    assert str(forecaster.models_dir) == "models"
+    assert forecaster.model is None
+    assert forecaster.is_loaded is False
+
+
+def test_init_invalid_percentiles():
+    """Test percentiles must be ordered and within [0, 100]."""
+    with pytest.raises(ValueError, match="Invalid interval percentiles"):
+        SalesForecaster(interval_percentiles=(90, 10))
+    with pytest.raises(ValueError, match="Invalid interval percentiles"):
+        SalesForecaster(interval_percentiles=(5, 105))
+
+
+def test_init_unknown_engine():
+    """Test unknown engine is rejected."""
+    with pytest.raises(ValueError, match="Unknown engine"):
+        SalesForecaster(engine="gpu")
+
+
+def test_init_unknown_interval_mode():
+    """Test unknown interval mode is rejected."""
+    with pytest.raises(ValueError, match="Unknown interval mode"):
+        SalesForecaster(interval_mode="bootstrap")
+
+
+def test_load_success(models_dir):
+    """Test loading artifacts from disk."""
+    forecaster = SalesForecaster(models_dir=str(models_dir))
+    forecaster.load()
+
+    assert forecaster.is_loaded is True
+    assert forecaster.model is not None
+    assert set(forecaster.label_encoders) == {"property_type", "old_new", "duration"}
+    assert "county_map" in forecaster.target_encodings
+    assert set(forecaster.load_timings) == {
+        SalesForecaster.MODEL_FILE,
+        SalesForecaster.LABEL_ENCODERS_FILE,
+        SalesForecaster.TARGET_ENCODINGS_FILE,
+        SalesForecaster.METADATA_FILE,
+        "forest_setup",
+        "tree_budgets",
+        "total",
+    }
+
+
+def test_artifacts_stamp(models_dir):
+    """Test the stamp taken at load changes when an artifact is replaced."""
+    forecaster = SalesForecaster(models_dir=str(models_dir))
+    forecaster.load()
+
+    assert forecaster.loaded_stamp == forecaster.artifacts_stamp()
+    assert None not in forecaster.loaded_stamp
+
+    (models_dir / SalesForecaster.METADATA_FILE).write_bytes(b"new")
+    assert forecaster.artifacts_stamp() != forecaster.loaded_stamp
+
+    (models_dir / SalesForecaster.MODEL_FILE).unlink()
+    assert forecaster.artifacts_stamp()[0] is None
+
+
+def test_load_missing_artifacts(tmp_path):
+    """Test loading from a directory without artifacts."""
+    forecaster = SalesForecaster(models_dir=str(tmp_path))
+
+    with pytest.raises(FileNotFoundError, match="final_model.joblib"):
+        forecaster.load()
+    assert forecaster.is_loaded is False
+
+
+def test_predict_with_mocks(forecaster_mock, sample_property_data):
+    """Test prediction with mocked model."""
+    result = forecaster_mock.predict(sample_property_data)
+
+    assert result["predicted_price"] == round(float(np.exp(12.5)), 2)
+    assert result["confidence_interval"]["min"] <= result["predicted_price"]
+    assert result["features_used"] == forecaster_mock.metadata["features"]
+    assert result["model_info"] == {
+        "type": "RandomForest",
+        "n_estimators": 100,
+        "expected_r2": 0.11,
+        "n_trees": None,
+    }
+
+
+def test_predict_not_loaded(forecaster_unloaded, sample_property_data):
+    """Test prediction before loading raises."""
+    with pytest.raises(RuntimeError, match="Model not loaded"):
+        forecaster_unloaded.predict(sample_property_data)
+
+
+def test_predict_real_model(forecaster_trained, sample_property_data):
+    """Test prediction with a real Random Forest."""
+    result = forecaster_trained.predict(sample_property_data)
+
+    interval = result["confidence_interval"]
+    assert result["predicted_price"] > 0
+    assert interval["min"] <= interval["max"]
+
+
+def test_forest_predict_matches_sklearn(forecaster_trained):
+    """Test node-index evaluation matches sklearn per-tree predictions."""
+    X = forecaster_trained._feature_matrix(
+        {
+            "property_type_enc": [2, 2],
+            "old_new_enc": [0, 0],
+            "duration_enc": [0, 0],
+            "county_enc": [450000.0, 300000.0],
+            "postcode_region_enc": [500000.0, 500000.0],
+            "year": [2024, 2010],
+        }
+    )
+
+    mean, matrix = forecaster_trained._forest_predict(X)
+
+    model = forecaster_trained.model
+    expected = np.stack([tree.predict(X) for tree in model.estimators_])
+    assert matrix.shape == (10, 2)
+    np.testing.assert_allclose(matrix, expected)
+    np.testing.assert_allclose(mean, model.predict(forecaster_trained._frame(X)))
+
+
+def test_predict_custom_percentiles(models_dir, sample_property_data):
+    """Test wider percentiles produce a wider interval."""
+    narrow = SalesForecaster(models_dir=str(models_dir), interval_percentiles=(40, 60))
+    wide = SalesForecaster(models_dir=str(models_dir), interval_percentiles=(0, 100))
+    narrow.load()
+    wide.load()
+
+    narrow_ci = narrow.predict(sample_property_data)["confidence_interval"]
+    wide_ci = wide.predict(sample_property_data)["confidence_interval"]
+
+    assert wide_ci["min"] <= narrow_ci["min"] <= narrow_ci["max"] <= wide_ci["max"]
+
+
+def test_mmap_forest_requires_native():
+    """Test shared forest is only available with the native engine."""
+    with pytest.raises(ValueError, match="requires the native engine"):
+        SalesForecaster(engine="sklearn", mmap_forest=True)
+
+
+def test_mmap_forest_shared(models_dir, forecaster_trained, sample_property_data):
+    """Test the first load writes the shared forest and later loads map it."""
+    first = SalesForecaster(models_dir=str(models_dir), engine="native", mmap_forest=True)
+    first.load()
+
+    second = SalesForecaster(
+        models_dir=str(models_dir), engine="native", mmap_forest=True
+    )
+    with patch("app.models.sales_forecaster.FlatForest.from_sklearn") as mock_build:
+        second.load()
+        mock_build.assert_not_called()
+
+    expected = forecaster_trained.predict(sample_property_data)
+    for forecaster in (first, second):
+        assert forecaster.model is None
+        assert isinstance(forecaster._flat_forest.value, np.memmap)
+        assert forecaster.predict(sample_property_data) == expected
+        info = forecaster.get_model_info()
+        assert info["shared_forest"] is True
+        assert info["n_estimators"] == 10
+
+
+def test_mmap_forest_stale(models_dir, trained_artifacts):
+    """Test a shared forest from another model is rebuilt."""
+    FlatForest.from_sklearn(trained_artifacts["model"]).save(
+        models_dir / SalesForecaster.FLAT_FOREST_DIR, {"trained_date": "old"}
+    )
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine="native", mmap_forest=True
+    )
+    forecaster.load()
+
+    _, index = FlatForest.load(models_dir / SalesForecaster.FLAT_FOREST_DIR)
+    assert index["trained_date"] == trained_artifacts["metadata"]["trained_date"]
+    assert forecaster.model is None
+
+
+def test_mmap_forest_write_failure(models_dir, sample_property_data):
+    """Test the private forest is kept if the shared one cannot be written."""
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine="native", mmap_forest=True
+    )
+    with patch.object(FlatForest, "save", side_effect=OSError("read-only")):
+        forecaster.load()
+
+    assert forecaster.model is not None
+    assert forecaster.get_model_info()["shared_forest"] is False
+    assert forecaster.predict(sample_property_data)["predicted_price"] > 0
+
+
+@pytest.mark.parametrize("engine", ["sklearn", "native"])
+def test_predict_tree_budget(models_dir, sample_property_data, engine):
+    """Test a tree budget evaluates the first trees, interval included."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), engine=engine)
+    forecaster.load()
+    encoders = forecaster.label_encoders
+    columns = {
+        f"{field}_enc": encoders[field].transform([sample_property_data[field]])
+        for field in ("property_type", "old_new", "duration")
+    }
+    columns["county_enc"] = [forecaster._target_encode("county_map", "GREATER LONDON")]
+    columns["postcode_region_enc"] = [forecaster._target_encode("postcode_map", "SW1A")]
+    columns["year"] = [2024]
+    _, all_trees = forecaster._forest_predict(forecaster._feature_matrix(columns))
+    trees = all_trees[:3]
+
+    result = forecaster.predict(sample_property_data, n_trees=3)
+
+    assert result["predicted_price"] == round(float(np.exp(trees.mean())), 2)
+    assert result["confidence_interval"]["max"] == round(
+        float(np.percentile(np.exp(trees), 90)), 2
+    )
+    assert result["model_info"]["n_trees"] == 3
+    batch = forecaster.predict_batch([sample_property_data], n_trees=3)
+    assert batch["results"][0]["predicted_price"] == result["predicted_price"]
+    assert batch["model_info"]["n_trees"] == 3
+
+
+def test_forest_predict_budget_uses_node_index(forecaster_trained):
+    """Test sklearn budgets gather leaf values, without per-tree predict."""
+    X = forecaster_trained._feature_matrix(
+        {
+            "property_type_enc": [2, 1],
+            "old_new_enc": [0, 1],
+            "duration_enc": [0, 0],
+            "county_enc": [450000.0, 300000.0],
+            "postcode_region_enc": [500000.0, 250000.0],
+            "year": [2024, 2010],
+        }
+    )
+    _, all_trees = forecaster_trained._forest_predict(X)
+    tree_class = type(forecaster_trained.model.estimators_[0])
+
+    with patch.object(tree_class, "predict", side_effect=AssertionError):
+        mean, trees = forecaster_trained._forest_predict(X, n_trees=3)
+
+    np.testing.assert_array_equal(trees, all_trees[:3])
+    np.testing.assert_allclose(mean, all_trees[:3].mean(axis=0))
+    assert len(forecaster_trained.model.estimators_) == 10
+
+
+def test_predict_tree_budget_full_forest(forecaster_trained, sample_property_data):
+    """Test budgets covering every tree are full-forest predictions."""
+    expected = forecaster_trained.predict(sample_property_data)
+
+    assert forecaster_trained.predict(sample_property_data, n_trees=10) == expected
+    assert forecaster_trained.predict(sample_property_data, n_trees=500) == expected
+    assert expected["model_info"]["n_trees"] is None
+
+
+def test_predict_tree_budget_invalid(forecaster_trained, sample_property_data):
+    """Test budgets below one tree are rejected."""
+    with pytest.raises(ValueError, match="n_trees"):
+        forecaster_trained.predict(sample_property_data, n_trees=0)
+
+
+def test_predict_tree_budget_cached_separately(models_dir, sample_property_data):
+    """Test budget and full-forest predictions do not share cache entries."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), cache_size=8)
+    forecaster.load()
+
+    full = forecaster.predict(sample_property_data)
+    budget = forecaster.predict(sample_property_data, n_trees=2)
+
+    assert forecaster.predict(sample_property_data, n_trees=2) == budget
+    assert forecaster.predict(sample_property_data) == full
+    assert forecaster.cache.stats()["size"] == 2
+    assert forecaster.cache.stats()["hits"] == 2
+
+
+def test_tree_budgets_profiled_on_load(forecaster_trained):
+    """Test error and latency are published for each supported budget."""
+    budgets = forecaster_trained.get_model_info()["tree_budgets"]
+
+    assert [b["n_trees"] for b in budgets] == [1, 2, 5, 10]
+    assert budgets[-1]["price_error_mean"] == 0.0
+    assert budgets[-1]["interval_error_mean"] == 0.0
+    assert budgets[0]["price_error_mean"] > 0
+    assert all(b["row_latency_ms"] > 0 and b["batch_row_us"] > 0 for b in budgets)
+
+
+def test_compact_forest_requires_native():
+    """Test the compact forest is only available with the native engine."""
+    with pytest.raises(ValueError, match="requires the native engine"):
+        SalesForecaster(engine="sklearn", compact_forest=True)
+
+
+def test_export_compact_forest(forecaster_trained, models_dir):
+    """Test the export writes a compact file with a parity report."""
+    path = models_dir / SalesForecaster.COMPACT_FOREST_FILE
+
+    report = forecaster_trained.export_compact_forest(path)
+
+    assert path.exists()
+    assert report["leaf_agreement"] == 1.0
+    assert report["max_log_error"] < 1e-5
+    assert report["max_price_relative_error"] < 1e-5
+    assert report["max_interval_relative_error"] < 1e-5
+    assert report["compact_mb"] < report["model_mb"]
+
+
+def test_export_compact_forest_requires_model(forecaster_unloaded, tmp_path):
+    """Test exporting needs a loaded sklearn model."""
+    with pytest.raises(RuntimeError):
+        forecaster_unloaded.export_compact_forest(tmp_path / "forest.bin")
+
+
+def test_compact_forest_served(forecaster_trained, models_dir, sample_property_data):
+    """Test a matching compact file is served without loading the model."""
+    forecaster_trained.export_compact_forest(
+        models_dir / SalesForecaster.COMPACT_FOREST_FILE
+    )
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine="native", compact_forest=True
+    )
+    with patch("app.models.sales_forecaster.joblib.load", wraps=joblib.load) as load:
+        forecaster.load()
+
+    loaded = {Path(call.args[0]).name for call in load.call_args_list}
+    assert SalesForecaster.MODEL_FILE not in loaded
+    assert forecaster.model is None
+    assert forecaster._flat_forest.value.dtype == np.float32
+    assert "compact_forest" in forecaster.load_timings
+    assert forecaster.get_model_info()["n_estimators"] == 10
+
+    expected = forecaster_trained.predict(sample_property_data)
+    result = forecaster.predict(sample_property_data)
+    assert result["predicted_price"] == pytest.approx(
+        expected["predicted_price"], rel=1e-5
+    )
+
+
+def test_memory_bytes(forecaster_trained, models_dir, forecaster_unloaded):
+    """Test in-memory forest arrays are counted, memory maps on request."""
+    native = SalesForecaster(models_dir=str(models_dir), engine="native")
+    native.load()
+    forecaster_trained.export_compact_forest(
+        models_dir / SalesForecaster.COMPACT_FOREST_FILE
+    )
+    compact = SalesForecaster(
+        models_dir=str(models_dir), engine="native", compact_forest=True
+    )
+    compact.load()
+
+    assert forecaster_unloaded.memory_bytes() == 0
+    assert forecaster_trained.memory_bytes() > 0
+    assert native.memory_bytes() > forecaster_trained.memory_bytes()
+    # Only the leaf mask of the mapped forest is in memory
+    assert compact.memory_bytes() == compact._flat_forest.is_leaf.nbytes
+    assert compact.memory_bytes(mapped=True) > compact.memory_bytes()
+    assert native.memory_bytes(mapped=True) == native.memory_bytes()
+    assert forecaster_trained.get_model_info()["memory_mb"] == round(
+        forecaster_trained.memory_bytes() / 2**20, 2
+    )
+
+
+def test_compact_forest_missing(models_dir, sample_property_data):
+    """Test the model is loaded when no compact file was deployed."""
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine="native", compact_forest=True
+    )
+    forecaster.load()
+
+    assert forecaster.model is not None
+    assert "compact_forest" not in forecaster.load_timings
+    assert forecaster.predict(sample_property_data)["predicted_price"] > 0
+
+
+@pytest.mark.parametrize("features, trained_date", [(["year"], None), (None, "old")])
+def test_compact_forest_stale(trained_artifacts, models_dir, features, trained_date):
+    """Test a compact file for other features or another model is ignored."""
+    metadata = trained_artifacts["metadata"]
+    FlatForest.from_sklearn(trained_artifacts["model"]).save_compact(
+        models_dir / SalesForecaster.COMPACT_FOREST_FILE,
+        features or list(metadata["features"]),
+        {"trained_date": trained_date or metadata["trained_date"]},
+    )
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine="native", compact_forest=True
+    )
+    forecaster.load()
+
+    assert forecaster.model is not None
+
+
+def test_compact_forest_invalid(models_dir):
+    """Test a corrupt compact file falls back to the model."""
+    (models_dir / SalesForecaster.COMPACT_FOREST_FILE).write_bytes(b"not a forest")
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine="native", compact_forest=True
+    )
+    forecaster.load()
+
+    assert forecaster.model is not None
+
+
+def test_native_engine_matches_sklearn(models_dir, sample_property_data):
+    """Test native engine predictions match the sklearn engine."""
+    native = SalesForecaster(models_dir=str(models_dir), engine="native")
+    reference = SalesForecaster(models_dir=str(models_dir), engine="sklearn")
+    native.load()
+    reference.load()
+
+    records = [sample_property_data, dict(sample_property_data, county="ESSEX")]
+
+    assert native._flat_forest is not None
+    assert native.predict(sample_property_data) == reference.predict(
+        sample_property_data
+    )
+    assert native.predict_batch(records) == reference.predict_batch(records)
+    assert native.get_model_info()["engine"] == "native"
+
+
+def test_native_engine_parity_failure(models_dir):
+    """Test load fails when the native engine disagrees with sklearn."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), engine="native")
+
+    def shifted(self, X):
+        trees = self.value[self.apply(X)] + 1.0
+        return trees.mean(axis=0), trees
+
+    with patch.object(FlatForest, "predict", shifted):
+        with pytest.raises(RuntimeError, match="parity check failed"):
+            forecaster.load()
+    assert forecaster.is_loaded is False
+
+
+def test_predict_cache_hit_skips_model(models_dir, sample_property_data):
+    """Test cache hits skip encoding and forest evaluation."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), cache_size=10)
+    forecaster.load()
+
+    first = forecaster.predict(sample_property_data)
+    with patch.object(forecaster, "_predict_row") as mock_predict_row:
+        second = forecaster.predict(dict(sample_property_data, postcode="sw1a 2bb"))
+        mock_predict_row.assert_not_called()
+
+    assert first == second
+    stats = forecaster.get_model_info()["cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_predict_cache_invalidated_on_reload(models_dir, sample_property_data):
+    """Test reloading the model invalidates cached predictions."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), cache_size=10)
+    forecaster.load()
+    forecaster.predict(sample_property_data)
+
+    forecaster.load()
+
+    assert len(forecaster.cache) == 0
+    with patch.object(
+        forecaster, "_predict_row", return_value=(1.0, 0.5, 2.0)
+    ) as mock_predict_row:
+        result = forecaster.predict(sample_property_data)
+        mock_predict_row.assert_called_once()
+    assert result["predicted_price"] == 1.0
+
+
+def test_static_response_rebuilt_on_reload(models_dir, sample_property_data):
+    """Test static response fields are built once per loaded model."""
+    forecaster = SalesForecaster(models_dir=str(models_dir))
+    forecaster.load()
+    first = forecaster.predict(sample_property_data)
+    batch = forecaster.predict_batch([sample_property_data])
+
+    assert forecaster.predict(sample_property_data)["model_info"] is (
+        first["model_info"]
+    )
+    assert batch["features_used"] is first["features_used"]
+
+    forecaster.load()
+
+    reloaded = forecaster.predict(sample_property_data)
+    assert reloaded["model_info"] is not first["model_info"]
+    assert reloaded["model_info"] == first["model_info"]
+
+
+def test_stage_observer(models_dir, sample_property_data):
+    """Test prediction stages are reported to the stage observer."""
+    stages = []
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir),
+        stage_observer=lambda stage, seconds: stages.append((stage, seconds)),
+    )
+    forecaster.load()
+    stages.clear()
+
+    forecaster.predict(sample_property_data)
+    forecaster.predict_batch([sample_property_data] * 3)
+
+    names = [stage for stage, _ in stages]
+    assert names == ["validation", "encoding", "forest", "interval"] * 2
+    assert all(seconds >= 0 for _, seconds in stages)
+
+
+def test_predict_cache_does_not_store_errors(models_dir, sample_property_data):
+    """Test failed predictions are not cached."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), cache_size=10)
+    forecaster.load()
+
+    with pytest.raises(ValueError):
+        forecaster.predict(dict(sample_property_data, duration="Z"))
+
+    assert len(forecaster.cache) == 0
+
+
+def test_prediction_table_serving(
+    models_dir, forecaster_trained, sample_property_data
+):
+    """Test predictions are served from the table with forest fallback."""
+    PredictionTable.build(
+        forecaster_trained, [("GREATER LONDON", "SW1A")], models_dir, years=(2024, 2024)
+    )
+    forecaster = SalesForecaster(models_dir=str(models_dir), use_prediction_table=True)
+    forecaster.load()
+
+    with patch.object(forecaster, "_predict_row") as mock_predict_row:
+        result = forecaster.predict(sample_property_data)
+        mock_predict_row.assert_not_called()
+    fallback = forecaster.predict(dict(sample_property_data, year=2000))
+
+    assert result == forecaster_trained.predict(sample_property_data)
+    assert fallback["predicted_price"] > 0
+    assert forecaster.get_model_info()["prediction_table"] == {
+        "entries": 30,
+        "hits": 1,
+        "misses": 1,
+    }
+
+
+def test_prediction_table_missing(models_dir):
+    """Test serving without a built table falls back to the forest."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), use_prediction_table=True)
+    forecaster.load()
+
+    assert forecaster.prediction_table is None
+
+
+def test_prediction_table_stale(models_dir, forecaster_trained):
+    """Test a table built for other percentiles is ignored."""
+    PredictionTable.build(
+        forecaster_trained, [("SURREY", "GU1")], models_dir, years=(2024, 2024)
+    )
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir),
+        interval_percentiles=(5, 95),
+        use_prediction_table=True,
+    )
+    forecaster.load()
+
+    assert forecaster.prediction_table is None
+
+
+@pytest.fixture
+def conformal_intervals(models_dir, trained_artifacts):
+    """Write intervals for the synthetic model: narrow for T in SW."""
+    rng = np.random.default_rng(0)
+    intervals = ConformalIntervals.from_residuals(
+        np.concatenate([rng.normal(0, 0.1, 100), rng.normal(0, 0.4, 100)]),
+        ["T"] * 100 + ["D"] * 100,
+        ["SW1A"] * 100 + ["GU1"] * 100,
+        trained_date=trained_artifacts["metadata"]["trained_date"],
+    )
+    intervals.save(models_dir)
+    return intervals
+
+
+@pytest.mark.parametrize("engine", ["sklearn", "native"])
+def test_conformal_intervals(
+    models_dir, conformal_intervals, sample_property_data, engine
+):
+    """Test conformal mode scales the price by the segment quantiles."""
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), engine=engine, interval_mode="conformal"
+    )
+    forecaster.load()
+    trees = SalesForecaster(models_dir=str(models_dir), engine=engine)
+    trees.load()
+
+    with patch.object(forecaster, "_interval") as mock_interval:
+        result = forecaster.predict(sample_property_data)
+        batch = forecaster.predict_batch(
+            [sample_property_data, dict(sample_property_data, property_type="D")]
+        )
+        mock_interval.assert_not_called()
+
+    price = result["predicted_price"]
+    lower, upper = conformal_intervals.index["segments"][("T", "SW")][:2]
+    assert price == trees.predict(sample_property_data)["predicted_price"]
+    assert result["confidence_interval"] == {
+        "min": pytest.approx(price * np.exp(lower), abs=0.01),
+        "max": pytest.approx(price * np.exp(upper), abs=0.01),
+    }
+    assert batch["results"][0]["confidence_interval"] == result["confidence_interval"]
+    # D in SW has no segment of its own: the wider D quantiles apply
+    d_interval = batch["results"][1]["confidence_interval"]
+    d_price = batch["results"][1]["predicted_price"]
+    assert d_interval["max"] / d_price > result["confidence_interval"]["max"] / price
+    assert forecaster.get_model_info()["interval_mode"] == "conformal"
+    assert forecaster.get_model_info()["conformal_intervals"]["segments"] == 2
+
+
+def test_conformal_intervals_tree_budget(
+    models_dir, conformal_intervals, sample_property_data
+):
+    """Test conformal intervals follow the tree budget's price."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), interval_mode="conformal")
+    forecaster.load()
+
+    result = forecaster.predict(sample_property_data, n_trees=3)
+
+    lower = conformal_intervals.index["segments"][("T", "SW")][0]
+    assert result["confidence_interval"]["min"] == pytest.approx(
+        result["predicted_price"] * np.exp(lower), abs=0.01
+    )
+
+
+def test_conformal_intervals_missing(models_dir, sample_property_data):
+    """Test conformal mode without the file serves per-tree intervals."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), interval_mode="conformal")
+    forecaster.load()
+
+    assert forecaster.conformal_intervals is None
+    assert forecaster.get_model_info()["interval_mode"] == "trees"
+    assert forecaster.predict(sample_property_data)["confidence_interval"]["min"] > 0
+
+
+def test_conformal_intervals_stale(models_dir, conformal_intervals, trained_artifacts):
+    """Test intervals calibrated for another model are ignored."""
+    joblib.dump(
+        dict(trained_artifacts["metadata"], trained_date="2025-06-01"),
+        models_dir / "final_metadata.joblib",
+    )
+    forecaster = SalesForecaster(models_dir=str(models_dir), interval_mode="conformal")
+    forecaster.load()
+
+    assert forecaster.conformal_intervals is None
+
+
+def test_conformal_intervals_not_loaded_in_trees_mode(
+    models_dir, conformal_intervals
+):
+    """Test the default mode leaves the intervals file alone."""
+    forecaster = SalesForecaster(models_dir=str(models_dir))
+    forecaster.load()
+
+    assert forecaster.conformal_intervals is None
+    assert forecaster.get_model_info()["conformal_intervals"] is None
+
+
+def test_encode_matches_encoders(forecaster_trained):
+    """Test compiled tables encode exactly like the fitted encoders."""
+    rows = [
+        ("T", "N", "F", "GREATER LONDON", "SW1A", 2024),
+        ("D", "Y", "L", "NOWHERE", "ZZ9", 1995),
+        ("S", "N", "U", "KENT", "SW1X", 2010),
+    ]
+    encoders = forecaster_trained.label_encoders
+    county_map = forecaster_trained.target_encodings["county_map"]
+    postcode_map = forecaster_trained.target_encodings["postcode_map"]
+    nowhere = forecaster_trained._target_encode("county_map", "NOWHERE")
+
+    X, errors = forecaster_trained._encode(rows)
+
+    expected = forecaster_trained._feature_matrix(
+        {
+            "property_type_enc": encoders["property_type"].transform(["T", "D", "S"]),
+            "old_new_enc": encoders["old_new"].transform(["N", "Y", "N"]),
+            "duration_enc": encoders["duration"].transform(["F", "L", "U"]),
+            "county_enc": [
+                county_map["GREATER LONDON"],
+                nowhere,
+                county_map["KENT"],
+            ],
+            "postcode_region_enc": [
+                postcode_map["SW1A"],
+                nowhere,  # no ZZ area: the county encoding
+                (postcode_map["SW1A"] + postcode_map["SW1"]) / 2,  # SW1 district
+            ],
+            "year": [2024, 1995, 2010],
+        }
+    )
+    assert X.dtype == np.float32
+    np.testing.assert_array_equal(X, expected)
+    assert errors == [None, None, None]
+
+
+def test_encode_unknown_labels(forecaster_trained):
+    """Test the first unknown label of a row is reported."""
+    rows = [
+        ("T", "N", "F", "KENT", "ME1", 2020),
+        ("X", "Q", "F", "KENT", "ME1", 2020),
+        ("T", "Q", "Z", "KENT", "ME1", 2020),
+    ]
+
+    _, errors = forecaster_trained._encode(rows)
+
+    assert errors == [None, "unknown property_type 'X'", "unknown old_new 'Q'"]
+
+
+def test_predict_unknown_label(forecaster_trained, sample_property_data):
+    """Test unknown categorical value raises ValueError."""
+    sample_property_data["property_type"] = "X"
+
+    with pytest.raises(ValueError):
+        forecaster_trained.predict(sample_property_data)
+
+
+def test_predict_empty_postcode(forecaster_trained, sample_property_data):
+    """Test empty postcode raises ValueError."""
+    sample_property_data["postcode"] = "   "
+
+    with pytest.raises(ValueError, match="Postcode is empty"):
+        forecaster_trained.predict(sample_property_data)
+
+
+def test_target_encode_fallbacks(forecaster_mock, forecaster_trained):
+    """Test UNKNOWN and mean fallbacks for unseen keys."""
+    assert forecaster_mock._target_encode("county_map", "NOWHERE") == 300000.0
+
+    county_map = forecaster_trained.target_encodings["county_map"]
+    expected = float(np.mean(list(county_map.values())))
+    assert forecaster_trained._target_encode("county_map", "NOWHERE") == expected
+
+
+def test_predict_batch_matches_single(forecaster_trained, sample_property_data):
+    """Test batch predictions match single-row predictions."""
+    other = dict(sample_property_data, property_type="D", county="SURREY")
+    batch = forecaster_trained.predict_batch([sample_property_data, other])
+
+    assert len(batch["results"]) == 2
+    for record, result in zip([sample_property_data, other], batch["results"]):
+        single = forecaster_trained.predict(record)
+        assert result["predicted_price"] == pytest.approx(single["predicted_price"])
+        assert result["confidence_interval"] == pytest.approx(
+            single["confidence_interval"]
+        )
+    assert batch["features_used"] == forecaster_trained.metadata["features"]
+    assert batch["model_info"]["n_estimators"] == 10
+
+
+def test_predict_batch_row_errors(forecaster_trained, sample_property_data):
+    """Test invalid rows get errors without failing the batch."""
+    records = [
+        dict(sample_property_data, property_type="X"),
+        sample_property_data,
+        {"property_type": "T"},
+        dict(sample_property_data, postcode=""),
+        dict(sample_property_data, duration="Z", old_new="Q"),
+    ]
+
+    results = forecaster_trained.predict_batch(records)["results"]
+
+    assert "unknown property_type 'X'" in results[0]["error"]
+    assert results[1]["predicted_price"] > 0
+    assert "error" in results[2]
+    assert "Postcode is empty" in results[3]["error"]
+    assert "unknown old_new 'Q'" in results[4]["error"]
+
+
+def test_predict_batch_all_invalid(forecaster_trained, sample_property_data):
+    """Test batch where no row can be predicted."""
+    records = [dict(sample_property_data, property_type="X")]
+
+    results = forecaster_trained.predict_batch(records)["results"]
+
+    assert "error" in results[0]
+
+
+def test_predict_batch_empty(forecaster_trained):
+    """Test empty batch returns no results."""
+    assert forecaster_trained.predict_batch([])["results"] == []
+
+
+def test_predict_batch_not_loaded(forecaster_unloaded):
+    """Test batch prediction before loading raises."""
+    with pytest.raises(RuntimeError, match="Model not loaded"):
+        forecaster_unloaded.predict_batch([])
+
+
+def test_predict_many_matches_predict(models_dir, sample_property_data):
+    """Test micro-batched predictions match predict() per record."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), cache_size=10)
+    forecaster.load()
+    other = dict(sample_property_data, property_type="D", county="SURREY")
+    records = [
+        sample_property_data,
+        other,
+        sample_property_data,
+        dict(sample_property_data, postcode=""),
+        dict(sample_property_data, duration="Z"),
+    ]
+
+    responses = forecaster.predict_many(records)
+
+    assert responses[0] == forecaster.predict(sample_property_data)
+    assert responses[1] == forecaster.predict(other)
+    assert responses[2] == responses[0]
+    assert isinstance(responses[3], ValueError)
+    assert "unknown duration 'Z'" in str(responses[4])
+    # Duplicate rows share one forest row; errors are not cached
+    assert len(forecaster.cache) == 2
+
+
+def test_predict_many_uses_cache(models_dir, sample_property_data):
+    """Test cached rows skip the forest pass."""
+    forecaster = SalesForecaster(models_dir=str(models_dir), cache_size=10)
+    forecaster.load()
+    expected = forecaster.predict(sample_property_data)
+
+    with patch.object(forecaster, "_predict_normalized") as mock_predict:
+        mock_predict.return_value = []
+        responses = forecaster.predict_many([sample_property_data])
+        mock_predict.assert_called_once_with([])
+
+    assert responses == [expected]
+
+
+def test_predict_many_not_loaded(forecaster_unloaded):
+    """Test micro-batched prediction before loading raises."""
+    with pytest.raises(RuntimeError, match="Model not loaded"):
+        forecaster_unloaded.predict_many([])
+
+
+def test_detached(models_dir, sample_property_data):
+    """Test the detached view predicts alike without the cache or observer."""
+    observer = MagicMock()
+    forecaster = SalesForecaster(
+        models_dir=str(models_dir), cache_size=10, stage_observer=observer
+    )
+    forecaster.load()
+    cache = forecaster.cache
+
+    view = forecaster.detached()
+    result = view.predict(sample_property_data)
+
+    assert view.cache is None
+    assert forecaster.cache is cache
+    assert forecaster.stage_observer is observer
+    assert len(cache) == 0
+    observer.assert_not_called()
+    assert forecaster.predict(sample_property_data) == result
+
+
+def test_get_model_info_loaded(forecaster_trained):
+    """Test model info for loaded model."""
+    info = forecaster_trained.get_model_info()
+
+    assert info["loaded"] is True
+    assert info["model_type"] == "RandomForestRegressor"
+    assert info["n_estimators"] == 10
+    assert info["training_samples"] == 600
+    assert info["interval_percentiles"] == [10.0, 90.0]
+    assert info["engine"] == "sklearn"
+    assert info["interval_mode"] == "trees"
+    assert info["cache"] is None
+    assert info["prediction_table"] is None
+
+
+def test_get_model_info_unloaded(forecaster_unloaded):
+    """Test model info for unloaded model."""
+    assert forecaster_unloaded.get_model_info() == {"loaded": False}
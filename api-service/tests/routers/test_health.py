@@ -54,3 +54,80 @@ def test_health_check_unloaded(mock_forecaster, client):
     assert response.status_code == 200
     data = response.json()
     assert data["model_loaded"] is False
+
+
+@patch("app.core.model_loader")
+@patch("app.core.forecaster")
+def test_health_check_load_failed(mock_forecaster, mock_loader, client):
+    """Test liveness fails once the model load has failed."""
+    mock_forecaster.is_loaded = False
+    mock_loader.status = "failed"
+
+    response = client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unhealthy"
+
+
+@patch("app.core.model_loader")
+def test_ready(mock_loader, client):
+    """Test readiness succeeds once the model is loaded and warmed."""
+    mock_loader.is_ready = True
+    mock_loader.stats.return_value = {
+        "status": "ready",
+        "model_loaded": True,
+        "load_seconds": 1.2,
+        "warmup_seconds": 0.08,
+        "load_timings": {"final_model.joblib": 0.9, "total": 1.1, "warmup": 0.08},
+        "error": None,
+    }
+
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert data["load_timings"]["final_model.joblib"] == 0.9
+    assert data["warmup_seconds"] == 0.08
+
+
+@patch("app.core.model_loader")
+def test_ready_loading(mock_loader, client):
+    """Test readiness fails while the model is loading."""
+    mock_loader.is_ready = False
+    mock_loader.stats.return_value = {"status": "loading", "model_loaded": False}
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
+
+
+@patch("app.core.forecaster")
+def test_metrics_endpoint(mock_forecaster, client):
+    """Test /metrics reports request counts per route template."""
+    mock_forecaster.is_loaded = True
+    mock_forecaster.load_timings = {"total": 0.5}
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/health"' in (
+        text
+    )
+    assert 'model_load_seconds{step="total"} 0.5' in text
+    assert "model_loaded 1" in text
+    assert "worker_info{pid=" in text
+
+
+def test_metrics_unmatched_route(client):
+    """Test unknown paths share one route label."""
+    client.get("/no/such/path")
+
+    text = client.get("/metrics").text
+
+    assert 'route="unmatched",status="404"' in text
@@ -2,11 +2,14 @@
 Unit tests for predictions router.
 """
 
-from unittest.mock import patch
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.registry import UnknownModelVersion
+from app.core.reloader import ReloadInProgress
 from app.main import app
 
 
@@ -185,3 +188,371 @@ def test_predict_postcode_normalization(mock_forecaster, client):
     response = client.post("/api/v1/predict", json=payload)
 
     assert response.status_code == 200
+
+
+@patch("app.core.forecaster")
+def test_predict_profiled(mock_forecaster, client, monkeypatch, tmp_path):
+    """Test X-Profile adds Server-Timing (and a cProfile dump) when enabled."""
+    from app.core import settings
+
+    mock_forecaster.is_loaded = True
+    mock_forecaster.predict.return_value = {
+        "predicted_price": 1.0,
+        "confidence_interval": {"min": 0.5, "max": 2.0},
+        "features_used": [],
+        "model_info": {"type": "RandomForest", "n_estimators": 1, "expected_r2": 0},
+    }
+    payload = {
+        "property_type": "T",
+        "old_new": "N",
+        "duration": "F",
+        "county": "GREATER LONDON",
+        "postcode": "SW1A 1AA",
+        "year": 2024,
+    }
+
+    response = client.post("/api/v1/predict", json=payload, headers={"X-Profile": "1"})
+    assert "server-timing" not in response.headers
+
+    monkeypatch.setattr(settings, "request_profiling", True)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    assert "server-timing" not in client.post("/api/v1/predict", json=payload).headers
+
+    response = client.post(
+        "/api/v1/predict", json=payload, headers={"X-Profile": "cprofile"}
+    )
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert "inference_wait;dur=" in timing
+    assert "serialization;dur=" in timing
+    assert "total;dur=" in timing
+    assert (tmp_path / response.headers["x-profile-dump"]).exists()
+
+
+@patch("app.core.forecaster")
+def test_model_info_profiled(mock_forecaster, client, monkeypatch):
+    """Test the model info route reports Server-Timing when profiled."""
+    from app.core import settings
+
+    monkeypatch.setattr(settings, "request_profiling", True)
+    mock_forecaster.get_model_info.return_value = {"loaded": False}
+
+    response = client.get("/api/v1/model/info", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("model_info;dur=")
+
+
+@patch("app.core.forecaster")
+def test_predict_tree_budget(mock_forecaster, client):
+    """Test the n_trees query parameter reaches the forecaster."""
+    mock_forecaster.is_loaded = True
+    mock_forecaster.predict.return_value = {
+        "predicted_price": 425000.50,
+        "confidence_interval": {"min": 380000.00, "max": 470000.00},
+        "features_used": ["property_type_enc"],
+        "model_info": {
+            "type": "RandomForest",
+            "n_estimators": 100,
+            "expected_r2": 0.11,
+            "n_trees": 10,
+        },
+    }
+    payload = {
+        "property_type": "T",
+        "old_new": "N",
+        "duration": "F",
+        "county": "GREATER LONDON",
+        "postcode": "SW1A 1AA",
+        "year": 2024,
+    }
+
+    response = client.post("/api/v1/predict?n_trees=10", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["model_info"]["n_trees"] == 10
+    assert mock_forecaster.predict.call_args[0][1] == 10
+    assert client.post("/api/v1/predict?n_trees=0", json=payload).status_code == 422
+
+
+@patch("app.core.model_registry")
+@patch("app.core.forecaster")
+def test_predict_model_version(mock_forecaster, mock_registry, client):
+    """Test model_version selects the registry's forecaster."""
+    version = MagicMock()
+    version.is_loaded = True
+    version.predict.return_value = {
+        "predicted_price": 390000.0,
+        "confidence_interval": {"min": 350000.0, "max": 430000.0},
+        "features_used": ["property_type_enc"],
+        "model_info": {"type": "RandomForest", "n_estimators": 50},
+    }
+    mock_registry.get = AsyncMock(return_value=version)
+    mock_registry.target.return_value = lambda: version
+    payload = {
+        "property_type": "T",
+        "old_new": "N",
+        "duration": "F",
+        "county": "GREATER LONDON",
+        "postcode": "SW1A 1AA",
+        "year": 2024,
+    }
+
+    response = client.post("/api/v1/predict?model_version=2023", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["predicted_price"] == 390000.0
+    mock_registry.get.assert_awaited_once_with("2023")
+    mock_forecaster.predict.assert_not_called()
+
+    mock_registry.get = AsyncMock(side_effect=UnknownModelVersion("Unknown"))
+    response = client.post("/api/v1/predict?model_version=2021", json=payload)
+    assert response.status_code == 404
+
+
+def test_model_info_versions(client):
+    """Test model info lists the model versions."""
+    data = client.get("/api/v1/model/info").json()
+
+    assert data["versions"]["loaded"] == []
+    assert data["versions"]["versions_dir"].endswith("versions")
+
+
+@patch("app.core.forecaster")
+def test_predict_batch_success(mock_forecaster, client):
+    """Test batch prediction endpoint."""
+    mock_forecaster.is_loaded = True
+    mock_forecaster.predict_batch.return_value = {
+        "results": [
+            {
+                "predicted_price": 425000.50,
+                "confidence_interval": {"min": 380000.00, "max": 470000.00},
+            }
+        ],
+        "features_used": ["property_type_enc", "county_enc"],
+        "model_info": {
+            "type": "RandomForest",
+            "n_estimators": 100,
+            "expected_r2": 0.11,
+        },
+    }
+
+    payload = {
+        "properties": [
+            {
+                "property_type": "T",
+                "old_new": "N",
+                "duration": "F",
+                "county": "greater london",
+                "postcode": "SW1A 1AA",
+                "year": 2024,
+            },
+            {"property_type": "X"},
+        ]
+    }
+
+    response = client.post("/api/v1/predict/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["n_success"] == 1
+    assert data["n_errors"] == 1
+    assert data["results"][0]["predicted_price"] == 425000.50
+    assert data["results"][1]["index"] == 1
+    assert data["results"][1]["predicted_price"] is None
+    assert "property_type" in data["results"][1]["error"]
+    sent = mock_forecaster.predict_batch.call_args[0][0]
+    assert sent[0]["county"] == "GREATER LONDON"
+
+
+@patch("app.core.forecaster")
+def test_predict_batch_non_object_rows(mock_forecaster, client):
+    """Test rows that are not objects get per-row errors."""
+    mock_forecaster.is_loaded = True
+    mock_forecaster.predict_batch.return_value = {
+        "results": [],
+        "features_used": [],
+        "model_info": {"type": "RandomForest", "n_estimators": 1, "expected_r2": 0},
+    }
+
+    payload = {"properties": ["junk", 5]}
+
+    response = client.post("/api/v1/predict/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["n_errors"] == 2
+    assert data["results"][0]["error"].startswith("Invalid data: record: ")
+    assert data["results"][1]["index"] == 1
+
+
+@patch("app.core.forecaster")
+def test_predict_batch_empty(mock_forecaster, client):
+    """Test batch prediction rejects an empty list."""
+    mock_forecaster.is_loaded = True
+
+    response = client.post("/api/v1/predict/batch", json={"properties": []})
+
+    assert response.status_code == 422
+
+
+@patch("app.core.forecaster")
+def test_predict_batch_model_not_loaded(mock_forecaster, client):
+    """Test batch prediction when model is not loaded."""
+    mock_forecaster.is_loaded = False
+
+    payload = {"properties": [{"property_type": "T"}]}
+
+    response = client.post("/api/v1/predict/batch", json=payload)
+
+    assert response.status_code == 503
+
+
+def _batch_results(records):
+    """Mock predict_batch: one successful result per record."""
+    return {
+        "results": [
+            {"predicted_price": 1.0, "confidence_interval": {"min": 0.5, "max": 2.0}}
+            for _ in records
+        ],
+        "features_used": [],
+        "model_info": {},
+    }
+
+
+@patch("app.core.forecaster")
+def test_predict_stream_ndjson(mock_forecaster, client, sample_property_data):
+    """Test streaming NDJSON scoring in chunks."""
+    mock_forecaster.is_loaded = True
+    mock_forecaster.predict_batch.side_effect = _batch_results
+    body = "\n".join(json.dumps(dict(sample_property_data, id=i)) for i in range(5))
+
+    response = client.post(
+        "/api/v1/predict/stream?chunk_size=2",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["row"] for line in lines] == [0, 1, 2, 3, 4]
+    assert lines[4]["id"] == "4"
+    assert lines[4]["predicted_price"] == 1.0
+    assert mock_forecaster.predict_batch.call_count == 3
+
+
+@patch("app.core.forecaster")
+def test_predict_stream_csv(mock_forecaster, client):
+    """Test streaming CSV scoring."""
+    mock_forecaster.is_loaded = True
+    mock_forecaster.predict_batch.side_effect = _batch_results
+    body = (
+        "property_type,old_new,duration,county,postcode,year\n"
+        "T,N,F,KENT,ME1 1AA,2020\n"
+        "T,N,F,KENT,ME1 1AA,1990\n"
+    )
+
+    response = client.post(
+        "/api/v1/predict/stream",
+        content=body,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {
+        "row": 0,
+        "predicted_price": 1.0,
+        "confidence_interval": {"min": 0.5, "max": 2.0},
+    }
+    assert lines[1] == {
+        "row": 1,
+        "error": "Invalid data: year: Input should be greater than or equal to 1995",
+    }
+    mock_forecaster.predict_batch.assert_called_once()
+
+
+@patch("app.core.forecaster")
+def test_predict_stream_unsupported_type(mock_forecaster, client):
+    """Test streaming with an unsupported content type."""
+    mock_forecaster.is_loaded = True
+
+    response = client.post(
+        "/api/v1/predict/stream",
+        content="x",
+        headers={"Content-Type": "application/xml"},
+    )
+
+    assert response.status_code == 415
+
+
+@pytest.fixture
+def reload_enabled(monkeypatch):
+    """Allow reloads over HTTP."""
+    from app.core import settings
+
+    monkeypatch.setattr(settings, "admin_reload_enabled", True)
+    return settings
+
+
+@patch("app.core.model_reloader")
+def test_reload_model(mock_reloader, client, reload_enabled):
+    """Test the reload endpoint returns the reload result."""
+    mock_reloader.reload = AsyncMock(
+        return_value={
+            "previous_trained_date": "2025-01-01",
+            "trained_date": "2030-01-01",
+            "load_seconds": 1.5,
+            "pid": 42,
+        }
+    )
+
+    response = client.post("/api/v1/model/reload")
+
+    assert response.status_code == 200
+    assert response.json()["trained_date"] == "2030-01-01"
+
+
+@patch("app.core.model_reloader")
+def test_reload_model_in_progress(mock_reloader, client, reload_enabled):
+    """Test a concurrent reload is answered with 409."""
+    mock_reloader.reload = AsyncMock(side_effect=ReloadInProgress("busy"))
+
+    response = client.post("/api/v1/model/reload")
+
+    assert response.status_code == 409
+
+
+@patch("app.core.model_reloader")
+def test_reload_model_disabled(mock_reloader, client):
+    """Test reloads are refused unless ADMIN_RELOAD_ENABLED is set."""
+    mock_reloader.reload = AsyncMock()
+
+    response = client.post("/api/v1/model/reload")
+
+    assert response.status_code == 403
+    mock_reloader.reload.assert_not_awaited()
+
+
+@patch("app.core.model_reloader")
+def test_reload_model_admin_token(mock_reloader, client, reload_enabled, monkeypatch):
+    """Test a configured ADMIN_TOKEN must be sent in X-Admin-Token."""
+    monkeypatch.setattr(reload_enabled, "admin_token", "secret")
+    mock_reloader.reload = AsyncMock(
+        return_value={
+            "previous_trained_date": "2025-01-01",
+            "trained_date": "2030-01-01",
+            "load_seconds": 1.5,
+            "pid": 42,
+        }
+    )
+
+    assert client.post("/api/v1/model/reload").status_code == 401
+    response = client.post("/api/v1/model/reload", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 401
+    mock_reloader.reload.assert_not_awaited()
+
+    response = client.post("/api/v1/model/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
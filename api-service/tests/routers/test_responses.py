@@ -0,0 +1,29 @@
+"""
+Unit tests for lean JSON responses.
+"""
+
+import json
+
+from app.routers.responses import PredictionJSONResponse
+from app.schemas import PredictionResponse
+
+
+def test_prediction_json_response_matches_schema():
+    """Test forecaster-shaped content renders as the response model would."""
+    content = {
+        "predicted_price": 425000.5,
+        "confidence_interval": {"min": 380000.0, "max": 470000.0},
+        "features_used": ["property_type_enc", "county_enc"],
+        "model_info": {
+            "type": "RandomForest",
+            "n_estimators": 100,
+            "expected_r2": 0.11,
+            "n_trees": None,
+        },
+    }
+
+    response = PredictionJSONResponse(content)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == content
+    assert response.body == PredictionResponse(**content).model_dump_json().encode()
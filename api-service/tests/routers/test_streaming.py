@@ -0,0 +1,95 @@
+"""
+Unit tests for streaming upload helpers.
+"""
+
+import asyncio
+
+from app.routers.streaming import UploadStream, UploadStreamingResponse
+
+
+def make_receive(messages):
+    """ASGI receive returning queued messages, then waiting forever."""
+    queue = list(messages)
+
+    async def receive():
+        if queue:
+            return queue.pop(0)
+        await asyncio.Event().wait()
+
+    return receive
+
+
+async def test_upload_stream_reads_body():
+    """Test body chunks are yielded until more_body is false."""
+    upload = UploadStream(
+        make_receive(
+            [
+                {"type": "http.request", "body": b"a", "more_body": True},
+                {"type": "http.request", "body": b"", "more_body": True},
+                {"type": "http.request", "body": b"b", "more_body": False},
+            ]
+        )
+    )
+
+    assert [chunk async for chunk in upload] == [b"a", b"b"]
+
+
+async def test_is_disconnected_keeps_body():
+    """Test polling for a disconnect does not lose body chunks."""
+    upload = UploadStream(
+        make_receive([{"type": "http.request", "body": b"a", "more_body": False}])
+    )
+
+    assert await upload.is_disconnected() is False
+    assert await upload.is_disconnected() is False  # nothing pending
+    assert [chunk async for chunk in upload] == [b"a"]
+
+
+async def test_disconnect_ends_upload():
+    """Test a disconnect stops reading and is reported."""
+    upload = UploadStream(
+        make_receive(
+            [
+                {"type": "http.request", "body": b"a", "more_body": True},
+                {"type": "http.disconnect"},
+            ]
+        )
+    )
+
+    assert [chunk async for chunk in upload] == [b"a"]
+    assert await upload.is_disconnected() is True
+
+
+async def test_response_streams_and_runs_background():
+    """Test the response streams its body, then runs background tasks."""
+    from starlette.background import BackgroundTask
+
+    sent = []
+    done = []
+
+    async def body():
+        yield "x"
+
+    async def send(message):
+        sent.append(message)
+
+    response = UploadStreamingResponse(
+        body(), background=BackgroundTask(done.append, True)
+    )
+    await response({"type": "http"}, make_receive([]), send)
+
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[1]["body"] == b"x"
+    assert done == [True]
+
+
+async def test_response_ignores_client_gone():
+    """Test a send failure after disconnect ends the response quietly."""
+
+    async def body():
+        yield "x"
+
+    async def send(message):
+        raise OSError("connection reset")
+
+    await UploadStreamingResponse(body())({"type": "http"}, make_receive([]), send)
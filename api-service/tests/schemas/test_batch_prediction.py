@@ -0,0 +1,63 @@
+"""
+Unit tests for batch prediction schemas.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.batch_prediction import (
+    MAX_BATCH_SIZE,
+    BatchPredictionItem,
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+)
+
+
+def test_batch_request_valid(sample_property_data):
+    """Test valid batch request keeps raw records."""
+    request = BatchPredictionRequest(
+        properties=[sample_property_data, {"x": 1}, "junk"]
+    )
+
+    assert len(request.properties) == 3
+    assert request.properties[1] == {"x": 1}
+    assert request.properties[2] == "junk"
+
+
+def test_batch_request_empty():
+    """Test empty batch is rejected."""
+    with pytest.raises(ValidationError):
+        BatchPredictionRequest(properties=[])
+
+
+def test_batch_request_too_large():
+    """Test batch larger than the limit is rejected."""
+    with pytest.raises(ValidationError):
+        BatchPredictionRequest(properties=[{}] * (MAX_BATCH_SIZE + 1))
+
+
+def test_batch_item_error_only():
+    """Test item holding only an error."""
+    item = BatchPredictionItem(index=3, error="Invalid data: year")
+
+    assert item.predicted_price is None
+    assert item.confidence_interval is None
+
+
+def test_batch_response_valid():
+    """Test valid batch response."""
+    response = BatchPredictionResponse(
+        results=[
+            {
+                "index": 0,
+                "predicted_price": 1.0,
+                "confidence_interval": {"min": 0.5, "max": 2.0},
+            }
+        ],
+        n_success=1,
+        n_errors=0,
+        features_used=["year"],
+        model_info={"type": "RandomForest", "n_estimators": 10, "expected_r2": 0.1},
+    )
+
+    assert response.results[0].confidence_interval.max == 2.0
@@ -47,3 +47,65 @@ def test_model_info_response_optional_fields():
     assert response.loaded is True
     assert response.features is None
     assert response.cv_r2_mean is None
+
+
+def test_model_info_response_cache_stats():
+    """Test model info response with cache counters."""
+    data = {
+        "loaded": True,
+        "cache": {
+            "size": 2,
+            "max_size": 10,
+            "hits": 3,
+            "misses": 2,
+            "evictions": 0,
+            "hit_rate": 0.6,
+        },
+    }
+
+    response = ModelInfoResponse(**data)
+
+    assert response.cache.hits == 3
+    assert response.cache.hit_rate == 0.6
+
+
+def test_model_info_response_worker():
+    """Test model info response with worker memory."""
+    data = {"loaded": False, "worker": {"pid": 42, "rss_mb": 120.5}}
+
+    response = ModelInfoResponse(**data)
+
+    assert response.worker.pid == 42
+    assert response.worker.rss_file_mb is None
+
+
+def test_model_info_response_versions():
+    """Test model info response with loaded model versions."""
+    data = {
+        "loaded": True,
+        "memory_mb": 180.5,
+        "versions": {
+            "versions_dir": "models/versions",
+            "available": ["2023", "candidate"],
+            "loaded": [
+                {
+                    "version": "candidate",
+                    "trained_date": "2024-06-01",
+                    "n_estimators": 100,
+                    "memory_mb": 175.2,
+                    "load_seconds": 1.8,
+                    "requests": 12,
+                    "idle_seconds": 0.5,
+                }
+            ],
+            "memory_mb": 175.2,
+            "max_memory_mb": 1024.0,
+            "loads": 1,
+            "evictions": 0,
+        },
+    }
+
+    response = ModelInfoResponse(**data)
+
+    assert response.versions.loaded[0].version == "candidate"
+    assert response.versions.available == ["2023", "candidate"]
@@ -5,7 +5,7 @@ Unit tests for PropertyInput schema validation.
 import pytest
 from pydantic import ValidationError
 
-from app.schemas.property_input import PropertyInput
+from app.schemas.property_input import PropertyInput, validate_property
 
 
 def test_valid_property_input():
@@ -229,3 +229,42 @@ def test_missing_required_field():
 
     with pytest.raises(ValidationError):
         PropertyInput(**data)
+
+
+def test_validate_property():
+    """Test records are normalized to the predict() input shape."""
+    record = validate_property(
+        {
+            "id": "abc",
+            "property_type": "T",
+            "old_new": "N",
+            "duration": "F",
+            "county": "kent",
+            "postcode": "me1 1aa",
+            "year": "2020",
+        }
+    )
+
+    assert record == {
+        "property_type": "T",
+        "old_new": "N",
+        "duration": "F",
+        "county": "KENT",
+        "postcode": "ME1 1AA",
+        "year": 2020,
+    }
+
+
+def test_validate_property_reasons():
+    """Test invalid records name each field and the reason."""
+    with pytest.raises(ValueError) as exc_info:
+        validate_property({"property_type": "X", "year": 1990})
+
+    message = str(exc_info.value)
+    assert message.startswith("Invalid data: property_type: String should match")
+    assert "year: Input should be greater than or equal to 1995" in message
+    assert "postcode: Field required" in message
+    assert not isinstance(exc_info.value, ValidationError)
+
+    with pytest.raises(ValueError, match="^Invalid data: record: "):
+        validate_property([1, 2])
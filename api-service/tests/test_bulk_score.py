@@ -0,0 +1,211 @@
+"""
+Unit tests for the offline bulk scorer.
+"""
+
+import csv
+import io
+from unittest.mock import patch
+
+import pytest
+
+from app import bulk_score
+from app.bulk_score import part_path, read_chunks, score_chunk, score_file
+
+
+def price_paid_line(i, property_type="T"):
+    """Headerless pp-complete row with transaction id."""
+    return (
+        f'"{{ID-{i}}}","250000","2015-06-01 00:00","SW1A 1AA","{property_type}",'
+        '"N","F","1","","STREET","","LONDON","WESTMINSTER","GREATER LONDON",'
+        '"A","A"\n'
+    )
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    """Five rows, the fourth with an unknown property type."""
+    path = tmp_path / "pp.csv"
+    path.write_text(
+        "".join(price_paid_line(i, "X" if i == 3 else "T") for i in range(5))
+    )
+    return path
+
+
+def read_parts(output_dir):
+    """All part file rows, in chunk order."""
+    rows = []
+    for path in sorted(output_dir.glob("part-*.csv")):
+        with open(path, newline="") as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def test_read_chunks_headerless():
+    """Test the first data row is kept and chunks are numbered."""
+    f = io.StringIO("".join(price_paid_line(i) for i in range(5)))
+
+    columns, chunks = read_chunks(f, chunk_size=2)
+
+    assert columns[0] == "transaction_id"
+    assert [(index, first, len(lines)) for index, first, lines in chunks] == [
+        (0, 0, 2),
+        (1, 2, 2),
+        (2, 4, 1),
+    ]
+
+
+def test_read_chunks_header():
+    """Test a header row sets the columns and is not scored."""
+    f = io.StringIO("property_type,county\nT,KENT\nD,KENT\n")
+
+    columns, chunks = read_chunks(f, chunk_size=10)
+
+    assert columns == ["property_type", "county"]
+    assert [lines for _, _, lines in chunks] == [["T,KENT\n", "D,KENT\n"]]
+
+
+def test_read_chunks_empty():
+    """Test an empty file has no chunks."""
+    columns, chunks = read_chunks(io.StringIO(""), chunk_size=10)
+
+    assert columns == []
+    assert list(chunks) == []
+
+
+def test_score_file(forecaster_trained, input_file, tmp_path):
+    """Test rows are scored into one part file per chunk."""
+    output_dir = tmp_path / "out"
+
+    summary = score_file(forecaster_trained, input_file, output_dir, chunk_size=2)
+
+    assert sorted(p.name for p in output_dir.glob("part-*")) == [
+        "part-00000.csv",
+        "part-00001.csv",
+        "part-00002.csv",
+    ]
+    rows = read_parts(output_dir)
+    assert [row["row"] for row in rows] == ["0", "1", "2", "3", "4"]
+    assert rows[0]["id"] == "ID-0"
+    expected = forecaster_trained.predict(
+        {
+            "property_type": "T",
+            "old_new": "N",
+            "duration": "F",
+            "county": "GREATER LONDON",
+            "postcode": "SW1A 1AA",
+            "year": 2015,
+        }
+    )
+    assert float(rows[0]["predicted_price"]) == expected["predicted_price"]
+    assert float(rows[0]["interval_min"]) == expected["confidence_interval"]["min"]
+    assert "property_type" in rows[3]["error"]
+    assert rows[3]["predicted_price"] == ""
+
+    assert summary["rows"] == 5
+    assert summary["errors"] == 1
+    assert summary["chunks"] == 3
+    assert summary["skipped"] == 0
+    (worker,) = summary["workers"].values()
+    assert worker["rows"] == 5
+
+
+def test_score_chunk_validates_rows(forecaster_trained, tmp_path, monkeypatch):
+    """Test rows the API would reject are reported, not scored."""
+    monkeypatch.setattr(bulk_score, "_forecaster", forecaster_trained)
+    lines = [
+        "property_type,old_new,duration,county,postcode,year\n",
+        "T,N,F,GREATER LONDON,SW1A 1AA,2015\n",
+        "T,N,F,GREATER LONDON,SW1A 1AA,1990\n",
+        "T,N,F,GREATER LONDON,,2015\n",
+    ]
+    columns, chunks = read_chunks(io.StringIO("".join(lines)), chunk_size=10)
+    ((index, first_row, chunk),) = chunks
+
+    with patch.object(
+        forecaster_trained,
+        "predict_batch",
+        wraps=forecaster_trained.predict_batch,
+    ) as mock_batch:
+        result = score_chunk(index, first_row, chunk, columns, tmp_path)
+
+    assert len(mock_batch.call_args.args[0]) == 1
+    assert (result.rows, result.errors) == (3, 2)
+    rows = read_parts(tmp_path)
+    assert rows[0]["predicted_price"] != ""
+    assert rows[1]["error"] == (
+        "Invalid data: year: Input should be greater than or equal to 1995"
+    )
+    assert rows[2]["error"] == "Invalid data: postcode: Field required"
+
+
+def test_score_file_resumes(forecaster_trained, input_file, tmp_path):
+    """Test chunks with a part file are skipped on the next run."""
+    output_dir = tmp_path / "out"
+    score_file(forecaster_trained, input_file, output_dir, chunk_size=2)
+    part_path(output_dir, 1).unlink()
+
+    summary = score_file(forecaster_trained, input_file, output_dir, chunk_size=2)
+
+    assert summary["skipped"] == 2
+    assert summary["rows"] == 2
+    assert len(read_parts(output_dir)) == 5
+
+
+def test_score_file_rejects_other_chunk_size(
+    forecaster_trained, input_file, tmp_path
+):
+    """Test resuming with another chunk size is refused."""
+    output_dir = tmp_path / "out"
+    score_file(forecaster_trained, input_file, output_dir, chunk_size=2)
+
+    with pytest.raises(SystemExit, match="chunk-size"):
+        score_file(forecaster_trained, input_file, output_dir, chunk_size=3)
+
+
+@patch("app.bulk_score.gc.freeze")
+def test_score_file_process_pool(mock_freeze, forecaster_trained, input_file, tmp_path):
+    """Test chunks are scored by forked workers sharing the loaded model."""
+    output_dir = tmp_path / "out"
+
+    summary = score_file(
+        forecaster_trained, input_file, output_dir, workers=2, chunk_size=1
+    )
+
+    mock_freeze.assert_called_once()
+    assert summary["rows"] == 5
+    assert sum(w["rows"] for w in summary["workers"].values()) == 5
+    assert [row["row"] for row in read_parts(output_dir)] == ["0", "1", "2", "3", "4"]
+
+
+def test_main(models_dir, input_file, tmp_path, capsys):
+    """Test the command line loads the model and prints the summary."""
+    output_dir = tmp_path / "out"
+
+    bulk_score.main(
+        [
+            str(input_file),
+            str(output_dir),
+            "--workers",
+            "1",
+            "--models-dir",
+            str(models_dir),
+        ]
+    )
+
+    assert '"rows": 5' in capsys.readouterr().out
+    assert len(read_parts(output_dir)) == 5
+
+
+def test_main_rejects_bad_sizes(input_file, tmp_path):
+    """Test non-positive worker counts are refused."""
+    with pytest.raises(SystemExit):
+        bulk_score.main([str(input_file), str(tmp_path), "--workers", "0"])
+
+
+@patch("app.bulk_score.score_file", side_effect=KeyboardInterrupt)
+def test_main_interrupted(mock_score, models_dir, input_file, tmp_path):
+    """Test Ctrl-C ends the run with a hint to resume."""
+    with pytest.raises(SystemExit, match="resume"):
+        bulk_score.main(
+            [str(input_file), str(tmp_path / "out"), "--models-dir", str(models_dir)]
+        )
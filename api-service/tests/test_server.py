@@ -0,0 +1,199 @@
+"""
+Unit tests for the production server launcher.
+"""
+
+import signal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import server
+from app.server import WorkerSupervisor, create_socket
+
+
+def test_create_socket():
+    """Test listening socket is bound and inheritable."""
+    sock = create_socket("127.0.0.1", 0)
+    try:
+        assert sock.getsockname()[1] > 0
+        assert sock.get_inheritable() is True
+    finally:
+        sock.close()
+
+
+@patch("app.server.os.fork", return_value=100)
+def test_spawn_master(mock_fork):
+    """Test spawn records the worker in the master."""
+    supervisor = WorkerSupervisor(MagicMock(), workers=1)
+
+    assert supervisor.spawn() == 100
+    assert 100 in supervisor.children
+    supervisor.target.assert_not_called()
+
+
+@pytest.mark.parametrize("error, code", [(None, 0), (RuntimeError("boom"), 1)])
+@patch("app.server.signal.signal")
+@patch("app.server.os._exit", side_effect=SystemExit)
+@patch("app.server.os.fork", return_value=0)
+def test_spawn_child(mock_fork, mock_exit, mock_signal, error, code):
+    """Test the child runs the target and exits with its status."""
+    target = MagicMock(side_effect=error)
+    supervisor = WorkerSupervisor(target, workers=1)
+
+    with pytest.raises(SystemExit):
+        supervisor.spawn()
+
+    target.assert_called_once()
+    mock_exit.assert_called_once_with(code)
+
+
+@patch("app.server.time.sleep")
+@patch("app.server.signal.signal")
+@patch("app.server.os.wait")
+@patch("app.server.os.fork")
+def test_run_restarts_crashed_worker(mock_fork, mock_wait, mock_signal, mock_sleep):
+    """Test crashed workers are re-forked until stop is requested."""
+    supervisor = WorkerSupervisor(MagicMock(), workers=2)
+    mock_fork.side_effect = [1, 2, 3]
+    exits = iter([(999, 0), (1, 9), (2, 0), (3, 0)])
+
+    def wait():
+        pid, status = next(exits)
+        if pid == 2:
+            supervisor.stopping = True
+        return pid, status
+
+    mock_wait.side_effect = wait
+
+    assert supervisor.run() is True
+    assert mock_fork.call_count == 3
+    assert supervisor.children == {}
+    mock_signal.assert_any_call(signal.SIGTERM, supervisor.stop)
+
+
+@patch("app.server.time.perf_counter", return_value=0.0)
+@patch("app.server.time.sleep")
+@patch("app.server.os.kill")
+@patch("app.server.signal.signal")
+@patch("app.server.os.wait")
+@patch("app.server.os.fork")
+def test_run_backs_off_and_gives_up(
+    mock_fork, mock_wait, mock_signal, mock_kill, mock_sleep, mock_clock
+):
+    """Test workers dying at startup are restarted with backoff, then dropped."""
+    supervisor = WorkerSupervisor(MagicMock(), workers=2)
+    pids = iter(range(1, 100))
+    mock_fork.side_effect = lambda: next(pids)
+    exits = iter(range(1, 100))
+    mock_wait.side_effect = lambda: (next(exits), 256)
+
+    assert supervisor.run() is False
+
+    # Two initial workers, then a restart after each quick failure but the last
+    assert mock_fork.call_count == 2 + server.MAX_QUICK_FAILURES - 1
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays == [0.5, 1.0, 2.0, 4.0]
+    assert supervisor.children == {}
+    mock_kill.assert_called_once_with(server.MAX_QUICK_FAILURES + 1, signal.SIGTERM)
+
+
+@patch("app.server.time.perf_counter")
+@patch("app.server.time.sleep")
+@patch("app.server.signal.signal")
+@patch("app.server.os.wait")
+@patch("app.server.os.fork")
+def test_run_resets_quick_failures(
+    mock_fork, mock_wait, mock_signal, mock_sleep, mock_clock
+):
+    """Test a worker that ran long enough resets the failure count."""
+    supervisor = WorkerSupervisor(MagicMock(), workers=1)
+    supervisor.quick_failures = 3
+    mock_clock.side_effect = [0.0, 60.0, 60.0]
+    mock_fork.side_effect = [1, 2]
+
+    def wait():
+        supervisor.stopping = mock_fork.call_count == 2
+        return mock_fork.call_count, 0
+
+    mock_wait.side_effect = wait
+
+    assert supervisor.run() is True
+    assert supervisor.quick_failures == 0
+    mock_sleep.assert_not_called()
+
+
+@patch("app.server.time.perf_counter", return_value=0.0)
+@patch("app.server.time.sleep")
+@patch("app.server.signal.signal")
+@patch("app.server.os.wait")
+@patch("app.server.os.fork")
+def test_run_no_restart_after_stop_during_backoff(
+    mock_fork, mock_wait, mock_signal, mock_sleep, mock_clock
+):
+    """Test a stop requested during the backoff prevents the restart."""
+    supervisor = WorkerSupervisor(MagicMock(), workers=1)
+    mock_fork.return_value = 1
+    mock_wait.return_value = (1, 256)
+    mock_sleep.side_effect = lambda delay: setattr(supervisor, "stopping", True)
+
+    assert supervisor.run() is True
+    assert mock_fork.call_count == 1
+
+
+@patch("app.server.os.kill")
+def test_stop_signals_workers(mock_kill):
+    """Test stop forwards SIGTERM and ignores exited workers."""
+    supervisor = WorkerSupervisor(MagicMock(), workers=2)
+    supervisor.children = {1: 0.0, 2: 0.0}
+    mock_kill.side_effect = [None, ProcessLookupError]
+
+    supervisor.stop()
+
+    assert supervisor.stopping is True
+    mock_kill.assert_any_call(1, signal.SIGTERM)
+    mock_kill.assert_any_call(2, signal.SIGTERM)
+
+
+@patch("app.server.uvicorn.Server")
+@patch("app.server.WorkerSupervisor")
+@patch("app.server.create_socket")
+@patch("app.server.gc.freeze")
+def test_main_preloads_model(
+    mock_freeze, mock_socket, mock_supervisor, mock_server, monkeypatch
+):
+    """Test main loads the model once before forking workers."""
+    mock_supervisor.return_value.run.return_value = True
+    monkeypatch.setenv("WORKERS", "3")
+    monkeypatch.setenv("PORT", "9000")
+
+    with patch.object(server.forecaster, "load") as mock_load:
+        server.main()
+        mock_load.assert_called_once()
+
+    mock_freeze.assert_called_once()
+    mock_socket.assert_called_once_with("0.0.0.0", 9000)
+    target, workers = mock_supervisor.call_args[0]
+    assert workers == 3
+
+    target()
+    mock_server.return_value.run.assert_called_once_with(
+        sockets=[mock_socket.return_value]
+    )
+    mock_socket.return_value.close.assert_called_once()
+
+
+@patch("app.server.WorkerSupervisor")
+@patch("app.server.create_socket")
+@patch("app.server.gc.freeze")
+def test_main_exits_when_workers_keep_failing(
+    mock_freeze, mock_socket, mock_supervisor
+):
+    """Test main exits with an error when the supervisor gives up."""
+    mock_supervisor.return_value.run.return_value = False
+
+    with patch.object(server.forecaster, "load"):
+        with pytest.raises(SystemExit) as exc_info:
+            server.main()
+
+    assert exc_info.value.code == 1
+    mock_socket.return_value.close.assert_called_once()
@@ -0,0 +1,116 @@
+"""
+Benchmark Encoding Script.
+
+Time feature encoding per row for the deployed models: the original path
+(LabelEncoder.transform per field, target-encoding dict lookups and a
+six-column pandas DataFrame per request) against the precompiled lookup
+tables writing into a preallocated NumPy array (SalesForecaster._encode).
+Both are timed for single rows and for batches; the forest is not run.
+
+Usage:
+    python scripts/benchmark_encoding.py --rows 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "api-service"))
+
+from app.models import SalesForecaster  # noqa: E402
+from app.models.sales_forecaster import LABEL_ENCODED_FIELDS  # noqa: E402
+
+
+def sample_rows(forecaster, n_rows: int, seed: int = 0):
+    """Normalized rows drawn from the encoders' value domains."""
+    rng = np.random.default_rng(seed)
+    labels = [
+        list(forecaster.label_encoders[field].classes_)
+        for field in LABEL_ENCODED_FIELDS
+    ]
+    counties = list(forecaster.target_encodings["county_map"])
+    regions = list(forecaster.target_encodings["postcode_map"])
+    return [
+        (
+            *(str(values[rng.integers(len(values))]) for values in labels),
+            counties[rng.integers(len(counties))],
+            regions[rng.integers(len(regions))],
+            int(rng.integers(1995, 2031)),
+        )
+        for _ in range(n_rows)
+    ]
+
+
+def dataframe_encode(forecaster, rows):
+    """Original encoding: LabelEncoder.transform and a DataFrame."""
+    fields = list(zip(*rows))
+    columns = {
+        f"{field}_enc": forecaster.label_encoders[field].transform(fields[position])
+        for position, field in enumerate(LABEL_ENCODED_FIELDS)
+    }
+    for position, (name, map_name) in enumerate(
+        (("county_enc", "county_map"), ("postcode_region_enc", "postcode_map")),
+        start=3,
+    ):
+        mapping = forecaster.target_encodings[map_name]
+        columns[name] = [
+            mapping.get(key, mapping.get("UNKNOWN")) for key in fields[position]
+        ]
+    columns["year"] = np.asarray(fields[5]).astype(int)
+    features = forecaster.metadata["features"]
+    return pd.DataFrame({name: columns[name] for name in features})[features]
+
+
+def time_per_row(encode, rows, batch_size: int, min_seconds: float = 0.5) -> float:
+    """Microseconds per row encoding rows in batches of batch_size."""
+    batches = [rows[i : i + batch_size] for i in range(0, len(rows), batch_size)]
+    encoded, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        for batch in batches:
+            encode(batch)
+        encoded += len(rows)
+    return (time.perf_counter() - start) / encoded * 1e6
+
+
+def benchmark_encoding():
+    """Compare encoding time per row before and after precompilation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir",
+        type=Path,
+        default=project_root / "api-service" / "models",
+        help="Deployed models directory",
+    )
+    parser.add_argument("--rows", type=int, default=1000, help="Rows to encode")
+    args = parser.parse_args()
+
+    forecaster = SalesForecaster(models_dir=str(args.models_dir))
+    forecaster.load()
+    rows = sample_rows(forecaster, args.rows)
+
+    # Both paths must produce the same matrix
+    expected = dataframe_encode(forecaster, rows).to_numpy(dtype=np.float32)
+    np.testing.assert_array_equal(forecaster._encode(rows)[0], expected)
+
+    report = {}
+    for batch_size in (1, args.rows):
+        before = time_per_row(
+            lambda batch: dataframe_encode(forecaster, batch), rows, batch_size
+        )
+        after = time_per_row(forecaster._encode, rows, batch_size)
+        report[f"batch_{batch_size}"] = {
+            "dataframe_us_per_row": round(before, 2),
+            "lookup_table_us_per_row": round(after, 2),
+            "speedup": round(before / after, 1),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    benchmark_encoding()
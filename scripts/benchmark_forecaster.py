@@ -0,0 +1,363 @@
+"""
+Benchmark Forecaster Script.
+
+Microbenchmarks of SalesForecaster on real synthetic forests (see
+scripts/synthetic_models.py) over a grid of tree counts, tree depths,
+engines and batch sizes:
+
+- load(): wall time (best of --load-repeats) and its per-step timings
+- memory: RSS growth and traced (tracemalloc) peak of a load, measured in
+  a forked child so earlier loads do not skew it (Linux only)
+- prediction: time per call and per row (fastest of --rounds) of
+  predict() (batch size 1) and predict_batch(), split into the
+  validation, encoding, forest and interval stages reported by the
+  forecaster's stage observer; "other" is the rest (tree budget,
+  response building)
+
+Results go to benchmarks/forecaster-<commit>.json. With --compare, every
+timing and memory figure is checked against a baseline results file and
+the script exits with status 1 if any grew by more than --threshold.
+
+Usage:
+    python scripts/benchmark_forecaster.py
+    python scripts/benchmark_forecaster.py --trees 100 500 --depths 20 none
+    python scripts/benchmark_forecaster.py --compare benchmarks/forecaster-abc1234.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "api-service"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models import SalesForecaster  # noqa: E402
+from benchmark_load import git_commit  # noqa: E402
+from synthetic_models import (  # noqa: E402
+    build_artifacts,
+    sample_properties,
+    write_artifacts,
+)
+
+RESULTS_DIR = project_root / "benchmarks"
+STAGES = ("validation", "encoding", "forest", "interval")
+# Figures checked by --compare (lower is better)
+COMPARED_SUFFIXES = ("_us", "_ms", "_mb")
+# Reported only: RSS growth depends on allocator state more than on the code
+UNCOMPARED = ("rss_growth_mb",)
+
+
+class StageTimer:
+    """Stage observer summing the seconds reported per stage."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    def __call__(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def reset(self) -> None:
+        self.seconds = {}
+
+
+def rss_mb() -> float:
+    """Resident set size of this process."""
+    pages = int(Path("/proc/self/statm").read_text().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def load_memory(models_dir: str, engine: str, interval_mode: str) -> Dict[str, float]:
+    """Memory taken by a load (run in a forked child)."""
+    forecaster = SalesForecaster(
+        models_dir=models_dir, engine=engine, interval_mode=interval_mode
+    )
+    before = rss_mb()
+    tracemalloc.start()
+    forecaster.load()
+    traced, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rss_growth_mb": round(rss_mb() - before, 2),
+        "traced_mb": round(traced / 2**20, 2),
+        "traced_peak_mb": round(traced_peak / 2**20, 2),
+    }
+
+
+def time_load(
+    models_dir: str, engine: str, interval_mode: str, repeats: int
+) -> Dict[str, Any]:
+    """Best load() time of repeats, with the step timings of that load."""
+    best: Optional[SalesForecaster] = None
+    best_seconds = float("inf")
+    for _ in range(repeats):
+        forecaster = SalesForecaster(
+            models_dir=models_dir, engine=engine, interval_mode=interval_mode
+        )
+        start = time.perf_counter()
+        forecaster.load()
+        seconds = time.perf_counter() - start
+        if seconds < best_seconds:
+            best, best_seconds = forecaster, seconds
+
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        memory = pool.apply(load_memory, (models_dir, engine, interval_mode))
+    return {
+        "load_ms": round(best_seconds * 1000, 2),
+        "steps_ms": {
+            step: round(seconds * 1000, 2)
+            for step, seconds in best.load_timings.items()
+        },
+        "memory": memory,
+    }
+
+
+def benchmark_predict(
+    forecaster: SalesForecaster,
+    timer: StageTimer,
+    records: List[Dict[str, Any]],
+    batch_size: int,
+    min_seconds: float,
+    rounds: int,
+) -> Dict[str, Any]:
+    """
+    Time predict() (batch size 1) or predict_batch() over records.
+
+    Each round calls for at least min_seconds; the fastest round is kept,
+    as slower ones measure interference rather than the code.
+
+    Returns:
+        Microseconds per call and per row, and per call for each stage
+    """
+    batches = [
+        records[i : i + batch_size]
+        for i in range(0, len(records) - batch_size + 1, batch_size)
+    ]
+    if batch_size == 1:
+
+        def call(batch):
+            forecaster.predict(batch[0])
+
+    else:
+
+        def call(batch):
+            forecaster.predict_batch(batch)
+
+    for batch in batches[:3]:
+        call(batch)
+
+    best = None
+    for _ in range(rounds):
+        timer.reset()
+        calls, start = 0, time.perf_counter()
+        while time.perf_counter() - start < min_seconds:
+            call(batches[calls % len(batches)])
+            calls += 1
+        per_call = (time.perf_counter() - start) / calls * 1e6
+        if best is None or per_call < best[0]:
+            best = (per_call, calls, timer.seconds)
+    per_call, calls, seconds = best
+
+    stages = {
+        f"{stage}_us": round(seconds.get(stage, 0.0) / calls * 1e6, 2)
+        for stage in STAGES
+    }
+    stages["other_us"] = round(max(0.0, per_call - sum(stages.values())), 2)
+    return {
+        "calls": calls,
+        "call_us": round(per_call, 2),
+        "row_us": round(per_call / batch_size, 3),
+        "stages": stages,
+    }
+
+
+def benchmark_model(
+    n_estimators: int, max_depth: Optional[int], args
+) -> Dict[str, Any]:
+    """Build a synthetic forest and benchmark every engine and batch size."""
+    artifacts = build_artifacts(
+        n_estimators=n_estimators, max_depth=max_depth, n_rows=args.rows
+    )
+    model = artifacts["model"]
+    result: Dict[str, Any] = {
+        "n_estimators": n_estimators,
+        "max_depth": max_depth,
+        "nodes": int(sum(tree.tree_.node_count for tree in model.estimators_)),
+        "engines": {},
+    }
+
+    records = sample_properties(
+        max(max(args.batch_sizes) * 4, 2000), np.random.default_rng(args.seed)
+    )
+    with tempfile.TemporaryDirectory(prefix="synthetic-models-") as tmp:
+        models_dir = write_artifacts(artifacts, Path(tmp))
+        result["model_file_mb"] = round(
+            (models_dir / SalesForecaster.MODEL_FILE).stat().st_size / 2**20, 2
+        )
+
+        for engine in args.engines:
+            engine_result = time_load(
+                str(models_dir), engine, args.interval_mode, args.load_repeats
+            )
+
+            timer = StageTimer()
+            forecaster = SalesForecaster(
+                models_dir=str(models_dir),
+                engine=engine,
+                stage_observer=timer,
+                interval_mode=args.interval_mode,
+            )
+            forecaster.load()
+            engine_result["predict"] = {
+                f"batch_{size}": benchmark_predict(
+                    forecaster, timer, records, size, args.min_seconds, args.rounds
+                )
+                for size in args.batch_sizes
+            }
+            result["engines"][engine] = engine_result
+
+            predict = engine_result["predict"]
+            print(
+                f"trees {n_estimators:>4} depth {str(max_depth):>4} {engine:>7}: "
+                f"load {engine_result['load_ms']:.0f} ms, "
+                f"+{engine_result['memory']['rss_growth_mb']:.0f} MB, "
+                + ", ".join(
+                    f"batch {size} {predict[f'batch_{size}']['row_us']:.1f} us/row"
+                    for size in args.batch_sizes
+                ),
+                file=sys.stderr,
+            )
+    return result
+
+
+def flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Compared figures of a results file, keyed by their path."""
+    figures = {}
+    for model in results["models"]:
+        case = f"trees={model['n_estimators']} depth={model['max_depth']}"
+
+        def walk(value, path):
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    walk(item, path + [key])
+            elif path[-1].endswith(COMPARED_SUFFIXES) and path[-1] not in UNCOMPARED:
+                figures[" ".join(path)] = value
+
+        walk(model["engines"], [case])
+    return figures
+
+
+def compare(results, baseline, threshold: float) -> List[str]:
+    """
+    Figures that grew by more than threshold (a fraction) since baseline.
+
+    Sub-microsecond figures are skipped, as their noise exceeds any
+    threshold.
+    """
+    before = flatten(baseline)
+    regressions = []
+    for path, value in flatten(results).items():
+        old = before.get(path)
+        if old is None or old < 1 or value <= old * (1 + threshold):
+            continue
+        regressions.append(f"{path}: {old} -> {value} ({value / old - 1:+.0%})")
+    return regressions
+
+
+def parse_depth(text: str) -> Optional[int]:
+    """Tree depth, or None for unlimited ("none")."""
+    return None if text.lower() == "none" else int(text)
+
+
+def benchmark_forecaster():
+    """Run the microbenchmarks and write their results file."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--trees", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument(
+        "--depths", type=parse_depth, nargs="+", default=[10, 20], help="or none"
+    )
+    parser.add_argument(
+        "--engines", nargs="+", default=["sklearn", "native"], help="Engines"
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000]
+    )
+    parser.add_argument(
+        "--interval-mode", choices=["trees", "conformal"], default="trees"
+    )
+    parser.add_argument("--rows", type=int, default=20000, help="Training rows")
+    parser.add_argument("--load-repeats", type=int, default=3)
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.2, help="Per prediction round"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=5, help="Per prediction case (fastest kept)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Records seed")
+    parser.add_argument("--output", type=Path, help="Results file")
+    parser.add_argument("--compare", type=Path, help="Baseline results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Growth over the baseline reported as a regression",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            **git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "rows": args.rows,
+            "seed": args.seed,
+            "min_seconds": args.min_seconds,
+            "rounds": args.rounds,
+            "interval_mode": args.interval_mode,
+        },
+        "models": [
+            benchmark_model(n_estimators, max_depth, args)
+            for n_estimators in args.trees
+            for max_depth in args.depths
+        ],
+    }
+
+    output = (
+        args.output
+        or RESULTS_DIR / f"forecaster-{results['meta']['commit'] or 'unknown'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        print(
+            f"\n{len(regressions)} regressions over {args.threshold:.0%} against "
+            f"{baseline['meta'].get('commit')}",
+            file=sys.stderr,
+        )
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    benchmark_forecaster()
@@ -0,0 +1,449 @@
+"""
+Benchmark Load Script.
+
+Drive the API with a reproducible request mix at one or more concurrency
+levels and report throughput, p50/p95/p99 latency and error rate per
+level and per endpoint, written to a JSON results file that can be
+compared with one from another commit (--compare).
+
+The mix replays the requests of the Postman collection in docs/: the
+example /predict payload, with most properties instead drawn from the
+county and postcode distribution of scripts/synthetic_models.py, a share
+of /predict/batch calls and the GET endpoints. Requests are generated
+from --seed, so every run (and every commit) sends the same requests.
+
+Targets:
+- in-process (default): app.main:app through httpx's ASGI transport. No
+  network or HTTP parsing, and the load generator shares the process, so
+  this measures the application stack rather than capacity.
+- --url: an API already running, e.g. http://127.0.0.1:8000.
+- --serve: start uvicorn on app.main:app (--workers) for the run.
+
+Without deployed models (or with --synthetic), a synthetic forest is
+trained into a temporary directory first.
+
+Usage:
+    python scripts/benchmark_load.py --concurrency 1 8 32 --requests 2000
+    python scripts/benchmark_load.py --serve --workers 4 --synthetic
+    python scripts/benchmark_load.py --compare benchmarks/load-abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+api_dir = project_root / "api-service"
+sys.path.insert(0, str(api_dir))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic_models import sample_properties, write_synthetic_models  # noqa: E402
+
+COLLECTION = project_root / "docs" / "ML_Sales_Forecasting_API.postman_collection.json"
+RESULTS_DIR = project_root / "benchmarks"
+
+DEFAULT_MIX = {"predict": 85.0, "batch": 5.0, "info": 5.0, "health": 5.0}
+# Share of /predict requests sending the collection's example verbatim
+EXAMPLE_SHARE = 0.05
+PERCENTILES = (50, 95, 99)
+
+Request = Tuple[str, str, str, Optional[Any]]
+
+
+def collection_requests(path: Path = COLLECTION) -> List[Tuple[str, str, Any]]:
+    """
+    Requests of the Postman collection.
+
+    Returns:
+        List of (method, path, JSON body or None)
+    """
+    collection = json.loads(path.read_text())
+    requests = []
+
+    def walk(items):
+        for item in items:
+            if "item" in item:
+                walk(item["item"])
+                continue
+            request = item["request"]
+            url = request["url"]
+            raw = url["raw"] if isinstance(url, dict) else url
+            body = (request.get("body") or {}).get("raw")
+            requests.append(
+                (
+                    request["method"],
+                    raw.replace("{{base_url}}", "") or "/",
+                    json.loads(body) if body else None,
+                )
+            )
+
+    walk(collection["item"])
+    return requests
+
+
+def build_requests(
+    n_requests: int, mix: Dict[str, float], batch_size: int, seed: int
+) -> List[Request]:
+    """
+    Generate the request sequence.
+
+    Args:
+        n_requests: Requests to generate
+        mix: Relative weight per scenario (predict, batch, info, health)
+        batch_size: Properties per /predict/batch request
+        seed: Random seed
+
+    Returns:
+        List of (scenario, method, path, JSON body or None)
+    """
+    examples = collection_requests()
+    by_path = {path: (method, body) for method, path, body in examples}
+    example = by_path["/api/v1/predict"][1]
+
+    rng = np.random.default_rng(seed)
+    names = list(mix)
+    weights = np.array([mix[name] for name in names], dtype=float)
+    scenarios = rng.choice(names, n_requests, p=weights / weights.sum())
+    properties = iter(
+        sample_properties(
+            int(np.sum(scenarios == "predict"))
+            + int(np.sum(scenarios == "batch")) * batch_size,
+            rng,
+        )
+    )
+
+    requests: List[Request] = []
+    for scenario in scenarios:
+        if scenario == "predict":
+            body = next(properties)
+            if rng.random() < EXAMPLE_SHARE:
+                body = example
+            requests.append(("predict", "POST", "/api/v1/predict", body))
+        elif scenario == "batch":
+            body = {"properties": [next(properties) for _ in range(batch_size)]}
+            requests.append(("batch", "POST", "/api/v1/predict/batch", body))
+        elif scenario == "info":
+            requests.append(("info", "GET", "/api/v1/model/info", None))
+        elif scenario == "health":
+            requests.append(("health", "GET", "/", None))
+        else:
+            raise ValueError(f"Unknown scenario '{scenario}'")
+    return requests
+
+
+async def run_level(
+    client: httpx.AsyncClient, requests: List[Request], concurrency: int
+) -> Tuple[float, List[Tuple[str, int, float]]]:
+    """
+    Send requests with a fixed number of concurrent clients (closed loop).
+
+    Returns:
+        Tuple (wall seconds, list of (scenario, status, seconds) per
+        request; status 0 for transport errors)
+    """
+    queue = iter(requests)
+    samples: List[Tuple[str, int, float]] = []
+
+    async def worker():
+        for scenario, method, path, body in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append((scenario, status, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, samples
+
+
+def summarize(samples: List[Tuple[str, int, float]], seconds: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles and error counts of samples."""
+    latencies = np.array([latency for _, _, latency in samples]) * 1000
+    errors = sum(1 for _, status, _ in samples if not 200 <= status < 300)
+    statuses: Dict[str, int] = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 5),
+        "throughput_rps": round(len(samples) / seconds, 2),
+        "latency_ms": {
+            **{
+                f"p{p}": round(float(np.percentile(latencies, p)), 3)
+                for p in PERCENTILES
+            },
+            "mean": round(float(latencies.mean()), 3),
+            "max": round(float(latencies.max()), 3),
+        },
+        "status_codes": dict(sorted(statuses.items())),
+    }
+
+
+async def benchmark(
+    client: httpx.AsyncClient,
+    requests: List[Request],
+    levels: List[int],
+    warmup: int,
+) -> List[Dict[str, Any]]:
+    """Run every concurrency level over the same request sequence."""
+    results = []
+    for concurrency in levels:
+        await run_level(client, requests[:warmup], concurrency)
+        seconds, samples = await run_level(client, requests, concurrency)
+        level = {"concurrency": concurrency, "seconds": round(seconds, 3)}
+        level.update(summarize(samples, seconds))
+        level["endpoints"] = {
+            scenario: summarize(
+                [sample for sample in samples if sample[0] == scenario], seconds
+            )
+            for scenario in sorted({sample[0] for sample in samples})
+        }
+        results.append(level)
+        print(
+            f"concurrency {concurrency:>4}: {level['throughput_rps']:>9.1f} req/s  "
+            f"p50 {level['latency_ms']['p50']:.2f} ms  "
+            f"p99 {level['latency_ms']['p99']:.2f} ms  "
+            f"errors {level['error_rate']:.2%}",
+            file=sys.stderr,
+        )
+    return results
+
+
+async def run_in_process(models_dir: Path, requests, levels, warmup):
+    """Benchmark app.main:app in this process."""
+    from app import core
+    from app.core.lifecycle import create_forecaster, install_forecaster
+    from app.main import app
+
+    # Serve as configured by the environment, from models_dir
+    core.settings.models_dir = str(models_dir)
+    forecaster = create_forecaster()
+    forecaster.load()
+    install_forecaster(forecaster)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        try:
+            return await benchmark(client, requests, levels, warmup)
+        finally:
+            core.inference_executor.shutdown()
+
+
+async def run_against(url: str, requests, levels, warmup):
+    """Benchmark an API listening at url."""
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        return await benchmark(client, requests, levels, warmup)
+
+
+def wait_ready(url: str, timeout: float) -> None:
+    """Wait until /ready answers 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"API at {url} not ready after {timeout:.0f}s")
+
+
+def start_server(models_dir: Path, port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn on app.main:app serving models_dir."""
+    env = dict(os.environ, MODELS_DIR=str(models_dir))
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=api_dir,
+        env=env,
+    )
+
+
+def git_commit() -> Dict[str, Any]:
+    """Commit benchmarked, and whether the tree had local changes."""
+
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=project_root, capture_output=True, text=True
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD") or None,
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput and latency changes against a baseline run."""
+    before = {level["concurrency"]: level for level in baseline["levels"]}
+    print(
+        f"\nCompared with {baseline['meta'].get('commit')} "
+        f"({baseline['meta'].get('timestamp')}):",
+        file=sys.stderr,
+    )
+    for level in results["levels"]:
+        old = before.get(level["concurrency"])
+        if old is None:
+            continue
+
+        def change(new, previous):
+            return f"{(new / previous - 1):+.1%}" if previous else "n/a"
+
+        print(
+            f"concurrency {level['concurrency']:>4}: throughput "
+            f"{change(level['throughput_rps'], old['throughput_rps'])}, "
+            "p50 "
+            f"{change(level['latency_ms']['p50'], old['latency_ms']['p50'])}, "
+            "p99 "
+            f"{change(level['latency_ms']['p99'], old['latency_ms']['p99'])}, "
+            f"error rate {old['error_rate']:.2%} -> {level['error_rate']:.2%}",
+            file=sys.stderr,
+        )
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse predict=85,batch=5,... into weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def benchmark_load():
+    """Run the load benchmark and write its results file."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Benchmark an API already running here")
+    target.add_argument(
+        "--serve", action="store_true", help="Start uvicorn for the run"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --serve")
+    parser.add_argument(
+        "--models-dir",
+        type=Path,
+        default=api_dir / "models",
+        help="Deployed models directory (in-process and --serve)",
+    )
+    parser.add_argument(
+        "--synthetic", action="store_true", help="Serve a synthetic forest"
+    )
+    parser.add_argument("--synthetic-trees", type=int, default=100)
+    parser.add_argument("--synthetic-depth", type=int, default=20)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Levels"
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Per level")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed, per level")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="Scenario weights, e.g. predict=85,batch=5,info=5,health=5",
+    )
+    parser.add_argument("--batch-size", type=int, default=100, help="Batch rows")
+    parser.add_argument("--seed", type=int, default=0, help="Request mix seed")
+    parser.add_argument("--output", type=Path, help="Results file")
+    parser.add_argument("--compare", type=Path, help="Baseline results file")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    requests = build_requests(args.requests, args.mix, args.batch_size, args.seed)
+    meta: Dict[str, Any] = {
+        **git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "target": args.url or ("uvicorn" if args.serve else "in-process"),
+        "workers": args.workers if args.serve else None,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "mix": args.mix,
+        "batch_size": args.batch_size,
+        "seed": args.seed,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="synthetic-models-") as tmp:
+        models_dir = args.models_dir
+        if not args.url and (
+            args.synthetic or not (models_dir / "final_model.joblib").exists()
+        ):
+            print("Training a synthetic forest...", file=sys.stderr)
+            models_dir = write_synthetic_models(
+                Path(tmp),
+                n_estimators=args.synthetic_trees,
+                max_depth=args.synthetic_depth,
+            )
+            meta["models"] = {
+                "synthetic": True,
+                "n_estimators": args.synthetic_trees,
+                "max_depth": args.synthetic_depth,
+            }
+        elif not args.url:
+            meta["models"] = {"synthetic": False, "models_dir": str(models_dir)}
+
+        if args.url:
+            levels = asyncio.run(
+                run_against(args.url, requests, args.concurrency, args.warmup)
+            )
+        elif args.serve:
+            server = start_server(models_dir, args.port, args.workers)
+            url = f"http://127.0.0.1:{args.port}"
+            try:
+                wait_ready(url, timeout=300)
+                levels = asyncio.run(
+                    run_against(url, requests, args.concurrency, args.warmup)
+                )
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        else:
+            levels = asyncio.run(
+                run_in_process(models_dir, requests, args.concurrency, args.warmup)
+            )
+
+    results = {"meta": meta, "levels": levels}
+    output = args.output or RESULTS_DIR / f"load-{meta['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    benchmark_load()
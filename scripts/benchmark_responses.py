@@ -0,0 +1,174 @@
+"""
+Benchmark Responses Script.
+
+Measure the framework overhead of the prediction endpoints: the time an
+in-process request (ASGI, no network) to /api/v1/predict and
+/api/v1/predict/batch takes on top of the forecaster call itself. Repeated
+identical requests are answered from the prediction cache, so the time
+left is request parsing, validation, the executor hop and serialization.
+
+The response serialization is also timed on its own: the previous path
+(building the pydantic response model, then FastAPI validating and
+serializing it again for response_model) against PredictionJSONResponse.
+
+Usage:
+    python scripts/benchmark_responses.py --requests 2000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "api-service"))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app import core  # noqa: E402
+from app.controllers import PredictionController  # noqa: E402
+from app.core.lifecycle import create_forecaster, install_forecaster  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers.responses import PredictionJSONResponse  # noqa: E402
+from app.schemas import BatchPredictionResponse, PredictionResponse  # noqa: E402
+
+PROPERTY = {
+    "property_type": "T",
+    "old_new": "N",
+    "duration": "F",
+    "county": "GREATER LONDON",
+    "postcode": "SW1A 1AA",
+    "year": 2024,
+}
+
+
+def time_call(call, min_seconds: float = 0.5) -> float:
+    """Microseconds per call of a synchronous function."""
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        call()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def time_requests(client, path: str, payload, n_requests: int) -> float:
+    """Microseconds per sequential request."""
+    for _ in range(10):
+        await client.post(path, json=payload)
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = await client.post(path, json=payload)
+        response.raise_for_status()
+    return (time.perf_counter() - start) / n_requests * 1e6
+
+
+def model_serialization(schema, field, result) -> bytes:
+    """Previous path: response model, then FastAPI's response_model pass."""
+    content = schema(**result)
+    coroutine = serialize_response(
+        field=field, response_content=content, dump_json=True
+    )
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("serialize_response suspended")
+
+
+async def benchmark_endpoints(forecaster, n_requests: int, batch_size: int):
+    """Per-request time of both endpoints and of the forecaster calls."""
+    batch = {"properties": [PROPERTY] * batch_size}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://x") as client:
+        predict_us = await time_requests(
+            client, "/api/v1/predict", PROPERTY, n_requests
+        )
+        batch_us = await time_requests(
+            client, "/api/v1/predict/batch", batch, max(n_requests // 100, 10)
+        )
+
+    forecaster_us = time_call(lambda: forecaster.predict(PROPERTY))
+    forecaster_batch_us = time_call(
+        lambda: forecaster.predict_batch(batch["properties"])
+    )
+    return {
+        "predict": {
+            "request_us": round(predict_us, 1),
+            "forecaster_us": round(forecaster_us, 1),
+            "overhead_us": round(predict_us - forecaster_us, 1),
+        },
+        f"batch_{batch_size}": {
+            "request_ms": round(batch_us / 1000, 2),
+            "forecaster_ms": round(forecaster_batch_us / 1000, 2),
+            "overhead_ms": round((batch_us - forecaster_batch_us) / 1000, 2),
+        },
+    }
+
+
+def benchmark_serialization(forecaster, batch_size: int):
+    """Serialization time of both response paths."""
+    report = {}
+    batch_result = asyncio.run(
+        PredictionController.predict_batch(
+            forecaster, core.inference_executor, [PROPERTY] * batch_size
+        )
+    )
+    for name, schema, result in (
+        ("predict", PredictionResponse, forecaster.predict(PROPERTY)),
+        (f"batch_{batch_size}", BatchPredictionResponse, batch_result),
+    ):
+        # FastAPI builds the response_model field once per route
+        field = create_model_field(name=name, type_=schema, mode="serialization")
+        before = model_serialization(schema, field, result)
+        after = PredictionJSONResponse(result).body
+        # Both paths must produce the same bytes
+        assert before == after, (before[:200], after[:200])
+        before_us = time_call(lambda: model_serialization(schema, field, result))
+        after_us = time_call(lambda: PredictionJSONResponse(result))
+        report[name] = {
+            "response_model_us": round(before_us, 1),
+            "lean_us": round(after_us, 1),
+            "speedup": round(before_us / after_us, 1),
+        }
+    return report
+
+
+def benchmark_responses():
+    """Report framework overhead per request and serialization cost."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir",
+        type=Path,
+        default=project_root / "api-service" / "models",
+        help="Deployed models directory",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Requests timed")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Batch rows")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Serve as configured (engine, cache, prediction table)
+    core.settings.models_dir = str(args.models_dir)
+    forecaster = create_forecaster()
+    forecaster.load()
+    install_forecaster(forecaster)
+    # Sequential requests would only wait out the micro-batching window
+    core.micro_batcher = None
+
+    report = {
+        "endpoints": asyncio.run(
+            benchmark_endpoints(forecaster, args.requests, args.batch_size)
+        ),
+        "serialization": benchmark_serialization(forecaster, args.batch_size),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    benchmark_responses()
@@ -0,0 +1,136 @@
+"""
+Build Prediction Table Script.
+
+Precompute predictions for every (county, postcode region) pair, property
+type, old/new flag, tenure and year, and store them next to the deployed
+models so the API can serve them from a memory-mapped table
+(PREDICTION_TABLE=true). Run after deploy_models.py.
+
+The API only serves a table built with its interval mode and percentiles,
+so --interval-mode defaults to INTERVAL_MODE like the API does.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "api-service"))
+
+from app.core.config import settings  # noqa: E402
+from app.models import PredictionTable, SalesForecaster  # noqa: E402
+from app.models.postcode_encoder import outward_code  # noqa: E402
+from app.models.sales_forecaster import DEFAULT_INTERVAL_PERCENTILES  # noqa: E402
+
+
+def load_pairs(forecaster, data_path: Path, all_pairs: bool):
+    """
+    Get the (county, postcode region) pairs to enumerate.
+
+    Observed pairs come from the cleaned dataset, keyed exactly as
+    SalesForecaster normalizes requests (outward_code), so unspaced or
+    lower-case postcodes land on the pair the API looks up. The full cross
+    product of the target encodings is much larger and only used on request.
+    """
+    county_map = forecaster.target_encodings["county_map"]
+    postcode_map = forecaster.target_encodings["postcode_map"]
+
+    if all_pairs:
+        return [(c, p) for c in county_map for p in postcode_map]
+
+    df = pd.read_csv(data_path, usecols=["county", "postcode"]).dropna()
+    df["county"] = df["county"].str.upper().str.strip()
+    df["postcode"] = df["postcode"].str.upper().str.strip()
+    df = df[df["postcode"] != ""]
+    df["postcode_region"] = df["postcode"].map(outward_code)
+    df = df.drop_duplicates(["county", "postcode_region"])
+
+    return list(zip(df["county"], df["postcode_region"]))
+
+
+def build_prediction_table():
+    """Build the prediction table for the deployed models."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir",
+        type=Path,
+        default=project_root / "api-service" / "models",
+        help="Deployed models directory (table is written here)",
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=project_root / "notebooks" / "data" / "uk_property_cleaned.csv",
+        help="Cleaned dataset used to find observed county/postcode pairs",
+    )
+    parser.add_argument(
+        "--all-pairs",
+        action="store_true",
+        help="Enumerate every county x postcode region pair (very large)",
+    )
+    parser.add_argument(
+        "--interval-mode",
+        choices=("trees", "conformal"),
+        default=settings.interval_mode,
+        help="Interval mode served by the API (default: INTERVAL_MODE)",
+    )
+    parser.add_argument(
+        "--percentiles",
+        type=float,
+        nargs=2,
+        default=DEFAULT_INTERVAL_PERCENTILES,
+        metavar=("LOWER", "UPPER"),
+        help="Per-tree interval percentiles served by the API",
+    )
+    parser.add_argument("--first-year", type=int, default=1995)
+    parser.add_argument("--last-year", type=int, default=2030)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BUILDING PREDICTION TABLE")
+    print("=" * 80)
+
+    forecaster = SalesForecaster(
+        models_dir=str(args.models_dir),
+        engine="native",
+        interval_percentiles=tuple(args.percentiles),
+        interval_mode=args.interval_mode,
+    )
+    forecaster.load()
+
+    pairs = load_pairs(forecaster, args.data, args.all_pairs)
+    print(f"\nModels: {args.models_dir.absolute()}")
+    # Conformal falls back to per-tree intervals without a calibration file,
+    # as it does in the API
+    print(f"Intervals: {forecaster.active_interval_mode} {tuple(args.percentiles)}")
+    print(f"Pairs: {len(pairs):,}")
+    print(f"Years: {args.first_year}-{args.last_year}")
+
+    start = time.perf_counter()
+    table = PredictionTable.build(
+        forecaster,
+        pairs,
+        args.models_dir,
+        years=(args.first_year, args.last_year),
+    )
+    elapsed = time.perf_counter() - start
+
+    size_mb = (args.models_dir / PredictionTable.TABLE_FILE).stat().st_size / (
+        1024 * 1024
+    )
+    print(f"\n✓ BUILT: {PredictionTable.TABLE_FILE}")
+    print(f"  Entries: {table.n_entries:,}")
+    print(f"  Size: {size_mb:.2f} MB")
+    print(f"  Time: {elapsed:.1f}s ({table.n_entries / elapsed:,.0f} rows/s)")
+
+    print("\n" + "=" * 80)
+    print("PREDICTION TABLE COMPLETE!")
+    print("=" * 80)
+    print("\nServe it with PREDICTION_TABLE=true")
+
+
+if __name__ == "__main__":
+    build_prediction_table()
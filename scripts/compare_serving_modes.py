@@ -0,0 +1,142 @@
+"""
+Compare Serving Modes Script.
+
+Start the API with today's runserver mode (uvicorn --workers, one model
+load per worker) and with the preloading launcher (python -m app.server,
+one load in the master then fork), and report startup time and total
+memory (PSS summed over the process tree) for each. Linux only.
+
+Usage:
+    python scripts/compare_serving_modes.py --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+api_dir = project_root / "api-service"
+
+
+def process_tree(pid: int):
+    """List pid and all its descendants."""
+    pids = [pid]
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children = (task / "children").read_text().split()
+        for child in children:
+            pids.extend(process_tree(int(child)))
+    return pids
+
+
+def pss_mb(pid: int) -> float:
+    """Proportional set size of a process (shared pages split fairly)."""
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        if line.startswith("Pss:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def wait_ready(port: int, workers: int, timeout: float) -> float:
+    """
+    Wait until every worker serves a loaded model.
+
+    Returns:
+        Seconds until enough consecutive health checks report the model
+        loaded (connections are spread across workers)
+    """
+    start = time.perf_counter()
+    consecutive = 0
+    while time.perf_counter() - start < timeout:
+        try:
+            url = f"http://127.0.0.1:{port}/health"
+            with urllib.request.urlopen(url, timeout=1) as response:
+                loaded = json.load(response)["model_loaded"]
+        except OSError:
+            loaded = False
+        consecutive = consecutive + 1 if loaded else 0
+        if consecutive >= workers * 4:
+            return time.perf_counter() - start
+        time.sleep(0.01)
+    raise TimeoutError(f"API not ready after {timeout}s")
+
+
+def measure(name: str, command, port: int, workers: int, timeout: float):
+    """Start one serving mode and measure it."""
+    env = dict(os.environ, PORT=str(port), WORKERS=str(workers))
+    process = subprocess.Popen(
+        command,
+        cwd=api_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        startup = wait_ready(port, workers, timeout)
+        time.sleep(1)
+        pids = process_tree(process.pid)
+        memory = sum(pss_mb(pid) for pid in pids)
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+
+    print(f"\n{name}")
+    print(f"  Command: {' '.join(command)}")
+    print(f"  Processes: {len(pids)}")
+    print(f"  Startup: {startup:.2f}s")
+    print(f"  Memory (PSS): {memory:.1f} MB")
+    return {"startup_s": startup, "memory_mb": memory}
+
+
+def compare_serving_modes():
+    """Measure both serving modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SERVING MODES COMPARISON")
+    print("=" * 80)
+
+    runserver = measure(
+        "runserver (uvicorn --workers)",
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(args.workers),
+        ],
+        args.port,
+        args.workers,
+        args.timeout,
+    )
+    serve = measure(
+        "serve (preload + fork)",
+        [sys.executable, "-m", "app.server"],
+        args.port + 1,
+        args.workers,
+        args.timeout,
+    )
+
+    print("\n" + "=" * 80)
+    print(
+        f"Startup: {runserver['startup_s'] / serve['startup_s']:.1f}x faster, "
+        f"memory: {runserver['memory_mb'] / serve['memory_mb']:.1f}x lower"
+    )
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    compare_serving_modes()
@@ -2,25 +2,79 @@
 Deploy Models Script.
 
 Copy trained models from notebooks to api-service.
-Only copies the final production models.
+Only copies the final production models, and exports the forest in the
+compact format served with COMPACT_FOREST=true, with a parity report
+against the original model. With --version NAME the models are deployed
+as a model version (models/versions/NAME), served next to the default
+model to requests with ?model_version=NAME.
 """
 
+import argparse
+import json
+import os
+import re
 import shutil
+import sys
 from pathlib import Path
 
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "api-service"))
 
-def deploy_models():
-    """Copy final models from notebooks to api-service."""
+from app.models import SalesForecaster  # noqa: E402
 
-    # Get project root (parent of scripts/)
-    project_root = Path(__file__).parent.parent
+PARITY_REPORT_FILE = "final_forest_parity.json"
+
+
+def export_compact_forest(source_dir: Path, target_dir: Path):
+    """
+    Write the compact forest for the source model and its parity report.
+
+    Runs before the joblib files are copied, so a running API watching
+    the models directory sees the matching compact file when it reloads.
+    """
+    forecaster = SalesForecaster(models_dir=str(source_dir))
+    forecaster.load()
+    report = forecaster.export_compact_forest(
+        target_dir / SalesForecaster.COMPACT_FOREST_FILE
+    )
+
+    tmp_path = target_dir / (PARITY_REPORT_FILE + ".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n")
+    os.replace(tmp_path, target_dir / PARITY_REPORT_FILE)
+
+    print(f"\n✓ EXPORTED: {SalesForecaster.COMPACT_FOREST_FILE}")
+    print(f"  Size: {report['compact_mb']:.2f} MB (model {report['model_mb']:.2f} MB)")
+    print(
+        f"  Load: {report['compact_load_seconds']:.3f}s "
+        f"(model {report['model_load_seconds']:.3f}s)"
+    )
+    print(f"  Parity over {report['rows']:,} rows:")
+    print(f"    Leaf agreement: {report['leaf_agreement']:.4%}")
+    print(f"    Max log-price error: {report['max_log_error']:.3g}")
+    print(f"    Max relative price error: {report['max_price_relative_error']:.3g}")
+    print(
+        "    Max relative interval error: "
+        f"{report['max_interval_relative_error']:.3g}"
+    )
+
+
+def deploy_models(version=None):
+    """
+    Copy final models from notebooks to api-service.
+
+    Args:
+        version: Optional model version name; deploys into
+            models/versions/<version> instead of models/
+    """
 
     # Paths
     source_dir = project_root / "notebooks" / "models"
     target_dir = project_root / "api-service" / "models"
+    if version:
+        target_dir = target_dir / "versions" / version
 
     # Create target directory
-    target_dir.mkdir(exist_ok=True)
+    target_dir.mkdir(parents=True, exist_ok=True)
 
     # Models to copy (only final production models)
     models_to_copy = [
@@ -29,6 +83,8 @@ def deploy_models():
         "final_target_encodings.joblib",
         "final_metadata.joblib"
     ]
+    # Served only when configured (INTERVAL_MODE=conformal)
+    optional_models = ["final_conformal_intervals.joblib"]
 
     print("=" * 80)
     print("DEPLOYING ML MODELS TO API")
@@ -37,8 +93,13 @@ def deploy_models():
     print(f"Target: {target_dir.absolute()}")
     print(f"\nModels to deploy: {len(models_to_copy)}")
 
+    if all((source_dir / model_file).exists() for model_file in models_to_copy):
+        export_compact_forest(source_dir, target_dir)
+    else:
+        print("\n✗ SKIPPED compact forest export: artifacts missing")
+
     # Copy each model
-    for model_file in models_to_copy:
+    for model_file in models_to_copy + optional_models:
         source_path = source_dir / model_file
         target_path = target_dir / model_file
 
@@ -46,8 +107,11 @@ def deploy_models():
             print(f"\n✗ NOT FOUND: {model_file}")
             continue
 
-        # Copy file
-        shutil.copy2(source_path, target_path)
+        # Copy under a temporary name and rename, so a running API
+        # (MODEL_WATCH_INTERVAL) never reads a partially written file
+        tmp_path = target_path.with_name(target_path.name + ".tmp")
+        shutil.copy2(source_path, tmp_path)
+        os.replace(tmp_path, target_path)
 
         # Get file size
         size_mb = target_path.stat().st_size / (1024 * 1024)
@@ -58,9 +122,16 @@ def deploy_models():
     print("\n" + "=" * 80)
     print("DEPLOYMENT COMPLETE!")
     print("=" * 80)
-    print("\nAPI models ready at: api-service/models/")
+    print(f"\nAPI models ready at: {target_dir.relative_to(project_root)}/")
 
 
 if __name__ == "__main__":
-    deploy_models()
-
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--version",
+        help="Deploy as this model version (models/versions/VERSION)",
+    )
+    args = parser.parse_args()
+    if args.version is not None and not re.fullmatch(r"[\w-][\w.-]*", args.version):
+        parser.error(f"Invalid version name '{args.version}'")
+    deploy_models(args.version)
@@ -0,0 +1,290 @@
+"""
+Synthetic Models.
+
+Build a real RandomForestRegressor and its encoders on synthetic UK sales,
+written with the deployed artifact names (final_model.joblib, ...), so
+the API and the benchmarks can run without the trained models from the
+notebooks. Sales are drawn from a population-weighted county and
+postcode distribution; prices follow county, district, property type and
+year effects plus noise, and are encoded the way notebooks/04_pipeline
+does (label encoders, mean-price target encodings, log target, conformal
+intervals from out-of-bag residuals).
+
+Usage:
+    python scripts/synthetic_models.py /tmp/models --n-estimators 100 --max-depth 20
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api-service"))
+
+from app.models import ConformalIntervals  # noqa: E402
+
+FEATURES = [
+    "property_type_enc",
+    "county_enc",
+    "postcode_region_enc",
+    "old_new_enc",
+    "duration_enc",
+    "year",
+]
+
+# County: (share of sales, log-price effect, postcode areas)
+COUNTIES = {
+    "GREATER LONDON": (0.14, 0.85, ["SW", "SE", "E", "N", "W", "NW", "EC", "WC"]),
+    "SURREY": (0.04, 0.55, ["GU", "KT", "RH"]),
+    "KENT": (0.05, 0.25, ["ME", "CT", "TN", "DA"]),
+    "ESSEX": (0.05, 0.25, ["CM", "CO", "SS"]),
+    "HAMPSHIRE": (0.05, 0.25, ["SO", "PO"]),
+    "HERTFORDSHIRE": (0.04, 0.45, ["AL", "SG", "WD"]),
+    "WEST MIDLANDS": (0.07, -0.15, ["B", "CV", "WV"]),
+    "GREATER MANCHESTER": (0.07, -0.2, ["M", "OL", "BL"]),
+    "WEST YORKSHIRE": (0.06, -0.3, ["LS", "BD", "WF", "HD"]),
+    "MERSEYSIDE": (0.04, -0.35, ["L"]),
+    "LANCASHIRE": (0.04, -0.4, ["PR", "BB", "FY"]),
+    "TYNE AND WEAR": (0.03, -0.5, ["NE", "SR"]),
+    "CITY OF BRISTOL": (0.02, 0.2, ["BS"]),
+    "DEVON": (0.03, 0.1, ["EX", "PL", "TQ"]),
+    "NORFOLK": (0.03, -0.05, ["NR"]),
+    "NOTTINGHAMSHIRE": (0.03, -0.3, ["NG"]),
+    "OXFORDSHIRE": (0.02, 0.45, ["OX"]),
+    "CAMBRIDGESHIRE": (0.02, 0.3, ["CB", "PE"]),
+    "CORNWALL": (0.02, 0.0, ["TR"]),
+    "NORTH YORKSHIRE": (0.03, -0.05, ["YO", "HG"]),
+    "SOUTH YORKSHIRE": (0.03, -0.45, ["S", "DN"]),
+    "LEICESTERSHIRE": (0.03, -0.15, ["LE"]),
+    "DERBYSHIRE": (0.03, -0.25, ["DE"]),
+    "CHESHIRE EAST": (0.02, 0.05, ["CW", "SK"]),
+    "WEST SUSSEX": (0.03, 0.35, ["BN", "RH"]),
+    "EAST SUSSEX": (0.02, 0.25, ["BN", "TN"]),
+    "SOMERSET": (0.02, 0.0, ["BA", "TA"]),
+    "BUCKINGHAMSHIRE": (0.02, 0.5, ["HP", "MK"]),
+}
+DISTRICTS_PER_AREA = 12
+
+PROPERTY_TYPES = {"D": 0.23, "S": 0.27, "T": 0.3, "F": 0.18, "O": 0.02}
+PROPERTY_TYPE_EFFECTS = {"D": 0.35, "S": 0.0, "T": -0.1, "F": -0.2, "O": 0.1}
+NEW_BUILD_SHARE = 0.1
+# Flats are nearly always leasehold, houses rarely
+FLAT_LEASEHOLD_SHARE = 0.95
+HOUSE_LEASEHOLD_SHARE = 0.1
+FIRST_YEAR, LAST_YEAR = 1995, 2025
+
+
+def outward_codes(area: str) -> List[str]:
+    """Outward codes of a postcode area (SW -> SW1, SW1A, SW2, ...)."""
+    codes = []
+    for district in range(1, DISTRICTS_PER_AREA + 1):
+        codes.append(f"{area}{district}")
+        if district == 1 and area in COUNTIES["GREATER LONDON"][2]:
+            # Central London districts are split further (SW1A, SW1E, ...)
+            codes.extend(f"{area}1{letter}" for letter in "AEHPVWXY")
+    return codes
+
+
+def region_distribution():
+    """
+    Distribution of sales over (county, outward code) pairs.
+
+    Returns:
+        Tuple (list of (county, outward code), array of probabilities).
+        Within a county, lower-numbered districts of an area sell more
+        (a Zipf-like rank weight), as central districts tend to.
+    """
+    pairs, weights = [], []
+    for county, (share, _, areas) in COUNTIES.items():
+        county_pairs, county_weights = [], []
+        for area in areas:
+            for rank, code in enumerate(outward_codes(area), start=1):
+                county_pairs.append((county, code))
+                county_weights.append(1.0 / rank)
+        total = sum(county_weights)
+        pairs.extend(county_pairs)
+        weights.extend(share * w / total for w in county_weights)
+    probabilities = np.asarray(weights)
+    return pairs, probabilities / probabilities.sum()
+
+
+def sample_properties(
+    n: int,
+    rng: np.random.Generator,
+    first_year: int = FIRST_YEAR,
+    last_year: int = LAST_YEAR,
+) -> List[Dict[str, Any]]:
+    """
+    Draw property records in the /predict input shape.
+
+    Args:
+        n: Number of records
+        rng: Random generator
+        first_year, last_year: Range of sale years (inclusive)
+    """
+    pairs, probabilities = region_distribution()
+    regions = rng.choice(len(pairs), n, p=probabilities)
+    types = rng.choice(
+        list(PROPERTY_TYPES), n, p=np.fromiter(PROPERTY_TYPES.values(), float)
+    )
+    new_build = rng.random(n) < NEW_BUILD_SHARE
+    leasehold = rng.random(n) < np.where(
+        types == "F", FLAT_LEASEHOLD_SHARE, HOUSE_LEASEHOLD_SHARE
+    )
+    years = rng.integers(first_year, last_year + 1, n)
+    inward = rng.integers(1, 10, n)
+    letters = rng.choice(list("ABDEFGHJLNPQRSTUWXYZ"), (n, 2))
+
+    return [
+        {
+            "property_type": str(types[i]),
+            "old_new": "Y" if new_build[i] else "N",
+            "duration": "L" if leasehold[i] else "F",
+            "county": pairs[regions[i]][0],
+            "postcode": f"{pairs[regions[i]][1]} {inward[i]}{''.join(letters[i])}",
+            "year": int(years[i]),
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_sales(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic sales with prices, in the pipeline's column layout."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(sample_properties(n_rows, rng))
+    df["postcode_region"] = df["postcode"].str.split().str[0]
+
+    codes = sorted(df["postcode_region"].unique())
+    district_effect = dict(zip(codes, rng.normal(0, 0.15, len(codes))))
+    log_price = (
+        11.2
+        + df["county"].map({c: effect for c, (_, effect, _) in COUNTIES.items()})
+        + df["postcode_region"].map(district_effect)
+        + df["property_type"].map(PROPERTY_TYPE_EFFECTS)
+        + np.where(df["old_new"] == "Y", 0.1, 0.0)
+        + np.where(df["duration"] == "L", -0.1, 0.0)
+        # Prices rose quickly until 2007, then slowly
+        + 0.08 * np.minimum(df["year"] - FIRST_YEAR, 12)
+        + 0.03 * np.maximum(df["year"] - 2007, 0)
+        + rng.normal(0, 0.35, n_rows)
+    )
+    df["price"] = np.exp(log_price).round(-2)
+    return df
+
+
+def build_artifacts(
+    n_estimators: int = 100,
+    max_depth: Optional[int] = 20,
+    n_rows: int = 20000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Train a forest on synthetic sales and build the deployed artifacts.
+
+    Returns:
+        Dictionary with model, label_encoders, target_encodings, metadata
+        and conformal_intervals, as written by notebooks/04_pipeline
+    """
+    df = synthetic_sales(n_rows, seed)
+
+    label_encoders = {}
+    for column in ("property_type", "old_new", "duration"):
+        encoder = LabelEncoder()
+        df[column + "_enc"] = encoder.fit_transform(df[column])
+        label_encoders[column] = encoder
+
+    county_map = df.groupby("county")["price"].mean()
+    postcode_map = df.groupby("postcode_region")["price"].mean()
+    df["county_enc"] = df["county"].map(county_map)
+    df["postcode_region_enc"] = df["postcode_region"].map(postcode_map)
+
+    model = RandomForestRegressor(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        n_jobs=-1,
+        random_state=seed,
+        oob_score=True,
+    )
+    model.fit(df[FEATURES], np.log(df["price"]))
+    # Served single-threaded, as the trained model is
+    model.n_jobs = None
+
+    trained_date = f"synthetic-{n_estimators}-{max_depth}-{n_rows}-{seed}"
+    # Calibrated on the out-of-bag residuals, as notebooks/04_pipeline does
+    conformal_intervals = ConformalIntervals.from_residuals(
+        np.log(df["price"]) - model.oob_prediction_,
+        df["property_type"],
+        df["postcode_region"],
+        trained_date=trained_date,
+    )
+    del model.oob_prediction_
+
+    return {
+        "model": model,
+        "label_encoders": label_encoders,
+        "target_encodings": {
+            "county_map": county_map.to_dict(),
+            "postcode_map": postcode_map.to_dict(),
+            "county_counts": df["county"].value_counts().to_dict(),
+            "postcode_counts": df["postcode_region"].value_counts().to_dict(),
+        },
+        "metadata": {
+            "model_type": "RandomForestRegressor",
+            "n_estimators": n_estimators,
+            "max_depth": max_depth,
+            "features": FEATURES,
+            "target_transform": "log",
+            "trained_date": trained_date,
+            "training_samples": n_rows,
+            "cv_r2_mean": None,
+            "expected_r2": 0.0,
+            "synthetic": True,
+        },
+        "conformal_intervals": conformal_intervals,
+    }
+
+
+def write_artifacts(artifacts: Dict[str, Any], models_dir: Path) -> Path:
+    """Write artifacts with the deployed file names; returns models_dir."""
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    for name in ("model", "label_encoders", "target_encodings", "metadata"):
+        joblib.dump(artifacts[name], models_dir / f"final_{name}.joblib")
+    artifacts["conformal_intervals"].save(models_dir)
+    return models_dir
+
+
+def write_synthetic_models(models_dir: Path, **params: Any) -> Path:
+    """Build synthetic artifacts (see build_artifacts) into models_dir."""
+    return write_artifacts(build_artifacts(**params), models_dir)
+
+
+def main():
+    """Write synthetic models to a directory."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("models_dir", type=Path, help="Output directory")
+    parser.add_argument("--n-estimators", type=int, default=100, help="Trees")
+    parser.add_argument("--max-depth", type=int, default=20, help="Tree depth")
+    parser.add_argument("--rows", type=int, default=20000, help="Training rows")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    write_synthetic_models(
+        args.models_dir,
+        n_estimators=args.n_estimators,
+        max_depth=args.max_depth,
+        n_rows=args.rows,
+        seed=args.seed,
+    )
+    print(json.dumps({"models_dir": str(args.models_dir)}))
+
+
+if __name__ == "__main__":
+    main()